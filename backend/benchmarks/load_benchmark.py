@@ -0,0 +1,362 @@
+"""Offline load benchmark for /core/v1/start_prospecting.
+
+Runs the real FastAPI app against local stand-ins for OpenAI, Apify, Google CSE
+and a static web corpus, then drives concurrent SSE sessions through it.
+
+    cd backend && python -m benchmarks.load_benchmark --sessions 40 --concurrency 10
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.stub_providers import LATENCY_DEFAULTS, run_stub_server
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def _distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    return {f"p{pct}": round(percentile(values, pct), 4) if values else None for pct in (50, 95, 99)}
+
+
+class AppServer:
+    """Serves the app on its own event loop so client work doesn't skew the loop lag."""
+
+    def __init__(self, port: int, probe_interval: float = 0.05):
+        self.port = port
+        self.probe_interval = probe_interval
+        self.lags: List[float] = []
+        self.peak_rss = 0
+        self.started = threading.Event()
+        self._server = None
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True)
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.probe_interval
+            await asyncio.sleep(self.probe_interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.peak_rss = max(self.peak_rss, _rss_bytes())
+
+    async def _serve(self) -> None:
+        import uvicorn
+        from main import app
+
+        self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        probe = asyncio.create_task(self._probe())
+        serve = asyncio.create_task(self._server.serve())
+
+        while not self._server.started:
+            await asyncio.sleep(0.01)
+        self.started.set()
+
+        await serve
+        probe.cancel()
+
+    def start(self) -> None:
+        self._thread.start()
+        if not self.started.wait(timeout=30):
+            raise RuntimeError("App server did not start")
+
+    def reset_samples(self) -> None:
+        self.lags = []
+        self.peak_rss = _rss_bytes()
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+async def run_session(client: httpx.AsyncClient, index: int, intent: str) -> Dict[str, Any]:
+    payload = {"profile_url": f"https://www.linkedin.com/in/bench-user-{index}/", "intent": intent}
+    started_at = time.perf_counter()
+    session: Dict[str, Any] = {
+        "ttfe": None, "ttfr": None, "events": 0, "wire_bytes": 0, "sse_bytes": 0, "prompt_cache": None, "error": None
+    }
+
+    try:
+        async with client.stream("POST", "/core/v1/start_prospecting", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+
+                event = json.loads(line[len("data: "):])
+                session["events"] += 1
+                session["sse_bytes"] += len(line) + 2
+                if session["ttfe"] is None:
+                    session["ttfe"] = time.perf_counter() - started_at
+                if event.get("type") == "final_result":
+                    session["ttfr"] = time.perf_counter() - started_at
+                elif event.get("type") == "error":
+                    session["error"] = event.get("message")
+                elif event.get("type") == "run_timing":
+                    session["prompt_cache"] = event.get("prompt_cache")
+            session["wire_bytes"] = response.num_bytes_downloaded
+    except Exception as e:
+        session["error"] = f"{type(e).__name__}: {e}"
+
+    if session["ttfr"] is None and session["error"] is None:
+        session["error"] = "Stream ended without a final result"
+
+    return session
+
+
+async def drive_load(
+    base_url: str,
+    sessions: int,
+    concurrency: int,
+    intent: str,
+    offset: int = 0,
+    compression: bool = True
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Accept-Encoding": "gzip" if compression else "identity"}
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits, headers=headers) as client:
+        async def bounded(index: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await run_session(client, offset + index, intent)
+
+        started_at = time.perf_counter()
+        results = await asyncio.gather(*[bounded(index) for index in range(sessions)])
+        wall_secs = time.perf_counter() - started_at
+
+    return {"results": results, "wall_secs": wall_secs}
+
+
+def _encode_cost(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    events = after["events"] - before["events"]
+    encode_secs = after["encode_secs"] - before["encode_secs"]
+
+    return {
+        "events": events,
+        "payload_mb": round((after["payload_bytes"] - before["payload_bytes"]) / 2 ** 20, 3),
+        "total_ms": round(encode_secs * 1000, 3),
+        "us_per_event": round(encode_secs / events * 1e6, 2) if events else None,
+        "heartbeats": after["heartbeats"] - before["heartbeats"]
+    }
+
+
+def _prompt_cache(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    totals = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0}
+    for result in results:
+        for key in totals:
+            totals[key] += (result["prompt_cache"] or {}).get(key, 0)
+
+    totals["hit_ratio"] = round(totals["cached_tokens"] / totals["prompt_tokens"], 4) if totals["prompt_tokens"] else None
+    return totals
+
+
+def _resilience(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    providers = {}
+    for provider, state in after.items():
+        if not isinstance(state, dict) or not state["calls"] - before[provider]["calls"]:
+            continue
+
+        counters = {
+            key: value - before[provider][key]
+            for key, value in state.items() if isinstance(value, int)
+        }
+        # Latency windows are not additive, so the busiest operation stands in for the provider.
+        busiest = max(state["operations"].items(), key=lambda item: item[1]["samples"], default=None)
+        providers[provider] = {
+            **counters,
+            "operation": busiest[0] if busiest else None,
+            "attempt_secs": busiest[1]["attempt_secs"] if busiest else None,
+            "call_secs": busiest[1]["call_secs"] if busiest else None
+        }
+
+    return providers
+
+
+def build_report(
+    load: Dict[str, Any],
+    server: AppServer,
+    baseline_rss: int,
+    concurrency: int,
+    encode_cost: Dict[str, Any],
+    resilience: Dict[str, Any]
+) -> Dict[str, Any]:
+    results = load["results"]
+    completed = [result for result in results if result["error"] is None]
+    errors: Dict[str, int] = {}
+    for result in results:
+        if result["error"]:
+            errors[result["error"]] = errors.get(result["error"], 0) + 1
+
+    return {
+        "sessions": len(results),
+        "completed": len(completed),
+        "failed": len(results) - len(completed),
+        "concurrency": concurrency,
+        "wall_secs": round(load["wall_secs"], 3),
+        "runs_per_sec": round(len(completed) / load["wall_secs"], 3) if load["wall_secs"] else None,
+        "time_to_first_event_secs": _distribution([r["ttfe"] for r in results if r["ttfe"] is not None]),
+        "time_to_final_result_secs": _distribution([r["ttfr"] for r in completed]),
+        "event_loop_lag_secs": {**_distribution(server.lags), "max": round(max(server.lags), 4) if server.lags else None},
+        "peak_rss_mb": round(server.peak_rss / 2 ** 20, 1),
+        "memory_per_session_kb": round(max(0, server.peak_rss - baseline_rss) / max(1, min(concurrency, len(results))) / 1024, 1),
+        "sse_bytes_per_session": round(sum(r["sse_bytes"] for r in results) / max(1, len(results))),
+        "wire_bytes_per_session": round(sum(r["wire_bytes"] for r in results) / max(1, len(results))),
+        "event_encoding": encode_cost,
+        "prompt_cache": _prompt_cache(results),
+        "resilience": resilience,
+        "errors": errors
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"sessions            {report['completed']}/{report['sessions']} completed (concurrency {report['concurrency']})")
+    print(f"wall time           {report['wall_secs']}s")
+    print(f"throughput          {report['runs_per_sec']} runs/s")
+    for label, key in (("first event", "time_to_first_event_secs"), ("final result", "time_to_final_result_secs"),
+                       ("loop lag", "event_loop_lag_secs")):
+        print(f"{label:<20}" + "  ".join(f"{name}={value}" for name, value in report[key].items()))
+    print(f"memory              peak {report['peak_rss_mb']} MB, ~{report['memory_per_session_kb']} KB/session")
+    print(f"stream size         {report['sse_bytes_per_session']} SSE bytes, {report['wire_bytes_per_session']} on the wire per session")
+    encoding = report["event_encoding"]
+    print(f"event encoding      {encoding['us_per_event']}us/event over {encoding['events']} events "
+          f"({encoding['payload_mb']} MB, {encoding['total_ms']}ms), {encoding['heartbeats']} heartbeats")
+    cache = report["prompt_cache"]
+    print(f"prompt cache        {cache['cached_tokens']}/{cache['prompt_tokens']} prompt tokens cached "
+          f"over {cache['calls']} LLM calls (hit ratio {cache['hit_ratio']})")
+    for provider, stats in report["resilience"].items():
+        line = (f"{stats['calls']} calls, {stats['retries']} retries, {stats['hedges']} hedges "
+                f"({stats['hedge_wins']} won), {stats['short_circuits']} short-circuited")
+        if stats["operation"]:
+            line += (f"; {stats['operation']} p99 {stats['attempt_secs']['p99']}s per attempt, "
+                     f"{stats['call_secs']['p99']}s per call")
+        print(f"{provider:<20}{line}")
+    for error, count in report["errors"].items():
+        print(f"error x{count}: {error}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="Sessions to run before measuring")
+    parser.add_argument("--intent", default="We sell CI observability tooling to platform engineering teams")
+    parser.add_argument("--chunk-delay-ms", type=float, default=5, help="Delay between streamed OpenAI chunks")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cache", action="store_true", help="Keep the SQLite provider cache enabled")
+    parser.add_argument("--no-compression", dest="compression", action="store_false", help="Request identity-encoded streams")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    parser.add_argument("--fault-rate", type=float, default=0.0,
+                        help="Share of Apify, search and web requests the stubs fail with a 503")
+    for name, spec in LATENCY_DEFAULTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}-latency", dest=name, default=spec,
+                            help=f"median_ms[:sigma] log-normal latency (default {spec})")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    stub_port, app_port = _free_port(), _free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+
+    latency_specs = {name: getattr(args, name) for name in LATENCY_DEFAULTS}
+    stub = multiprocessing.Process(
+        target=run_stub_server,
+        args=(stub_port, latency_specs, args.chunk_delay_ms, args.seed, args.fault_rate),
+        daemon=True
+    )
+    stub.start()
+
+    scratch_dir = tempfile.mkdtemp()
+    os.environ.update({
+        "OPENAI_KEY": "bench",
+        "APIFY_TOKEN": "bench",
+        "GOOGLE_SEARCH_KEY": "bench",
+        "GOOGLE_SEARCH_ENGINE_ID": "bench",
+        "OPENAI_BASE_URL": f"{stub_url}/openai/v1",
+        "APIFY_API_URL": f"{stub_url}/apify",
+        "GOOGLE_SEARCH_BASE_URL": f"{stub_url}/google/customsearch/v1",
+        "CACHE_ENABLED": "true" if args.cache else "false",
+        "CACHE_DB_PATH": os.path.join(scratch_dir, "bench-cache.sqlite3"),
+        "RUN_STORE_DB_PATH": os.path.join(scratch_dir, "bench-runs.sqlite3"),
+        "ASSESSMENT_STORE_DB_PATH": os.path.join(scratch_dir, "bench-assessments.sqlite3")
+    })
+
+    import logging
+    logging.getLogger("LoggerService").setLevel(logging.WARNING)
+
+    deadline = time.time() + 30
+    while True:
+        try:
+            httpx.get(f"{stub_url}/health").raise_for_status()
+            break
+        except httpx.HTTPError:
+            if time.time() > deadline:
+                raise RuntimeError("Stub providers did not start")
+            time.sleep(0.1)
+
+    server = AppServer(app_port)
+    server.start()
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    try:
+        if args.warmup:
+            asyncio.run(drive_load(app_url, args.warmup, args.warmup, args.intent, offset=args.sessions,
+                                   compression=args.compression))
+
+        from services.event_stream_service import service as event_stream_service
+        from services.resilience_service import service as resilience_service
+
+        server.reset_samples()
+        baseline_rss = server.peak_rss
+        encode_before = event_stream_service.get_stats()
+        resilience_before = resilience_service.get_state()
+        load = asyncio.run(drive_load(app_url, args.sessions, args.concurrency, args.intent, compression=args.compression))
+        encode_cost = _encode_cost(encode_before, event_stream_service.get_stats())
+        resilience = _resilience(resilience_before, resilience_service.get_state())
+        report = build_report(load, server, baseline_rss, args.concurrency, encode_cost, resilience)
+    finally:
+        server.stop()
+        stub.terminate()
+        stub.join(timeout=5)
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Replay a recorded cassette to measure orchestration overhead.
+
+Runs the recorded trajectory through ToolCallingService.execute_with_streaming
+without calling any provider. With --speed 0 every recorded latency is skipped,
+so the timings are message building, serialization and SSE encoding alone.
+
+    cd backend && python -m benchmarks.replay_benchmark cassettes/abc123.json.gz --runs 50 --speed 0
+"""
+import argparse
+import asyncio
+import cProfile
+import gzip
+import json
+import os
+import pstats
+import time
+from typing import Any, Dict, List
+
+from benchmarks.load_benchmark import percentile
+
+
+async def replay_once(tool_calling_service: Any, cassette: Dict[str, Any], path: str, speed: float) -> Dict[str, Any]:
+    started_at = time.perf_counter()
+    events = 0
+    encoded_bytes = 0
+    error = None
+
+    async for frame in tool_calling_service.execute_with_streaming(
+        user_goal=cassette["user_goal"],
+        linkedin_profile_url=cassette["linkedin_profile_url"],
+        replay_from=path,
+        replay_speed=speed
+    ):
+        events += 1
+        encoded_bytes += len(frame)
+        event = json.loads(frame.partition(b"data: ")[2])
+        if event["type"] == "error":
+            error = event["message"]
+
+    return {"secs": time.perf_counter() - started_at, "events": events, "bytes": encoded_bytes, "error": error}
+
+
+async def replay(path: str, runs: int, concurrency: int, speed: float) -> List[Dict[str, Any]]:
+    from services.tool_calling_service import service as tool_calling_service
+
+    with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+        cassette = json.load(cassette_file)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded() -> Dict[str, Any]:
+        async with semaphore:
+            return await replay_once(tool_calling_service, cassette, path, speed)
+
+    return await asyncio.gather(*[bounded() for _ in range(runs)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassette")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--speed", type=float, default=0.0, help="Latency multiplier: 1 replays recorded timings, 0 skips them")
+    parser.add_argument("--profile", action="store_true", help="Print the top cProfile entries by cumulative time")
+    args = parser.parse_args()
+
+    for name in ("OPENAI_KEY", "APIFY_TOKEN", "GOOGLE_SEARCH_KEY", "GOOGLE_SEARCH_ENGINE_ID"):
+        os.environ.setdefault(name, "replay")
+    os.environ["CASSETTE_RECORD_DIR"] = ""
+
+    import logging
+    logging.getLogger("LoggerService").setLevel(logging.WARNING)
+
+    profiler = cProfile.Profile() if args.profile else None
+    started_at = time.perf_counter()
+    if profiler:
+        profiler.enable()
+    results = asyncio.run(replay(args.cassette, args.runs, args.concurrency, args.speed))
+    from services.event_stream_service import service as event_stream_service
+    if profiler:
+        profiler.disable()
+    wall_secs = time.perf_counter() - started_at
+
+    durations = [result["secs"] for result in results]
+    errors = [result["error"] for result in results if result["error"]]
+    print(f"runs                {len(results) - len(errors)}/{len(results)} replayed (concurrency {args.concurrency}, speed {args.speed})")
+    print(f"wall time           {wall_secs:.3f}s, {len(results) / wall_secs:.2f} runs/s")
+    print("per run             " + "  ".join(f"p{pct}={percentile(durations, pct) * 1000:.2f}ms" for pct in (50, 95, 99)))
+    print(f"events per run      {results[0]['events']} ({results[0]['bytes']} SSE bytes)")
+    encode_stats = event_stream_service.get_stats()
+    print(f"event encoding      {encode_stats['encode_us_per_event']}us/event, "
+          f"{encode_stats['encode_secs'] * 1000:.2f}ms total over {encode_stats['events']} events")
+    for error in sorted(set(errors)):
+        print(f"error: {error}")
+
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Cold-start benchmark: import time of the app and time until it answers /health.
+
+Every sample runs in a fresh interpreter, so nothing is shared through sys.modules
+or warm provider connections.
+
+    cd backend && python -m benchmarks.startup_benchmark --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.load_benchmark import _free_port, percentile
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = "import time; started_at = time.perf_counter(); import main; print(time.perf_counter() - started_at)"
+
+
+def _env(warmup: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    for name in ("OPENAI_KEY", "APIFY_TOKEN", "GOOGLE_SEARCH_KEY", "GOOGLE_SEARCH_ENGINE_ID"):
+        env.setdefault(name, "startup-bench")
+    env["STARTUP_WARMUP_ENABLED"] = "true" if warmup else "false"
+    return env
+
+
+def measure_import(env: Dict[str, str]) -> Dict[str, object]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    packages: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        package = module.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + int(self_us) / 1e6
+
+    return {"secs": float(result.stdout.strip().splitlines()[-1]), "packages": packages}
+
+
+def measure_ready(env: Dict[str, str], timeout_secs: float = 60) -> float:
+    port = _free_port()
+    started_at = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    try:
+        while time.perf_counter() - started_at < timeout_secs:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - started_at
+            except httpx.HTTPError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            time.sleep(0.02)
+        raise RuntimeError(f"Server was not ready after {timeout_secs}s")
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def _summary(values: List[float]) -> str:
+    return "  ".join(f"p{pct}={percentile(values, pct):.3f}s" for pct in (50, 95)) + f"  min={min(values):.3f}s"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Packages to list by self import time")
+    parser.add_argument("--warmup", action="store_true", help="Keep the provider warm-up in the lifespan hook enabled")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    env = _env(args.warmup)
+    imports = [measure_import(env) for _ in range(args.runs)]
+    ready = [measure_ready(env) for _ in range(args.runs)]
+
+    packages: Dict[str, float] = {}
+    for sample in imports:
+        for package, secs in sample["packages"].items():
+            packages[package] = packages.get(package, 0.0) + secs / len(imports)
+    top_packages = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"import main         {_summary([sample['secs'] for sample in imports])}")
+    print(f"ready (/health)     {_summary(ready)}  (warm-up {'on' if args.warmup else 'off'})")
+    for package, secs in top_packages:
+        print(f"  {package:<24}{secs * 1000:8.1f}ms")
+
+    if args.json_path:
+        with open(args.json_path, "w") as output:
+            json.dump({
+                "runs": args.runs,
+                "warmup": args.warmup,
+                "import_secs": [sample["secs"] for sample in imports],
+                "ready_secs": ready,
+                "top_packages_secs": dict(top_packages)
+            }, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
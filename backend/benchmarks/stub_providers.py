@@ -0,0 +1,390 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse, StreamingResponse
+
+
+PROFILE_URL_PATTERN = re.compile(r"https?://[^\s]*linkedin\.com/in/([^/\s?#]+)/?")
+
+LATENCY_DEFAULTS = {
+    "openai": "700:0.35",
+    "openai_reasoning": "2500:0.4",
+    "apify": "4000:0.5",
+    "google": "300:0.3",
+    "web": "250:0.6"
+}
+
+
+class LatencyModel:
+    """Log-normal latency parsed from "median_ms[:sigma]"."""
+
+    def __init__(self, median_ms: float, sigma: float = 0.0):
+        self.median_secs = median_ms / 1000
+        self.sigma = sigma
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        median, _, sigma = spec.partition(":")
+        return cls(float(median), float(sigma or 0))
+
+    def sample(self) -> float:
+        return self.median_secs * math.exp(self.sigma * random.gauss(0, 1))
+
+    async def wait(self) -> None:
+        await asyncio.sleep(self.sample())
+
+
+class PromptCache:
+    """Mimics provider prompt caching: the longest prefix seen before counts as cached, in 128-token blocks from 1024."""
+
+    BLOCK_CHARS = 512
+    MIN_CHARS = 4096
+
+    def __init__(self):
+        self._seen = set()
+
+    def cached_tokens(self, body: Dict[str, Any]) -> int:
+        # Providers render tools and the response format ahead of the messages; the request's own key order is kept.
+        prompt = json.dumps([body.get("model"), body.get("tools"), body.get("response_format"), body.get("messages")])
+        digest = hashlib.sha1()
+        cached_chars = 0
+        hit = True
+
+        for end in range(self.BLOCK_CHARS, len(prompt) + 1, self.BLOCK_CHARS):
+            digest.update(prompt[end - self.BLOCK_CHARS:end].encode())
+            key = digest.hexdigest()
+            if hit and key in self._seen:
+                cached_chars = end
+            else:
+                hit = False
+                self._seen.add(key)
+
+        return cached_chars // 4 if cached_chars >= self.MIN_CHARS else 0
+
+
+async def _json_body(request: Request) -> Any:
+    body = await request.body()
+    if request.headers.get("content-encoding") == "gzip":
+        body = gzip.decompress(body)
+    return json.loads(body) if body else {}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _slug_from_messages(messages: List[Dict[str, Any]]) -> str:
+    for message in messages:
+        if message.get("role") == "user" and isinstance(message.get("content"), str):
+            match = PROFILE_URL_PATTERN.search(message["content"])
+            if match:
+                return match.group(1).lower()
+    return "prospect"
+
+
+def _company_url(slug: str) -> str:
+    return f"https://www.linkedin.com/company/{slug}-labs"
+
+
+def plan_tool_calls(step: int, slug: str, base_url: str) -> List[Dict[str, Any]]:
+    profile_url = f"https://www.linkedin.com/in/{slug}/"
+    page_id = int(hashlib.md5(slug.encode()).hexdigest(), 16) % 1000
+
+    trajectory = [
+        [
+            ("get_linkedin_profile_data", {"profile_url": profile_url}),
+            ("get_linkedin_profile_posts", {"profile_url": profile_url})
+        ],
+        [
+            ("get_linkedin_company_details", {"company_url": _company_url(slug)}),
+            ("search_company_news", {"company_name": f"{slug} labs", "company_context": f"developer tools, {slug}labs.io"})
+        ],
+        [
+            ("search_web", {"query": f"{slug} engineering blog"}),
+            ("browse_web", {"url": f"{base_url}/web/{page_id}.html"})
+        ],
+        [
+            ("finish", {"summary": f"{slug} leads engineering at a growing developer tools company."})
+        ]
+    ]
+
+    return [
+        {"id": f"call_{uuid.uuid4().hex[:16]}", "name": name, "arguments": json.dumps(args)}
+        for name, args in trajectory[min(step, len(trajectory) - 1)]
+    ]
+
+
+def _chunk(model: str, delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+    return "data: " + json.dumps({
+        "id": "chatcmpl-stub",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    }) + "\n\n"
+
+
+def _estimate_tokens(payload: Any) -> int:
+    return max(1, len(json.dumps(payload)) // 4)
+
+
+def _completion_content(body: Dict[str, Any]) -> str:
+    prompt = json.dumps(body.get("messages", []))
+
+    response_format = body.get("response_format") or {}
+    if response_format.get("json_schema", {}).get("name") == "news_validation":
+        return json.dumps({"relevant_indices": [0, 1]})
+    if response_format:
+        return json.dumps({
+            "good_signals": ["Leads an engineering team evaluating new tooling"],
+            "bad_signals": ["No explicit budget signal"],
+            "score": 64,
+            "reasoning": "Moderate alignment with clear technical ownership."
+        })
+    if "name of the prospect" in prompt:
+        return "Jordan Example"
+    if "validating search results" in prompt:
+        return "[0, 1]"
+
+    return "Condensed research notes for the prospect."
+
+
+def _profile_items(slug: str) -> List[Dict[str, Any]]:
+    return [{
+        "basic_info": {"fullname": slug.replace("-", " ").title(), "headline": "VP Engineering"},
+        "experience": [{
+            "title": "VP Engineering",
+            "company": f"{slug} labs",
+            "company_linkedin_url": _company_url(slug),
+            "description": "Leads platform and developer productivity teams. " * 4
+        }]
+    }]
+
+
+def _actor_items(actor_id: str, run_input: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    slug = (run_input.get("username") or run_input.get("companyName") or "prospect").lower()
+
+    if actor_id.endswith("profile-detail"):
+        return _profile_items(slug)
+    if actor_id.endswith("company-detail"):
+        return [{"name": f"{slug} labs", "industry": "Software Development", "website": f"https://{slug}labs.io",
+                 "employee_count": 180, "description": "Developer tooling for platform teams. " * 6}]
+
+    return [
+        {"text": f"Post {i} by {slug} about scaling engineering teams. " * 8, "posted_at": _now_iso(), "likes": i * 7}
+        for i in range(limit)
+    ]
+
+
+def _web_page(page_id: int) -> str:
+    rng = random.Random(page_id)
+    words = ["platform", "engineering", "latency", "teams", "tooling", "release", "pipeline", "observability",
+             "developer", "growth", "hiring", "migration", "budget", "roadmap", "customers"]
+    paragraphs = "".join(
+        f"<p>{' '.join(rng.choice(words) for _ in range(80))}.</p>" for _ in range(30)
+    )
+    return (f"<html><head><title>Corpus page {page_id}</title><script>var x = 1;</script></head>"
+            f"<body><nav>Home | Blog</nav><article><h1>Corpus page {page_id}</h1>{paragraphs}</article>"
+            f"<footer>Footer</footer></body></html>")
+
+
+def create_stub_app(latency_specs: Dict[str, str], chunk_delay_ms: float = 5, fault_rate: float = 0.0) -> FastAPI:
+    latencies = {name: LatencyModel.parse(latency_specs.get(name, spec)) for name, spec in LATENCY_DEFAULTS.items()}
+    chunk_delay = chunk_delay_ms / 1000
+    runs: Dict[str, Dict[str, Any]] = {}
+    prompt_cache = PromptCache()
+    app = FastAPI()
+
+    def fault() -> Optional[Response]:
+        # Transient provider failures, for exercising retries and circuit breakers.
+        if random.random() < fault_rate:
+            return Response(status_code=503, content=json.dumps({"error": {"type": "unavailable", "message": "Stub fault"}}))
+        return None
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "gpt-4o")
+        messages = body.get("messages", [])
+        prompt_tokens = _estimate_tokens(messages) + _estimate_tokens(body.get("tools", []))
+        prompt_details = {"cached_tokens": min(prompt_tokens, prompt_cache.cached_tokens(body))}
+
+        if not body.get("stream"):
+            await latencies["openai_reasoning" if model.startswith("o") else "openai"].wait()
+            content = _completion_content(body)
+            completion_tokens = _estimate_tokens(content)
+            return {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content, "refusal": None},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                    "prompt_tokens_details": prompt_details,
+                    "completion_tokens_details": {"reasoning_tokens": completion_tokens * 4 if model.startswith("o") else 0}
+                }
+            }
+
+        step = sum(1 for message in messages if message.get("role") == "assistant")
+        tool_choice = body.get("tool_choice")
+        if isinstance(tool_choice, dict) and tool_choice["function"]["name"] == "finish":
+            # Any step past the end of the trajectory plans the finish call.
+            step = sys.maxsize
+        tool_calls = plan_tool_calls(step, _slug_from_messages(messages), str(request.base_url).rstrip("/"))
+
+        async def stream():
+            await latencies["openai"].wait()
+            yield _chunk(model, {"role": "assistant", "content": None})
+
+            for index, tool_call in enumerate(tool_calls):
+                yield _chunk(model, {"tool_calls": [{
+                    "index": index,
+                    "id": tool_call["id"],
+                    "type": "function",
+                    "function": {"name": tool_call["name"], "arguments": ""}
+                }]})
+
+                arguments = tool_call["arguments"]
+                for start in range(0, len(arguments), 24):
+                    await asyncio.sleep(chunk_delay)
+                    yield _chunk(model, {"tool_calls": [{"index": index, "function": {"arguments": arguments[start:start + 24]}}]})
+
+            yield _chunk(model, {}, finish_reason="tool_calls")
+
+            completion_tokens = _estimate_tokens(tool_calls)
+            yield "data: " + json.dumps({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                    "prompt_tokens_details": prompt_details
+                }
+            }) + "\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    def run_view(run: Dict[str, Any]) -> Dict[str, Any]:
+        if run["status"] == "RUNNING" and time.monotonic() >= run["finish_at"]:
+            run["status"] = "SUCCEEDED"
+            run["finishedAt"] = _now_iso()
+        return {key: value for key, value in run.items() if key not in ("finish_at", "input", "actor_id")}
+
+    @app.post("/apify/v2/acts/{actor_id}/runs")
+    async def start_actor(actor_id: str, request: Request):
+        if (failure := fault()) is not None:
+            return failure
+        run_id = uuid.uuid4().hex[:17]
+        runs[run_id] = {
+            "id": run_id,
+            "actId": actor_id,
+            "status": "RUNNING",
+            "startedAt": _now_iso(),
+            "finishedAt": None,
+            "defaultDatasetId": run_id,
+            "finish_at": time.monotonic() + latencies["apify"].sample(),
+            "input": await _json_body(request),
+            "actor_id": actor_id.replace("~", "/")
+        }
+        return {"data": run_view(runs[run_id])}
+
+    @app.get("/apify/v2/actor-runs/{run_id}")
+    async def get_run(run_id: str, waitForFinish: float = 0):
+        run = runs.get(run_id)
+        if run is None:
+            return Response(status_code=404, content=json.dumps({"error": {"type": "record-not-found"}}))
+
+        if run["status"] == "RUNNING":
+            await asyncio.sleep(max(0.0, min(run["finish_at"] - time.monotonic(), waitForFinish)))
+        return {"data": run_view(run)}
+
+    @app.post("/apify/v2/actor-runs/{run_id}/abort")
+    async def abort_run(run_id: str):
+        run = runs[run_id]
+        run["status"] = "ABORTED"
+        return {"data": run_view(run)}
+
+    @app.get("/apify/v2/datasets/{dataset_id}/items")
+    async def dataset_items(dataset_id: str, limit: int = 10, offset: int = 0):
+        run = runs[dataset_id]
+        items = _actor_items(run["actor_id"], run["input"], limit)[offset:offset + limit]
+        return Response(
+            content=json.dumps(items),
+            media_type="application/json",
+            headers={
+                "x-apify-pagination-total": str(len(items)),
+                "x-apify-pagination-offset": str(offset),
+                "x-apify-pagination-count": str(len(items)),
+                "x-apify-pagination-limit": str(limit),
+                "x-apify-pagination-desc": ""
+            }
+        )
+
+    @app.get("/google/customsearch/v1")
+    async def custom_search(request: Request, q: str, num: int = 10, start: int = 1):
+        await latencies["google"].wait()
+        if (failure := fault()) is not None:
+            return failure
+        base_url = str(request.base_url).rstrip("/")
+        terms = " ".join(re.findall(r"[A-Za-z0-9-]+", q)[:4])
+        items = []
+        for position in range(start, start + num):
+            page_id = int(hashlib.md5(f"{q}:{position}".encode()).hexdigest(), 16) % 1000
+            items.append({
+                "title": f"{terms} announces new platform initiative",
+                "link": f"{base_url}/web/{page_id}.html",
+                "snippet": f"{terms} expands its developer tools team after a new funding round.",
+                "displayLink": request.url.netloc
+            })
+        return {"searchInformation": {"totalResults": "1000"}, "items": items}
+
+    @app.get("/web/{page_id}.html")
+    async def web_page(page_id: int):
+        await latencies["web"].wait()
+        if (failure := fault()) is not None:
+            return failure
+        return HTMLResponse(_web_page(page_id))
+
+    return app
+
+
+def run_stub_server(
+    port: int,
+    latency_specs: Dict[str, str],
+    chunk_delay_ms: float,
+    seed: int,
+    fault_rate: float = 0.0
+) -> None:
+    import uvicorn
+
+    random.seed(seed)
+    uvicorn.run(
+        create_stub_app(latency_specs, chunk_delay_ms, fault_rate), host="127.0.0.1", port=port, log_level="warning"
+    )
@@ -1,5 +1,6 @@
+import json
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
 
 try:
     from dotenv import load_dotenv
@@ -15,6 +16,69 @@ class Config:
         self.OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_KEY")
         self.GOOGLE_SEARCH_API_KEY: Optional[str] = os.getenv("GOOGLE_SEARCH_KEY")
         self.GOOGLE_SEARCH_ENGINE_ID: Optional[str] = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
+        self.OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL")
+        self.APIFY_API_URL: Optional[str] = os.getenv("APIFY_API_URL")
+        self.GOOGLE_SEARCH_BASE_URL: str = os.getenv("GOOGLE_SEARCH_BASE_URL", "https://www.googleapis.com/customsearch/v1")
+        self.PARALLEL_TOOL_CALLS: bool = os.getenv("PARALLEL_TOOL_CALLS", "true").lower() == "true"
+        self.TOOL_MAX_CONCURRENCY: int = int(os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+        self.APIFY_ACTOR_TIMEOUT_SECS: int = int(os.getenv("APIFY_ACTOR_TIMEOUT_SECS", "120"))
+        self.PREFETCH_ENABLED: bool = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+        self.CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+        self.DATA_DIR: str = os.getenv("DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+        self.CACHE_DB_PATH: str = os.getenv("CACHE_DB_PATH", os.path.join(self.DATA_DIR, "cache.sqlite3"))
+        self.LINKEDIN_CACHE_TTL_SECS: Dict[str, int] = {
+            "profile_details": int(os.getenv("LINKEDIN_PROFILE_CACHE_TTL_SECS", str(24 * 3600))),
+            "profile_posts": int(os.getenv("LINKEDIN_POSTS_CACHE_TTL_SECS", str(6 * 3600))),
+            "profile_reactions": int(os.getenv("LINKEDIN_REACTIONS_CACHE_TTL_SECS", str(6 * 3600))),
+            "company_details": int(os.getenv("LINKEDIN_COMPANY_CACHE_TTL_SECS", str(7 * 24 * 3600))),
+            "company_posts": int(os.getenv("LINKEDIN_COMPANY_POSTS_CACHE_TTL_SECS", str(6 * 3600)))
+        }
+        self.LINKEDIN_NEGATIVE_CACHE_TTL_SECS: int = int(os.getenv("LINKEDIN_NEGATIVE_CACHE_TTL_SECS", "900"))
+        self.GOOGLE_SEARCH_CACHE_TTL_SECS: int = int(os.getenv("GOOGLE_SEARCH_CACHE_TTL_SECS", "3600"))
+        self.GOOGLE_SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("GOOGLE_SEARCH_CACHE_MAX_ENTRIES", "512"))
+        self.GOOGLE_SEARCH_DISK_CACHE: bool = os.getenv("GOOGLE_SEARCH_DISK_CACHE", "false").lower() == "true"
+        self.BROWSE_MAX_BYTES: int = int(os.getenv("BROWSE_MAX_BYTES", str(2 * 1024 * 1024)))
+        self.BROWSE_MAX_TEXT_CHARS: int = int(os.getenv("BROWSE_MAX_TEXT_CHARS", "8000"))
+        self.BROWSE_MAX_HTML_CHARS: int = int(os.getenv("BROWSE_MAX_HTML_CHARS", "20000"))
+        self.BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "5"))
+        self.BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "2000"))
+        self.CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "24000"))
+        self.CONTEXT_KEEP_RECENT_TOOL_RESULTS: int = int(os.getenv("CONTEXT_KEEP_RECENT_TOOL_RESULTS", "4"))
+        self.CONTEXT_COMPACTION_STRATEGY: str = os.getenv("CONTEXT_COMPACTION_STRATEGY", "truncate")
+        self.CONTEXT_DIGEST_MAX_CHARS: int = int(os.getenv("CONTEXT_DIGEST_MAX_CHARS", "1200"))
+        self.CONTEXT_COMPACTION_TARGET_RATIO: float = float(os.getenv("CONTEXT_COMPACTION_TARGET_RATIO", "0.75"))
+        # JSON object merged over constants.model_routes per stage, e.g. {"scoring": {"reasoning_effort": "high"}}.
+        self.MODEL_ROUTES_OVERRIDE: Dict[str, Dict[str, Any]] = json.loads(os.getenv("MODEL_ROUTES_OVERRIDE") or "{}")
+        self.MODEL_DOWNGRADE_COOLDOWN_SECS: float = float(os.getenv("MODEL_DOWNGRADE_COOLDOWN_SECS", "300"))
+        self.PROMPT_CACHE_KEY_ENABLED: bool = os.getenv("PROMPT_CACHE_KEY_ENABLED", "true").lower() == "true"
+        self.RESILIENCE_ENABLED: bool = os.getenv("RESILIENCE_ENABLED", "true").lower() == "true"
+        self.RESILIENCE_POLICIES_OVERRIDE: Dict[str, Dict[str, Any]] = json.loads(os.getenv("RESILIENCE_POLICIES_OVERRIDE") or "{}")
+        self.APIFY_CLIENT_MAX_RETRIES: int = int(os.getenv("APIFY_CLIENT_MAX_RETRIES", "2"))
+        self.RUN_DEADLINE_SECS: float = float(os.getenv("RUN_DEADLINE_SECS", "300"))
+        self.RUN_DEADLINE_FINISH_RESERVE_SECS: float = float(os.getenv("RUN_DEADLINE_FINISH_RESERVE_SECS", "45"))
+        self.SCORING_MAX_ATTEMPTS: int = int(os.getenv("SCORING_MAX_ATTEMPTS", "2"))
+        self.SCORING_HEDGE_ENABLED: bool = os.getenv("SCORING_HEDGE_ENABLED", "false").lower() == "true"
+        self.SCORING_HEDGE_DELAY_SECS: float = float(os.getenv("SCORING_HEDGE_DELAY_SECS", "20"))
+        self.NEWS_LOCAL_VALIDATION: bool = os.getenv("NEWS_LOCAL_VALIDATION", "true").lower() == "true"
+        self.CASSETTE_RECORD_DIR: Optional[str] = os.getenv("CASSETTE_RECORD_DIR")
+        self.RUN_STORE_DB_PATH: str = os.getenv("RUN_STORE_DB_PATH", os.path.join(self.DATA_DIR, "runs.sqlite3"))
+        self.RUN_RETENTION_SECS: int = int(os.getenv("RUN_RETENTION_SECS", str(24 * 3600)))
+        self.RUN_DETACHED_GRACE_SECS: float = float(os.getenv("RUN_DETACHED_GRACE_SECS", "120"))
+        self.RUN_LEASE_SECS: float = float(os.getenv("RUN_LEASE_SECS", "30"))
+        self.ASSESSMENT_STORE_ENABLED: bool = os.getenv("ASSESSMENT_STORE_ENABLED", "true").lower() == "true"
+        self.ASSESSMENT_STORE_DB_PATH: str = os.getenv(
+            "ASSESSMENT_STORE_DB_PATH", os.path.join(self.DATA_DIR, "assessments.sqlite3")
+        )
+        self.ASSESSMENT_MAX_AGE_SECS: float = float(os.getenv("ASSESSMENT_MAX_AGE_SECS", str(7 * 24 * 3600)))
+        self.SSE_HEARTBEAT_SECS: float = float(os.getenv("SSE_HEARTBEAT_SECS", "15"))
+        self.SSE_COMPRESSION_ENABLED: bool = os.getenv("SSE_COMPRESSION_ENABLED", "true").lower() == "true"
+        self.SSE_COMPRESSION_LEVEL: int = int(os.getenv("SSE_COMPRESSION_LEVEL", "6"))
+        self.ARTIFACT_INLINE_MAX_BYTES: int = int(os.getenv("ARTIFACT_INLINE_MAX_BYTES", "1024"))
+        self.ARTIFACT_PREVIEW_CHARS: int = int(os.getenv("ARTIFACT_PREVIEW_CHARS", "160"))
+        self.ARTIFACT_PREVIEW_ITEMS: int = int(os.getenv("ARTIFACT_PREVIEW_ITEMS", "3"))
+        self.STARTUP_WARMUP_ENABLED: bool = os.getenv("STARTUP_WARMUP_ENABLED", "true").lower() == "true"
+        self.STARTUP_WARMUP_TIMEOUT_SECS: float = float(os.getenv("STARTUP_WARMUP_TIMEOUT_SECS", "10"))
+
     def validate_required_config(self) -> None:
         """Validate that required configuration values are present."""
         required_configs = []
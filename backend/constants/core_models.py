@@ -1,6 +1,23 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 class StartProspectingPayload(BaseModel):
     profile_url: str
     intent: str
-    dry_run: bool = False
\ No newline at end of file
+    dry_run: bool = False
+    force_refresh: bool = False
+    max_age_secs: Optional[float] = None
+    deadline_secs: Optional[float] = None
+
+
+class ProspectingItem(BaseModel):
+    profile_url: str
+    intent: str
+
+
+class StartBatchProspectingPayload(BaseModel):
+    items: List[ProspectingItem]
+    max_concurrency: Optional[int] = None
+    run_timeout_secs: Optional[float] = None
+    dry_run: bool = False
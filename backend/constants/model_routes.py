@@ -0,0 +1,36 @@
+# Model, reasoning effort and request timeout per LLM call site. Stages with a latency budget fall back to their
+# "fallback" settings for a cool-down period once their smoothed latency runs over the budget.
+MODEL_ROUTES = {
+    "agent_step": {
+        "model": "gpt-4o",
+        "timeout_secs": 60,
+        "latency_budget_secs": 20,
+        "fallback": {"model": "gpt-4o-mini"}
+    },
+    "analysis": {
+        "model": "o3-mini",
+        "reasoning_effort": "medium",
+        "timeout_secs": 120,
+        "latency_budget_secs": 45,
+        "fallback": {"reasoning_effort": "low"}
+    },
+    "validation": {
+        "model": "gpt-4o-mini",
+        "timeout_secs": 20
+    },
+    "name_extraction": {
+        "model": "gpt-4o-mini",
+        "timeout_secs": 20
+    },
+    "scoring": {
+        "model": "o3-mini",
+        "reasoning_effort": "medium",
+        "timeout_secs": 120,
+        "latency_budget_secs": 40,
+        "fallback": {"reasoning_effort": "low"}
+    },
+    "compaction": {
+        "model": "gpt-4o-mini",
+        "timeout_secs": 30
+    }
+}
@@ -49,7 +49,7 @@ Evaluate prospects across these four dimensions:
 - search_company_news: Find recent news, funding, acquisitions, partnerships
 - search_person_news: Find mentions, interviews, speaking engagements
 - search_web: General web search for any topic
-- browse_web: Get full HTML content from specific URLs
+- browse_web: Read the main text content of specific URLs
 
 **Analysis Tools:**
 - analyze_with_llm: Deep analysis for extracting BANT signals, patterns, insights
@@ -58,6 +58,8 @@ Be methodical. Gather evidence from MULTIPLE sources. Think critically about psy
 
 When you have sufficient evidence across BANT dimensions WITH external validation, call the finish tool with a comprehensive summary of your research findings."""
 
+COMPACTION_SYSTEM_PROMPT = """You compress tool results for a research agent's working memory. Summarize the given tool output in a few sentences. Keep every name, title, company, number, date and URL that could matter for prospect qualification. Drop boilerplate and formatting. Return plain text only."""
+
 FINISH_SYSTEM_PROMPT = """You are a concise summarization assistant. Given a summary of agent actions, create a clear, professional summary of what was accomplished. Keep it brief but informative."""
 
 SCORING_SYSTEM_PROMPT = """You are a CRITICAL prospect qualification analyst. Your job is to rigorously analyze research findings and extract intent signals using the BANT framework.
@@ -0,0 +1,40 @@
+# Retry, hedging and circuit-breaker settings per external provider. Retries and hedges only apply to idempotent
+# calls; a hedge is a duplicate attempt started once the first has run past the provider's recent latency quantile.
+DEFAULT_RESILIENCE_POLICY = {
+    "max_attempts": 1,
+    "backoff_base_secs": 0.25,
+    "backoff_max_secs": 4,
+    "hedge": False,
+    "hedge_quantile": 0.95,
+    "hedge_min_samples": 20,
+    "hedge_min_delay_secs": 0.5,
+    "latency_window": 200,
+    "failure_threshold": 5,
+    "reset_secs": 30
+}
+
+RESILIENCE_POLICIES = {
+    "apify": {
+        # Actor runs are long and billed, so they are only hedged well into their tail.
+        "max_attempts": 2,
+        "backoff_base_secs": 1,
+        "hedge": True,
+        "hedge_min_delay_secs": 10,
+        "reset_secs": 60
+    },
+    "google_search": {
+        "max_attempts": 3,
+        "hedge": True
+    },
+    "web": {
+        "max_attempts": 2,
+        "hedge": True,
+        "hedge_min_delay_secs": 1,
+        "failure_threshold": 3,
+        "reset_secs": 60
+    },
+    "openai": {
+        # The SDK already retries failed requests, and duplicate completions cost tokens.
+        "failure_threshold": 8
+    }
+}
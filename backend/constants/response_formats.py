@@ -0,0 +1,47 @@
+SCORING_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "prospect_assessment",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "good_signals": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "bad_signals": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "score": {
+                    "type": "integer",
+                    "description": "Alignment score from 1 to 100"
+                },
+                "reasoning": {"type": "string"}
+            },
+            "required": ["good_signals", "bad_signals", "score", "reasoning"],
+            "additionalProperties": False
+        }
+    }
+}
+
+NEWS_VALIDATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "news_validation",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "relevant_indices": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "0-indexed positions of the results about the target"
+                }
+            },
+            "required": ["relevant_indices"],
+            "additionalProperties": False
+        }
+    }
+}
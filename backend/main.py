@@ -1,11 +1,49 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from typing import Set
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from config import config
 from routes.core import core_router
 from routes.search import search_router
+from services.apify_service import service as apify_service
+from services.cache_service import service as cache_service
+from services.context_compaction_service import service as context_compaction_service
+from services.google_search_service import service as google_search_service
 from services.logger_service import logger_service
+from services.openai_service import service as openai_service
+from services.resilience_service import service as resilience_service
+from services.run_store_service import service as run_store_service
+from services.telemetry_service import service as telemetry_service
+from services.web_browsing_service import service as web_browsing_service
+
+
+# The event loop only holds weak references to tasks, so warm-ups that outlive startup are kept here.
+warmup_tasks: Set[asyncio.Task] = set()
+
+
+async def warm_up() -> None:
+    """Import provider SDKs and open pooled connections before the first request pays for them."""
+    started_at = time.perf_counter()
+    tasks = [
+        asyncio.create_task(openai_service.warm_up()),
+        asyncio.create_task(apify_service.warm_up()),
+        asyncio.create_task(google_search_service.warm_up()),
+        asyncio.create_task(asyncio.to_thread(context_compaction_service.warm_up))
+    ]
+
+    # Stragglers keep running in the background rather than holding up startup.
+    _, pending = await asyncio.wait(tasks, timeout=config.STARTUP_WARMUP_TIMEOUT_SECS)
+    for task in pending:
+        warmup_tasks.add(task)
+        task.add_done_callback(warmup_tasks.discard)
+    logger_service.info(
+        f"Warm-up finished in {time.perf_counter() - started_at:.2f}s"
+        + (f" ({len(pending)} still running)" if pending else "")
+    )
 
 
 @asynccontextmanager
@@ -13,9 +51,20 @@ async def lifespan(_: FastAPI):
     logger_service.info("Starting application")
     config.validate_required_config()
 
+    # The stores open lazily; expired rows are cleared here rather than whenever a module imports them.
+    await asyncio.to_thread(cache_service.purge_expired)
+    await asyncio.to_thread(run_store_service.purge_expired)
+
+    if config.STARTUP_WARMUP_ENABLED:
+        await warm_up()
+
     yield
 
     logger_service.info("Shutting down application")
+    for task in list(warmup_tasks):
+        task.cancel()
+    await google_search_service.close()
+    await web_browsing_service.close()
     logger_service.info("Application shutdown complete")
 
 
@@ -32,6 +81,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Served-From-Store"],
 )
 
 app.include_router(search_router, prefix="/search", tags=["search"])
@@ -45,6 +95,22 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    body, content_type = telemetry_service.render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/model_routes")
+async def model_routes():
+    return openai_service.get_routing_state()
+
+
+@app.get("/resilience")
+async def resilience():
+    return resilience_service.get_state()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,24 +1,52 @@
-from fastapi import APIRouter, Body, HTTPException
-from fastapi.responses import StreamingResponse
+import asyncio
+from typing import Optional
 
-from constants.core_models import StartProspectingPayload
-from services.tool_calling_service import service as tool_calling_service
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Response
+
+from constants.core_models import StartProspectingPayload, StartBatchProspectingPayload
+from services.assessment_store_service import service as assessment_store_service
+from services.batch_prospecting_service import service as batch_prospecting_service
+from services.event_stream_service import service as event_stream_service
+from services.run_manager_service import service as run_manager_service
 from services.logger_service import logger_service
 
 core_router = APIRouter()
 
 @core_router.post("/v1/start_prospecting")
-async def start_prospecting(payload: StartProspectingPayload = Body(...)):
+async def start_prospecting(
+    payload: StartProspectingPayload = Body(...),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding")
+):
     try:
-        logger_service.info(f"Starting agent execution for: {payload.profile_url}")
+        run_id, last_seq = run_manager_service.parse_event_id(last_event_id)
+        if not run_id and not payload.dry_run and not payload.force_refresh:
+            stored = await asyncio.to_thread(
+                assessment_store_service.get, payload.profile_url, payload.intent, payload.max_age_secs
+            )
+            if stored is not None:
+                logger_service.info(f"Serving stored assessment for: {payload.profile_url}")
+                return event_stream_service.response(
+                    run_manager_service.stream_stored(stored),
+                    accept_encoding,
+                    headers={"X-Served-From-Store": "true"}
+                )
 
-        return StreamingResponse(
-            tool_calling_service.execute_with_streaming(
+        if run_id and await run_manager_service.get_run(run_id):
+            logger_service.info(f"Reconnecting to run {run_id} after event {last_seq}")
+        else:
+            logger_service.info(f"Starting agent execution for: {payload.profile_url}")
+            run_id, last_seq = await run_manager_service.start(
                 user_goal=payload.intent,
                 linkedin_profile_url=payload.profile_url,
-                dry_run=payload.dry_run
-            ),
-            media_type="text/event-stream"
+                dry_run=payload.dry_run,
+                deadline_secs=payload.deadline_secs
+            ), 0
+
+        return event_stream_service.response(
+            run_manager_service.stream(run_id, last_seq),
+            accept_encoding,
+            headers={"X-Served-From-Store": "false"}
         )
 
     except RuntimeError as e:
@@ -28,3 +56,63 @@ async def start_prospecting(payload: StartProspectingPayload = Body(...)):
     except Exception as e:
         logger_service.error(f"Unexpected error during agent execution: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@core_router.get("/v1/runs/{run_id}/events")
+async def stream_run_events(
+    run_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    after: Optional[str] = Query(None, description="Last event id seen, for clients that cannot set headers"),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding")
+):
+    run = await run_manager_service.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run: {run_id}")
+
+    event_run_id, last_seq = run_manager_service.parse_event_id(last_event_id or after)
+    if event_run_id not in (None, run_id):
+        raise HTTPException(status_code=400, detail="Last-Event-ID belongs to a different run")
+
+    return event_stream_service.response(run_manager_service.stream(run_id, last_seq), accept_encoding)
+
+
+@core_router.get("/v1/runs/{run_id}/artifacts/{artifact_id}")
+async def get_run_artifact(run_id: str, artifact_id: str):
+    payload = await run_manager_service.get_artifact(run_id, artifact_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Unknown artifact: {artifact_id}")
+
+    return Response(content=payload, media_type="application/json", headers={"Cache-Control": "private, max-age=3600"})
+
+
+@core_router.post("/v1/start_batch_prospecting")
+async def start_batch_prospecting(
+    payload: StartBatchProspectingPayload = Body(...),
+    accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding")
+):
+    if not payload.items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+
+    if len(payload.items) > batch_prospecting_service.max_items:
+        raise HTTPException(status_code=400, detail=f"Batch exceeds the maximum of {batch_prospecting_service.max_items} items")
+
+    try:
+        logger_service.info(f"Starting batch agent execution for {len(payload.items)} profiles")
+
+        return event_stream_service.response(
+            batch_prospecting_service.execute_batch_with_streaming(
+                items=payload.items,
+                max_concurrency=payload.max_concurrency,
+                run_timeout_secs=payload.run_timeout_secs,
+                dry_run=payload.dry_run
+            ),
+            accept_encoding
+        )
+
+    except RuntimeError as e:
+        logger_service.error(f"Runtime error during batch agent execution: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+    except Exception as e:
+        logger_service.error(f"Unexpected error during batch agent execution: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
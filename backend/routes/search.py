@@ -11,7 +11,7 @@ async def search_user(payload: SearchUserPayload = Body(...)):
     try:
         logger_service.info(f"Received search request for: {payload.profile_url}")
 
-        response_payload = linkedin_service.get_profile_details(payload.profile_url)
+        response_payload = await linkedin_service.get_profile_details(payload.profile_url)
 
         return response_payload
 
@@ -1,54 +1,176 @@
+import asyncio
+import json
 from typing import Dict, Any, Optional, List
 
-from apify_client import ApifyClient
 from config import config
+from services.deadline_service import DeadlineExceededError, service as deadline_service
+from services.logger_service import logger_service
+from services.resilience_service import is_client_error, is_transient, service as resilience_service
+from services.telemetry_service import service as telemetry_service
 
 
+TERMINAL_RUN_STATUSES = ("SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED")
+TIMEOUT_RUN_STATUSES = ("TIMING-OUT", "TIMED-OUT")
+# Status messages of FAILED runs that point at the platform rather than the input or the actor itself.
+INFRASTRUCTURE_FAILURE_MARKERS = (
+    "migrat", "out of memory", "killed", "internal error", "server error", "network", "connection", "rate limit"
+)
+
+
+class ActorRunFailedError(Exception):
+    def __init__(self, actor_id: str, run_result: Dict[str, Any]):
+        self.status_message = run_result.get("statusMessage") or ""
+        super().__init__(
+            f"Apify actor {actor_id} run {run_result.get('id')} failed"
+            + (f": {self.status_message}" if self.status_message else "")
+        )
+        self.run_result = run_result
+
+    @property
+    def infrastructure(self) -> bool:
+        message = self.status_message.lower()
+        return any(marker in message for marker in INFRASTRUCTURE_FAILURE_MARKERS)
+
+
+def _is_transient(error: BaseException) -> bool:
+    # A run that failed on its input or a bug in the actor fails the same way again, and each retry is billed.
+    if isinstance(error, ActorRunFailedError):
+        return error.infrastructure
+    return is_transient(error)
+
+
+def _is_client_error(error: BaseException) -> bool:
+    if isinstance(error, ActorRunFailedError):
+        return not error.infrastructure
+    return is_client_error(error)
+
 
 class ApifyService:
     def __init__(self):
+        self._client = None
+        self.default_timeout_secs = config.APIFY_ACTOR_TIMEOUT_SECS
+        self.wait_grace_secs = 15
+        self._aborts = set()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            from apify_client import ApifyClientAsync
+            # Request-level retries stay short; whole runs are retried and hedged by the resilience service.
+            self._client = ApifyClientAsync(
+                config.APIFY_API_TOKEN, api_url=config.APIFY_API_URL, max_retries=config.APIFY_CLIENT_MAX_RETRIES
+            )
+        return self._client
 
-        self.client = ApifyClient(config.APIFY_API_TOKEN)
+    async def warm_up(self) -> None:
+        client = await asyncio.to_thread(lambda: self.client)
+        try:
+            await client.user().get()
+        except Exception as e:
+            logger_service.debug(f"Apify warm-up request failed: {e}")
 
-    def run_actor(
+    async def _abort(self, run_id: str) -> None:
+        try:
+            await self.client.run(run_id).abort()
+        except Exception as e:
+            logger_service.warning(f"Failed to abort Apify run {run_id}: {e}")
+
+    async def run_actor(
         self,
         actor_id: str,
         run_input: Dict[str, Any],
         timeout_secs: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
-        actor_client = self.client.actor(actor_id)
-        run_result = actor_client.call(run_input=run_input, timeout_secs=timeout_secs)
+        """Raises ActorRunFailedError for FAILED runs so an empty dataset is never mistaken for "no results"."""
+        return await resilience_service.call(
+            "apify",
+            lambda: self._run_actor_once(actor_id, run_input, timeout_secs or self.default_timeout_secs),
+            operation=actor_id,
+            breaker_key=actor_id,
+            transient=_is_transient,
+            client_error=_is_client_error
+        )
+
+    async def _run_actor_once(
+        self,
+        actor_id: str,
+        run_input: Dict[str, Any],
+        timeout_secs: int
+    ) -> Dict[str, Any]:
+        budget_secs = deadline_service.timeout(timeout_secs)
+        # Cut short by the run deadline: let Apify stop the actor itself and skip the usual grace period.
+        clamped = budget_secs < timeout_secs
+        timeout_secs = max(1, int(budget_secs))
+        wait_secs = timeout_secs if clamped else timeout_secs + self.wait_grace_secs
+
+        with telemetry_service.provider_span("apify", "actor.run", actor_id=actor_id) as span:
+            actor_client = self.client.actor(actor_id)
+            run = await actor_client.start(run_input=run_input, timeout_secs=timeout_secs)
+
+            run_client = self.client.run(run["id"])
+            try:
+                run_result = await run_client.wait_for_finish(wait_secs=wait_secs)
+            except asyncio.CancelledError:
+                # A losing hedged attempt or an abandoned tool call; the actor would otherwise keep running and billing.
+                abort = asyncio.ensure_future(self._abort(run["id"]))
+                self._aborts.add(abort)
+                abort.add_done_callback(self._aborts.discard)
+                raise
+            span.set(run_status=run_result.get("status") if run_result else None, deadline_clamped=clamped)
+
+            if not run_result or run_result.get("status") not in TERMINAL_RUN_STATUSES:
+                logger_service.warning(f"Apify actor {actor_id} run {run['id']} did not finish in {timeout_secs}s, aborting")
+                await self._abort(run["id"])
+                if clamped:
+                    raise DeadlineExceededError(f"Run deadline reached while Apify actor {actor_id} was running")
+                raise TimeoutError(f"Apify actor {actor_id} timed out")
+
+            if clamped and run_result.get("status") in TIMEOUT_RUN_STATUSES:
+                raise DeadlineExceededError(f"Run deadline reached while Apify actor {actor_id} was running")
+
+            if run_result.get("status") == "FAILED":
+                raise ActorRunFailedError(actor_id, run_result)
 
         return run_result
 
-    def get_dataset_items(
+    async def get_dataset_items(
         self,
         dataset_id: str,
         limit: Optional[int] = None,
         offset: Optional[int] = 0
     ) -> List[Dict[str, Any]]:
-        dataset_client = self.client.dataset(dataset_id)
-        result = dataset_client.list_items(limit=limit, offset=offset)
+        return await resilience_service.call(
+            "apify", lambda: self._list_items(dataset_id, limit, offset), operation="dataset.list_items"
+        )
+
+    async def _list_items(self, dataset_id: str, limit: Optional[int], offset: Optional[int]) -> List[Dict[str, Any]]:
+        with telemetry_service.provider_span("apify", "dataset.list_items") as span:
+            dataset_client = self.client.dataset(dataset_id)
+            result = await dataset_client.list_items(limit=limit, offset=offset)
+            span.set(items=len(result.items), bytes=len(json.dumps(result.items, default=str)))
 
         return result.items
 
-    def run_actor_and_get_results(
+    async def run_actor_and_get_results(
         self,
         actor_id: str,
         run_input: Dict[str, Any],
         timeout_secs: Optional[int] = None,
         limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        run_result = self.run_actor(actor_id, run_input, timeout_secs)
+        run_result = await self.run_actor(actor_id, run_input, timeout_secs)
 
         if not run_result:
             return []
 
+        if run_result.get("status") in TIMEOUT_RUN_STATUSES:
+            raise TimeoutError(f"Apify actor {actor_id} timed out")
+
         dataset_id = run_result.get("defaultDatasetId")
         if not dataset_id:
             return []
 
-        return self.get_dataset_items(dataset_id, limit=limit)
+        return await self.get_dataset_items(dataset_id, limit=limit)
 
 
 service = ApifyService()
@@ -0,0 +1,58 @@
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+
+from config import config
+
+
+TITLE_KEYS = ("title", "name", "fullname", "full_name", "headline", "url", "query", "summary")
+
+
+class ArtifactService:
+    """Replaces bulky tool results in streamed events with a preview and an artifact reference."""
+
+    def __init__(self):
+        self.inline_max_bytes = config.ARTIFACT_INLINE_MAX_BYTES
+        self.preview_chars = config.ARTIFACT_PREVIEW_CHARS
+        self.preview_items = config.ARTIFACT_PREVIEW_ITEMS
+
+    def _preview(self, value: Any, depth: int = 0) -> Any:
+        if isinstance(value, str):
+            return value if len(value) <= self.preview_chars else value[:self.preview_chars].rstrip() + "…"
+
+        if isinstance(value, list):
+            if depth >= 2:
+                return {"count": len(value)}
+            return {
+                "count": len(value),
+                "items": [self._preview(item, depth + 1) for item in value[:self.preview_items]]
+            }
+
+        if isinstance(value, dict):
+            if depth >= 2:
+                return {key: value[key] for key in TITLE_KEYS if isinstance(value.get(key), (str, int, float))}
+
+            preview = {}
+            for key in sorted(value, key=lambda key: key not in TITLE_KEYS):
+                if key == "html":
+                    continue
+                preview[key] = self._preview(value[key], depth + 1)
+            return preview
+
+        return value
+
+    def slim_tool_event(self, event: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Tuple[str, bytes]]]:
+        """Returns the event to stream and, when the result was moved out, its (artifact_id, payload)."""
+        payload = orjson.dumps(event["result"], default=str, option=orjson.OPT_NON_STR_KEYS)
+        if len(payload) <= self.inline_max_bytes:
+            return event, None
+
+        artifact_id = uuid.uuid4().hex[:16]
+        slim = {key: value for key, value in event.items() if key != "result"}
+        slim.update(preview=self._preview(event["result"]), artifact_id=artifact_id, result_bytes=len(payload))
+
+        return slim, (artifact_id, payload)
+
+
+service = ArtifactService()
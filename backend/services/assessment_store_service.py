@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import config
+from services.linkedin_service import service as linkedin_service
+from services.logger_service import logger_service
+
+
+INTENT_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "i", "in", "is", "it", "of", "on", "or",
+    "our", "that", "the", "their", "this", "to", "we", "with", "who", "you", "your"
+}
+
+
+class AssessmentStoreService:
+    def __init__(self, db_path: str = config.ASSESSMENT_STORE_DB_PATH):
+        self.db_path = db_path
+        self.enabled = config.ASSESSMENT_STORE_ENABLED
+        self.max_age_secs = config.ASSESSMENT_MAX_AGE_SECS
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS assessments (
+                    profile_key TEXT NOT NULL,
+                    intent_key TEXT NOT NULL,
+                    profile_url TEXT NOT NULL,
+                    intent TEXT NOT NULL,
+                    assessment TEXT NOT NULL,
+                    evidence TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (profile_key, intent_key)
+                )"""
+            )
+            connection.commit()
+            self._local.connection = connection
+
+        return connection
+
+    def profile_key(self, profile_url: str) -> str:
+        return f"https://www.linkedin.com/in/{linkedin_service.canonical_profile_slug(profile_url)}/"
+
+    def intent_key(self, intent: str) -> str:
+        # Order-insensitive bag of content words, so light rewording maps to the same key.
+        words = {word for word in re.findall(r"[a-z0-9]+", intent.lower()) if word not in INTENT_STOPWORDS}
+        return hashlib.sha1(" ".join(sorted(words)).encode()).hexdigest()
+
+    def get(self, profile_url: str, intent: str, max_age_secs: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+
+        try:
+            row = self._connection().execute(
+                "SELECT assessment, evidence, created_at FROM assessments WHERE profile_key = ? AND intent_key = ?",
+                (self.profile_key(profile_url), self.intent_key(intent))
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger_service.warning(f"Assessment store read failed for {profile_url}: {e}")
+            return None
+
+        if not row:
+            return None
+
+        assessment, evidence, created_at = row
+        age_secs = time.time() - created_at
+        if age_secs > (self.max_age_secs if max_age_secs is None else max_age_secs):
+            return None
+
+        return {
+            "assessment": json.loads(assessment),
+            "evidence": json.loads(evidence),
+            "created_at": created_at,
+            "age_secs": age_secs
+        }
+
+    def put(self, profile_url: str, intent: str, assessment: Dict[str, Any], evidence: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO assessments "
+                "(profile_key, intent_key, profile_url, intent, assessment, evidence, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.profile_key(profile_url), self.intent_key(intent), profile_url, intent,
+                    json.dumps(assessment), json.dumps(evidence, default=str), time.time()
+                )
+            )
+            connection.commit()
+        except sqlite3.Error as e:
+            logger_service.warning(f"Assessment store write failed for {profile_url}: {e}")
+
+
+service = AssessmentStoreService()
@@ -0,0 +1,137 @@
+import asyncio
+import time
+import uuid
+from typing import AsyncGenerator, Dict, Any, List, Optional
+
+from config import config
+from constants.core_models import ProspectingItem
+from services.event_stream_service import StreamEvent
+from services.artifact_service import service as artifact_service
+from services.logger_service import logger_service
+from services.run_store_service import service as run_store_service
+from services.tool_calling_service import service as tool_calling_service
+
+
+class BatchProspectingService:
+    def __init__(self):
+        self.max_concurrency = max(1, config.BATCH_MAX_CONCURRENCY)
+        self.max_items = config.BATCH_MAX_ITEMS
+        self.event_queue_size = 1000
+
+    async def execute_batch_with_streaming(
+        self,
+        items: List[ProspectingItem],
+        max_concurrency: Optional[int] = None,
+        run_timeout_secs: Optional[float] = None,
+        dry_run: bool = False
+    ) -> AsyncGenerator[StreamEvent, None]:
+        batch_id = uuid.uuid4().hex[:12]
+        concurrency = min(max_concurrency or self.max_concurrency, self.max_concurrency, max(len(items), 1))
+        concurrency = max(1, concurrency)
+
+        events: asyncio.Queue = asyncio.Queue(maxsize=self.event_queue_size)
+        pending: asyncio.Queue = asyncio.Queue()
+        for index, item in enumerate(items):
+            pending.put_nowait((f"{batch_id}-{index}", item))
+
+        async def run_one(run_id: str, item: ProspectingItem) -> None:
+            status = "incomplete"
+            started_at = time.monotonic()
+
+            async def consume() -> None:
+                nonlocal status
+                # The run deadline lets the agent wrap up before wait_for below has to cut it off.
+                async for event in tool_calling_service.execute_events(
+                    item.intent, item.profile_url, dry_run, deadline_secs=run_timeout_secs
+                ):
+                    if event["type"] == "tool_completed":
+                        # Stored before the reference goes out, so the artifact endpoint can serve it right away.
+                        event, artifact = artifact_service.slim_tool_event(event)
+                        if artifact is not None:
+                            await asyncio.to_thread(
+                                run_store_service.save_artifacts, run_id, [(artifact[0], artifact[1].decode())]
+                            )
+                    elif event["type"] == "final_result":
+                        status = "completed"
+                    elif event["type"] == "error":
+                        status = "failed"
+                    await events.put({"run_id": run_id, **event})
+
+            await events.put({"type": "run_started", "run_id": run_id, "profile_url": item.profile_url, "intent": item.intent})
+
+            try:
+                await asyncio.wait_for(consume(), timeout=run_timeout_secs)
+            except asyncio.TimeoutError:
+                status = "timed_out"
+            except Exception as e:
+                logger_service.error(f"Batch run {run_id} failed: {e}")
+                status = "failed"
+                await events.put({"type": "error", "run_id": run_id, "message": str(e)})
+
+            await events.put({
+                "type": "run_finished",
+                "run_id": run_id,
+                "status": status,
+                "duration_secs": round(time.monotonic() - started_at, 3)
+            })
+
+        async def worker() -> None:
+            while True:
+                try:
+                    run_id, item = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await run_one(run_id, item)
+
+        batch_started_at = time.monotonic()
+        progress = {
+            "total": len(items),
+            "finished": 0,
+            "completed": 0,
+            "failed": 0,
+            "incomplete": 0,
+            "timed_out": 0,
+            "in_flight": 0
+        }
+
+        yield StreamEvent({"type": "batch_started", "batch_id": batch_id, "total": len(items), "concurrency": concurrency})
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+        try:
+            while progress["finished"] < progress["total"]:
+                event = await events.get()
+                yield StreamEvent(event)
+
+                if event["type"] == "run_started":
+                    progress["in_flight"] += 1
+                    continue
+
+                if event["type"] != "run_finished":
+                    continue
+
+                progress["in_flight"] -= 1
+                progress["finished"] += 1
+                progress[event["status"]] += 1
+                yield StreamEvent(self._progress_event(batch_id, progress, batch_started_at))
+
+            yield StreamEvent({**self._progress_event(batch_id, progress, batch_started_at), "type": "batch_completed"})
+
+        finally:
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+
+    def _progress_event(self, batch_id: str, progress: Dict[str, int], batch_started_at: float) -> Dict[str, Any]:
+        elapsed_secs = time.monotonic() - batch_started_at
+
+        return {
+            "type": "batch_progress",
+            "batch_id": batch_id,
+            **progress,
+            "elapsed_secs": round(elapsed_secs, 3),
+            "runs_per_minute": round(progress["finished"] / elapsed_secs * 60, 2) if elapsed_secs > 0 else 0.0
+        }
+
+
+service = BatchProspectingService()
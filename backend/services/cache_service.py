@@ -0,0 +1,120 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from config import config
+from services.logger_service import logger_service
+
+
+cache_events: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("cache_events", default=None)
+
+
+class CacheService:
+    def __init__(self, db_path: str = config.CACHE_DB_PATH):
+        self.db_path = db_path
+        self.enabled = config.CACHE_ENABLED
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )"""
+            )
+            connection.commit()
+            self._local.connection = connection
+
+        return connection
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+
+        try:
+            row = self._connection().execute(
+                "SELECT value, created_at, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger_service.warning(f"Cache read failed for {namespace}:{key}: {e}")
+            return None
+
+        if not row:
+            return None
+
+        value, created_at, expires_at = row
+        if expires_at <= time.time():
+            self.delete(namespace, key)
+            return None
+
+        return {
+            "value": json.loads(value),
+            "created_at": created_at,
+            "expires_at": expires_at
+        }
+
+    def set(self, namespace: str, key: str, value: Any, ttl_secs: float) -> None:
+        if not self.enabled or ttl_secs <= 0:
+            return
+
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now, now + ttl_secs)
+            )
+            connection.commit()
+        except sqlite3.Error as e:
+            logger_service.warning(f"Cache write failed for {namespace}:{key}: {e}")
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            connection = self._connection()
+            connection.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+            connection.commit()
+        except sqlite3.Error as e:
+            logger_service.warning(f"Cache delete failed for {namespace}:{key}: {e}")
+
+    def purge_expired(self) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            connection = self._connection()
+            connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+            connection.commit()
+        except sqlite3.Error as e:
+            logger_service.warning(f"Cache purge failed: {e}")
+
+    def record_hit(self, namespace: str, data_type: str, key: str, entry: Dict[str, Any]) -> None:
+        age_secs = round(time.time() - entry["created_at"], 1)
+        logger_service.debug(f"Cache hit for {namespace}:{key} (age {age_secs}s)")
+
+        events = cache_events.get()
+        if events is not None:
+            events.append({
+                "namespace": namespace,
+                "data_type": data_type,
+                "key": key,
+                "age_secs": age_secs,
+                "negative": not entry["value"]
+            })
+
+
+service = CacheService()
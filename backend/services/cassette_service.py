@@ -0,0 +1,202 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from config import config
+from services.logger_service import logger_service
+
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(RuntimeError):
+    pass
+
+
+def _request_hash(request: Dict[str, Any]) -> str:
+    key = {name: request.get(name) for name in ("model", "messages", "tools", "response_format")}
+    return hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _channel(request: Dict[str, Any]) -> str:
+    # Routed calls are keyed by stage so a recording still replays after the stage moves to another model.
+    kind = "stream" if request.get("stream") else "complete"
+    return f"{request.get('stage') or request.get('model')}:{kind}:{'schema' if request.get('response_format') else 'text'}"
+
+
+def _tool_key(tool_name: str, tool_args: Dict[str, Any]) -> str:
+    return f"{tool_name}:{json.dumps(tool_args, sort_keys=True)}"
+
+
+def _discard(entries: List[Dict[str, Any]], entry: Dict[str, Any]) -> None:
+    # By identity: an identical hedged attempt may still be in flight with an equal entry.
+    for index, candidate in enumerate(entries):
+        if candidate is entry:
+            del entries[index]
+            return
+
+
+class Cassette:
+    def __init__(self, mode: str, data: Dict[str, Any], speed: float = 1.0):
+        self.mode = mode
+        self.data = data
+        self.speed = speed
+        self._llm_pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._tools_pending: Dict[str, List[Dict[str, Any]]] = {}
+
+        if mode == "replay":
+            # Calls cancelled mid-flight (losing hedged attempts, deadlines) left incomplete entries in older recordings.
+            for entry in data["llm"]:
+                if "latency_secs" in entry or "chunks" in entry:
+                    self._llm_pending.setdefault(entry["channel"], []).append(entry)
+            for entry in data["tools"]:
+                if "result" in entry or "error" in entry:
+                    self._tools_pending.setdefault(entry["key"], []).append(entry)
+
+    @classmethod
+    def record(cls, user_goal: str, linkedin_profile_url: str) -> "Cassette":
+        return cls("record", {
+            "version": CASSETTE_VERSION,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "user_goal": user_goal,
+            "linkedin_profile_url": linkedin_profile_url,
+            "llm": [],
+            "tools": []
+        })
+
+    @classmethod
+    def load(cls, path: str, speed: float = 1.0) -> "Cassette":
+        with gzip.open(path, "rt", encoding="utf-8") as cassette_file:
+            data = json.load(cassette_file)
+
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+
+        return cls("replay", data, speed)
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as cassette_file:
+            json.dump(self.data, cassette_file, separators=(",", ":"), default=str)
+
+    async def _wait(self, secs: float) -> None:
+        if self.speed and secs > 0:
+            await asyncio.sleep(secs * self.speed)
+
+    def _take_llm(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        pending = self._llm_pending.get(_channel(request)) or self._llm_pending.get(_channel({**request, "stage": None}))
+        if not pending:
+            raise CassetteMissError(f"No recorded response left for {_channel(request)}")
+
+        request_hash = _request_hash(request)
+        for index, entry in enumerate(pending):
+            if entry["request_hash"] == request_hash:
+                return pending.pop(index)
+
+        # Prompts may differ between builds; fall back to call order within the channel.
+        return pending.pop(0)
+
+    async def chat_completion(self, request: Dict[str, Any], send: Callable[[], Awaitable[Any]]) -> Any:
+        if self.mode == "replay":
+            entry = self._take_llm(request)
+            if entry.get("error"):
+                await self._wait(entry["latency_secs"])
+                raise RuntimeError(entry["error"])
+            if "chunks" in entry:
+                return self._replay_stream(entry["chunks"])
+
+            from openai.types.chat import ChatCompletion
+
+            await self._wait(entry["latency_secs"])
+            return ChatCompletion.model_validate(entry["response"])
+
+        entry = {"channel": _channel(request), "request_hash": _request_hash(request)}
+        self.data["llm"].append(entry)
+        started_at = time.perf_counter()
+        try:
+            response = await send()
+        except asyncio.CancelledError:
+            _discard(self.data["llm"], entry)
+            raise
+        except Exception as e:
+            entry.update(error=str(e), latency_secs=round(time.perf_counter() - started_at, 4))
+            raise
+
+        if request.get("stream"):
+            entry["chunks"] = []
+            return self._record_stream(response, entry["chunks"], started_at)
+
+        entry["latency_secs"] = round(time.perf_counter() - started_at, 4)
+        entry["response"] = response.model_dump(exclude_none=True)
+        return response
+
+    async def _record_stream(self, stream: AsyncIterator[Any], chunks: List[Dict[str, Any]], started_at: float):
+        last = started_at
+        async for chunk in stream:
+            now = time.perf_counter()
+            chunks.append({"delay_secs": round(now - last, 4), "chunk": chunk.model_dump(exclude_none=True)})
+            last = now
+            yield chunk
+
+    async def _replay_stream(self, chunks: List[Dict[str, Any]]):
+        from openai.types.chat import ChatCompletionChunk
+
+        for recorded in chunks:
+            await self._wait(recorded["delay_secs"])
+            yield ChatCompletionChunk.model_validate(recorded["chunk"])
+
+    async def tool_call(self, tool_name: str, tool_args: Dict[str, Any], run: Callable[[], Awaitable[Any]]) -> Any:
+        key = _tool_key(tool_name, tool_args)
+
+        if self.mode == "replay":
+            pending = self._tools_pending.get(key)
+            if not pending:
+                raise CassetteMissError(f"No recorded result for tool call {key}")
+
+            entry = pending.pop(0)
+            await self._wait(entry["duration_secs"])
+            if entry.get("error"):
+                raise RuntimeError(entry["error"])
+            return entry["result"]
+
+        entry: Dict[str, Any] = {"key": key, "tool_name": tool_name}
+        self.data["tools"].append(entry)
+        started_at = time.perf_counter()
+        try:
+            entry["result"] = await run()
+            return entry["result"]
+        except asyncio.CancelledError:
+            _discard(self.data["tools"], entry)
+            raise
+        except Exception as e:
+            entry["error"] = str(e)
+            raise
+        finally:
+            entry["duration_secs"] = round(time.perf_counter() - started_at, 4)
+
+
+active_cassette: ContextVar[Optional[Cassette]] = ContextVar("active_cassette", default=None)
+
+
+class CassetteService:
+    def __init__(self):
+        self.record_dir = config.CASSETTE_RECORD_DIR
+
+    def cassette_path(self, run_id: str) -> Optional[str]:
+        return os.path.join(self.record_dir, f"{run_id}.json.gz") if self.record_dir else None
+
+    def save(self, cassette: Cassette, path: str) -> None:
+        try:
+            cassette.save(path)
+            logger_service.info(f"Recorded cassette to {path}")
+        except Exception as e:
+            logger_service.error(f"Failed to save cassette to {path}: {e}")
+
+
+service = CassetteService()
@@ -0,0 +1,149 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from config import config
+from constants.prompts import COMPACTION_SYSTEM_PROMPT
+from services.logger_service import logger_service
+from services.openai_service import service as openai_service
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+MESSAGE_OVERHEAD_TOKENS = 4
+CHARS_PER_TOKEN = 4
+COMPACTED_MARKER = '{"compacted": true'
+
+
+class ContextCompactionService:
+    def __init__(self):
+        self.token_budget = config.CONTEXT_TOKEN_BUDGET
+        # Compacting down to a low-water mark instead of just under the budget means older messages are rewritten
+        # in occasional batches rather than every turn, so the cached prompt prefix survives longer.
+        self.compaction_target = int(self.token_budget * config.CONTEXT_COMPACTION_TARGET_RATIO)
+        self.keep_recent_tool_results = config.CONTEXT_KEEP_RECENT_TOOL_RESULTS
+        self.strategy = config.CONTEXT_COMPACTION_STRATEGY
+        self.digest_max_chars = config.CONTEXT_DIGEST_MAX_CHARS
+        self._encoding = None
+        self._encoding_loaded = False
+
+    def _get_encoding(self) -> Optional[Any]:
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            if tiktoken is not None:
+                try:
+                    self._encoding = tiktoken.get_encoding("o200k_base")
+                except Exception as e:
+                    logger_service.warning(f"Falling back to approximate token counts: {e}")
+
+        return self._encoding
+
+    def warm_up(self) -> None:
+        self._get_encoding()
+
+    def count_text_tokens(self, text: Optional[str]) -> int:
+        if not text:
+            return 0
+
+        encoding = self._get_encoding()
+        if encoding is None:
+            return len(text) // CHARS_PER_TOKEN + 1
+
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def count_message_tokens(self, message: Dict[str, Any]) -> int:
+        tokens = MESSAGE_OVERHEAD_TOKENS + self.count_text_tokens(message.get("content"))
+
+        for tool_call in message.get("tool_calls") or []:
+            tokens += self.count_text_tokens(tool_call["function"]["name"])
+            tokens += self.count_text_tokens(tool_call["function"]["arguments"])
+
+        return tokens
+
+    def count_tokens(self, messages: List[Dict[str, Any]]) -> int:
+        return sum(self.count_message_tokens(message) for message in messages)
+
+    def _digest_value(self, value: Any, depth: int = 0) -> Any:
+        if isinstance(value, str):
+            return value if len(value) <= 200 else value[:200] + "..."
+
+        if isinstance(value, list):
+            digest = [self._digest_value(item, depth + 1) for item in value[:2]] if depth < 3 else []
+            if len(value) > len(digest):
+                digest.append(f"... {len(value) - len(digest)} more items")
+            return digest
+
+        if isinstance(value, dict):
+            if depth >= 3:
+                return f"{{{len(value)} keys}}"
+            return {key: self._digest_value(item, depth + 1) for key, item in value.items()}
+
+        return value
+
+    def _truncate_digest(self, content: str) -> str:
+        try:
+            digest = json.dumps(self._digest_value(json.loads(content)))
+        except (json.JSONDecodeError, TypeError):
+            digest = content
+
+        if len(digest) > self.digest_max_chars:
+            digest = digest[:self.digest_max_chars] + "..."
+
+        return digest
+
+    async def _summarize_digest(self, content: str) -> str:
+        try:
+            return await openai_service.create_chat_completion_async(
+                messages=[
+                    {"role": "system", "content": COMPACTION_SYSTEM_PROMPT},
+                    {"role": "user", "content": content}
+                ],
+                temperature=0,
+                route=openai_service.route("compaction"),
+                max_tokens=self.digest_max_chars // CHARS_PER_TOKEN
+            )
+        except Exception as e:
+            logger_service.warning(f"Summarizing tool result failed, truncating instead: {e}")
+            return self._truncate_digest(content)
+
+    async def compact(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        token_counts = [self.count_message_tokens(message) for message in messages]
+        tokens_before = sum(token_counts)
+        total_tokens = tokens_before
+        compacted_messages = 0
+
+        if total_tokens > self.token_budget:
+            tool_indices = [index for index, message in enumerate(messages) if message["role"] == "tool"]
+            compactable = tool_indices[:-self.keep_recent_tool_results] if self.keep_recent_tool_results else tool_indices
+
+            for index in compactable:
+                if total_tokens <= self.compaction_target:
+                    break
+
+                message = messages[index]
+                if message["content"].startswith(COMPACTED_MARKER):
+                    continue
+
+                if self.strategy == "summarize":
+                    digest = await self._summarize_digest(message["content"])
+                else:
+                    digest = self._truncate_digest(message["content"])
+
+                message["content"] = json.dumps({"compacted": True, "digest": digest})
+
+                new_count = self.count_message_tokens(message)
+                total_tokens += new_count - token_counts[index]
+                token_counts[index] = new_count
+                compacted_messages += 1
+
+        return {
+            "tokens_before": tokens_before,
+            "tokens_after": total_tokens,
+            "compacted_messages": compacted_messages,
+            "token_budget": self.token_budget
+        }
+
+
+service = ContextCompactionService()
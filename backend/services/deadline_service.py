@@ -0,0 +1,77 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Optional
+
+from config import config
+
+
+class DeadlineExceededError(Exception):
+    pass
+
+
+class RunDeadline:
+    def __init__(self, deadline_at: float, reserve_secs: float):
+        # Wall-clock time, so the deadline survives a checkpoint and resume.
+        self.deadline_at = deadline_at
+        self.reserve_secs = reserve_secs
+
+    def remaining(self, keep_reserve: bool = True) -> float:
+        """Seconds left; research work keeps the reserve back for finishing and scoring."""
+        return self.deadline_at - time.time() - (self.reserve_secs if keep_reserve else 0)
+
+    def research_exhausted(self) -> bool:
+        return self.remaining() <= 0
+
+
+run_deadline: ContextVar[Optional[RunDeadline]] = ContextVar("run_deadline", default=None)
+
+
+class DeadlineService:
+    """Threads a run's end-to-end deadline into every provider call as a remaining-time budget."""
+
+    def __init__(self):
+        self.default_deadline_secs = config.RUN_DEADLINE_SECS
+        self.reserve_secs = config.RUN_DEADLINE_FINISH_RESERVE_SECS
+
+    def deadline_at(self, deadline_secs: Optional[float] = None) -> Optional[float]:
+        """None uses the configured default; zero or less runs without a deadline."""
+        deadline_secs = self.default_deadline_secs if deadline_secs is None else deadline_secs
+        return time.time() + deadline_secs if deadline_secs and deadline_secs > 0 else None
+
+    def start(self, deadline_at: Optional[float]) -> Optional[RunDeadline]:
+        deadline = RunDeadline(deadline_at, self.reserve_secs) if deadline_at else None
+        run_deadline.set(deadline)
+        return deadline
+
+    def end(self) -> None:
+        run_deadline.set(None)
+
+    def remaining(self, keep_reserve: bool = True) -> Optional[float]:
+        deadline = run_deadline.get()
+        return deadline.remaining(keep_reserve) if deadline is not None else None
+
+    def timeout(self, timeout_secs: Optional[float], keep_reserve: bool = True) -> Optional[float]:
+        """The smaller of a call's own timeout and what is left of the run's budget."""
+        remaining = self.remaining(keep_reserve)
+        if remaining is None:
+            return timeout_secs
+        if remaining <= 0:
+            raise DeadlineExceededError("Run deadline reached")
+
+        return remaining if timeout_secs is None else min(timeout_secs, remaining)
+
+    async def run_within(self, awaitable: Awaitable[Any], keep_reserve: bool = True) -> Any:
+        remaining = self.remaining(keep_reserve)
+        if remaining is None:
+            return await awaitable
+
+        try:
+            return await asyncio.wait_for(awaitable, timeout=max(remaining, 0))
+        except asyncio.TimeoutError as e:
+            if self.remaining(keep_reserve) <= 0:
+                raise DeadlineExceededError("Run deadline reached") from e
+            raise
+
+
+service = DeadlineService()
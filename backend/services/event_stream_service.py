@@ -0,0 +1,130 @@
+import asyncio
+import time
+import zlib
+from typing import Any, AsyncIterator, Dict, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+from config import config
+
+
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+
+
+class StreamEvent:
+    """One SSE event; the JSON payload is encoded once and reused for every subscriber."""
+
+    __slots__ = ("data", "id", "_payload")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, id: Optional[str] = None, payload: Optional[bytes] = None):
+        self.data = data
+        self.id = id
+        self._payload = payload
+
+    @property
+    def payload(self) -> bytes:
+        if self._payload is None:
+            self._payload = service.dumps(self.data)
+        return self._payload
+
+
+class EventStreamService:
+    def __init__(self):
+        self.heartbeat_secs = config.SSE_HEARTBEAT_SECS
+        self.compression_enabled = config.SSE_COMPRESSION_ENABLED
+        self.compression_level = config.SSE_COMPRESSION_LEVEL
+        self._stats = {"events": 0, "payload_bytes": 0, "encode_secs": 0.0, "heartbeats": 0}
+
+    def dumps(self, data: Any) -> bytes:
+        started_at = time.perf_counter()
+        payload = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        self._stats["events"] += 1
+        self._stats["payload_bytes"] += len(payload)
+        self._stats["encode_secs"] += time.perf_counter() - started_at
+        return payload
+
+    def encode(self, event: StreamEvent) -> bytes:
+        if event.id is None:
+            return b"data: " + event.payload + b"\n\n"
+        return b"id: " + event.id.encode() + b"\ndata: " + event.payload + b"\n\n"
+
+    async def _frames(self, events: AsyncIterator[StreamEvent]) -> AsyncIterator[bytes]:
+        seq = 0
+        async for event in events:
+            seq += 1
+            if event.id is None:
+                event = StreamEvent(event.data, str(seq), event._payload)
+            yield self.encode(event)
+
+    async def _with_heartbeats(self, frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        # A single pump task drives the source, so its context variables survive across events.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+        async def pump() -> None:
+            try:
+                async for frame in frames:
+                    await queue.put((frame, None))
+            except Exception as e:
+                await queue.put((None, e))
+                return
+            await queue.put((None, None))
+
+        pump_task = asyncio.create_task(pump())
+        try:
+            while True:
+                try:
+                    frame, error = await asyncio.wait_for(queue.get(), timeout=self.heartbeat_secs)
+                except asyncio.TimeoutError:
+                    self._stats["heartbeats"] += 1
+                    yield HEARTBEAT_FRAME
+                    continue
+
+                if error is not None:
+                    raise error
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            if not pump_task.done():
+                pump_task.cancel()
+
+    async def _gzip(self, frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(self.compression_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        async for frame in frames:
+            # Sync-flush every frame so the client sees each event as soon as it is produced.
+            yield compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+    def _accepts_gzip(self, accept_encoding: Optional[str]) -> bool:
+        for coding in (accept_encoding or "").lower().split(","):
+            name, _, params = coding.strip().partition(";")
+            if name.strip() == "gzip":
+                return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+        return False
+
+    def response(
+        self,
+        events: AsyncIterator[StreamEvent],
+        accept_encoding: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> StreamingResponse:
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **(headers or {})}
+        body = self._with_heartbeats(self._frames(events))
+
+        if self.compression_enabled and self._accepts_gzip(accept_encoding):
+            body = self._gzip(body)
+            headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+
+        return StreamingResponse(body, media_type="text/event-stream", headers=headers)
+
+    def get_stats(self) -> Dict[str, Any]:
+        events = self._stats["events"]
+        return {
+            **self._stats,
+            "encode_secs": round(self._stats["encode_secs"], 6),
+            "encode_us_per_event": round(self._stats["encode_secs"] / events * 1e6, 2) if events else None
+        }
+
+
+service = EventStreamService()
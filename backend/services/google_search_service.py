@@ -1,53 +1,178 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 
-import requests
+import httpx
 
 from config import config
+from services.cache_service import service as cache_service
+from services.deadline_service import service as deadline_service
+from services.logger_service import logger_service
+from services.resilience_service import CircuitOpenError, service as resilience_service
+from services.single_flight_service import SingleFlight
+from services.telemetry_service import service as telemetry_service
+
+
+CSE_PAGE_SIZE = 10
+CSE_MAX_RESULTS = 100
 
 
 class GoogleSearchService:
     def __init__(self):
         self.api_key = config.GOOGLE_SEARCH_API_KEY
         self.engine_id = config.GOOGLE_SEARCH_ENGINE_ID
-        self.base_url = "https://www.googleapis.com/customsearch/v1"
+        self.base_url = config.GOOGLE_SEARCH_BASE_URL
+        self.timeout = 10
+        self.cache_namespace = "google_search"
+        self.cache_ttl = config.GOOGLE_SEARCH_CACHE_TTL_SECS
+        self.cache_max_entries = config.GOOGLE_SEARCH_CACHE_MAX_ENTRIES
+        self.disk_cache_enabled = config.GOOGLE_SEARCH_DISK_CACHE
+        self._memory_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._single_flight = SingleFlight("google_search")
 
-    def search(
-        self,
-        query: str,
-        num_results: int = 10
-    ) -> Optional[Dict[str, Any]]:
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+
+        return self._client
+
+    async def warm_up(self) -> None:
+        # Opens a pooled connection to the search API; an unauthenticated request does not use quota.
+        try:
+            await self._get_client().head(self.base_url)
+        except httpx.HTTPError as e:
+            logger_service.debug(f"Google search warm-up request failed: {e}")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _normalize_query(self, query: str) -> str:
+        return " ".join(query.split()).lower()
+
+    def _cache_key(self, query: str, num: int, start: int) -> str:
+        return f"{self._normalize_query(query)}|num={num}|start={start}"
+
+    def _memory_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._memory_cache.get(key)
+        if entry is None:
+            return None
+
+        if entry["expires_at"] <= time.time():
+            del self._memory_cache[key]
+            return None
+
+        self._memory_cache.move_to_end(key)
+        return entry
+
+    def _memory_set(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory_cache[key] = entry
+        self._memory_cache.move_to_end(key)
+
+        while len(self._memory_cache) > self.cache_max_entries:
+            self._memory_cache.popitem(last=False)
+
+    async def _fetch_page(self, query: str, num: int, start: int) -> Dict[str, Any]:
+        cache_key = self._cache_key(query, num, start)
+
+        entry = self._memory_get(cache_key)
+        if entry is None and self.disk_cache_enabled:
+            entry = await asyncio.to_thread(cache_service.get, self.cache_namespace, cache_key)
+            if entry is not None:
+                self._memory_set(cache_key, entry)
+
+        if entry is not None:
+            cache_service.record_hit(self.cache_namespace, "search", cache_key, entry)
+            return entry["value"]
+
+        return await self._single_flight.do(
+            cache_key,
+            lambda: self._request_page(query, num, start, cache_key)
+        )
+
+    async def _get(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        with telemetry_service.provider_span("google_search", "cse.list") as span:
+            response = await self._get_client().get(
+                self.base_url, params=params, timeout=deadline_service.timeout(self.timeout)
+            )
+            span.set(status_code=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
+            return response.json()
+
+    async def _request_page(self, query: str, num: int, start: int, cache_key: str) -> Dict[str, Any]:
         params = {
             "key": self.api_key,
             "cx": self.engine_id,
             "q": query,
-            "num": min(num_results, 10)
+            "num": num,
+            "start": start
         }
 
-        try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()
+        data = await resilience_service.call("google_search", lambda: self._get(params), operation="cse.list")
 
-            data = response.json()
+        page = {
+            "totalResults": data.get("searchInformation", {}).get("totalResults"),
+            "items": data.get("items", [])
+        }
 
-            if "items" not in data:
-                return {"error": "No search results found", "query": query}
+        now = time.time()
+        self._memory_set(cache_key, {"value": page, "created_at": now, "expires_at": now + self.cache_ttl})
+        if self.disk_cache_enabled:
+            await asyncio.to_thread(cache_service.set, self.cache_namespace, cache_key, page, self.cache_ttl)
+
+        return page
+
+    def _plan_pages(self, num_results: int, start: int) -> List[Tuple[int, int]]:
+        end = min(start - 1 + max(num_results, 1), CSE_MAX_RESULTS)
+        pages = []
+
+        page_start = start
+        while page_start <= end:
+            pages.append((min(CSE_PAGE_SIZE, end - page_start + 1), page_start))
+            page_start += CSE_PAGE_SIZE
+
+        return pages
+
+    async def search(
+        self,
+        query: str,
+        num_results: int = 10,
+        start: int = 1
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            pages = await asyncio.gather(*[
+                self._fetch_page(query, num, page_start)
+                for num, page_start in self._plan_pages(num_results, start)
+            ])
 
             results = []
-            for item in data["items"]:
-                results.append({
-                    "title": item.get("title"),
-                    "link": item.get("link"),
-                    "snippet": item.get("snippet"),
-                    "displayLink": item.get("displayLink")
-                })
+            for page in pages:
+                for item in page["items"]:
+                    results.append({
+                        "title": item.get("title"),
+                        "link": item.get("link"),
+                        "snippet": item.get("snippet"),
+                        "displayLink": item.get("displayLink")
+                    })
+
+            if not results:
+                return {"error": "No search results found", "query": query}
 
             return {
                 "query": query,
-                "totalResults": data.get("searchInformation", {}).get("totalResults"),
+                "totalResults": pages[0]["totalResults"] if pages else None,
                 "results": results
             }
 
-        except requests.exceptions.RequestException as e:
+        except CircuitOpenError as e:
+            return {"error": str(e), "query": query}
+        except httpx.HTTPError as e:
             return {"error": f"Search request failed: {str(e)}", "query": query}
         except Exception as e:
             return {"error": f"Failed to process search results: {str(e)}", "query": query}
@@ -1,7 +1,17 @@
+import asyncio
 import re
 from typing import List, Optional, Dict, Any
+from urllib.parse import unquote
 
+from config import config
 from services.apify_service import service as apify_service
+from services.cache_service import service as cache_service
+from services.logger_service import logger_service
+from services.single_flight_service import SingleFlight
+
+
+PROFILE_SLUG_PATTERN = r'/(?:in|company)/([^/?]+?)(?:/|$|\?|#)'
+COMPANY_SLUG_PATTERN = r'/company/([^/?]+?)(?:/|$|\?|#)'
 
 
 class LinkedInService:
@@ -11,21 +21,85 @@ class LinkedInService:
         self.profile_reactions_actor_id = "apimaestro/linkedin-profile-reactions"
         self.company_posts_actor_id = "apimaestro/linkedin-company-posts"
         self.company_detail_actor_id = "apimaestro/linkedin-company-detail"
+        self.cache_namespace = "apify"
+        self.cache_ttls = config.LINKEDIN_CACHE_TTL_SECS
+        self.negative_cache_ttl = config.LINKEDIN_NEGATIVE_CACHE_TTL_SECS
+        self.actor_timeout_secs = config.APIFY_ACTOR_TIMEOUT_SECS
+        self._single_flight = SingleFlight("linkedin")
+
+    def _extract_slug(self, url: str, pattern: str) -> str:
+        slug_match = re.search(pattern, url)
+        return slug_match.group(1) if slug_match else url.split("/")[-1].rstrip('/')
+
+    def _canonical_slug(self, slug: str) -> str:
+        return unquote(slug).strip().lower()
+
+    def canonical_profile_slug(self, profile_url: str) -> str:
+        return self._canonical_slug(self._extract_slug(profile_url, PROFILE_SLUG_PATTERN))
+
+    def canonical_company_slug(self, company_url: str) -> str:
+        return self._canonical_slug(self._extract_slug(company_url, COMPANY_SLUG_PATTERN))
+
+    async def _run_cached(
+        self,
+        data_type: str,
+        actor_id: str,
+        slug: str,
+        run_input: Dict[str, Any],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        cache_key = f"{actor_id}:{self._canonical_slug(slug)}:{limit}"
+
+        entry = await asyncio.to_thread(cache_service.get, self.cache_namespace, cache_key)
+        if entry is not None:
+            cache_service.record_hit(self.cache_namespace, data_type, cache_key, entry)
+            return entry["value"]
+
+        return await self._single_flight.do(
+            cache_key,
+            lambda: self._fetch_and_cache(data_type, cache_key, actor_id, run_input, limit)
+        )
 
-    def get_profile_details(
+    async def _fetch_and_cache(
+        self,
+        data_type: str,
+        cache_key: str,
+        actor_id: str,
+        run_input: Dict[str, Any],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        try:
+            results = await apify_service.run_actor_and_get_results(
+                actor_id=actor_id,
+                run_input=run_input,
+                timeout_secs=self.actor_timeout_secs,
+                limit=limit
+            )
+        except TimeoutError as e:
+            logger_service.warning(f"{e}; caching negative result for {cache_key}")
+            await asyncio.to_thread(cache_service.set, self.cache_namespace, cache_key, [], self.negative_cache_ttl)
+            return []
+
+        ttl_secs = self.cache_ttls[data_type] if results else self.negative_cache_ttl
+        await asyncio.to_thread(cache_service.set, self.cache_namespace, cache_key, results, ttl_secs)
+
+        return results
+
+    async def get_profile_details(
         self,
         profile_url: str
     ) -> Optional[Dict[str, Any]]:
-        username_match = re.search(r'/(?:in|company)/([^/?]+?)(?:/|$|\?|#)', profile_url)
-        username = username_match.group(1) if username_match else profile_url.split("/")[-1].rstrip('/')
-        
+        username = self._extract_slug(profile_url, PROFILE_SLUG_PATTERN)
+
         run_input = {
             "profileUrl": profile_url,
             "username": username
         }
 
-        results = apify_service.run_actor_and_get_results(
+        results = await self._run_cached(
+            data_type="profile_details",
             actor_id=self.profile_detail_actor_id,
+            slug=username,
             run_input=run_input,
             limit=1
         )
@@ -35,13 +109,12 @@ class LinkedInService:
 
         return results[0]
 
-    def get_profile_posts(
+    async def get_profile_posts(
         self,
         profile_url: str,
         max_posts: int = 5
     ) -> Optional[List[Dict[str, Any]]]:
-        username_match = re.search(r'/(?:in|company)/([^/?]+?)(?:/|$|\?|#)', profile_url)
-        username = username_match.group(1) if username_match else profile_url.split("/")[-1].rstrip('/')
+        username = self._extract_slug(profile_url, PROFILE_SLUG_PATTERN)
 
         run_input = {
             "profileUrl": profile_url,
@@ -49,8 +122,10 @@ class LinkedInService:
             "limit": max_posts
         }
 
-        results = apify_service.run_actor_and_get_results(
+        results = await self._run_cached(
+            data_type="profile_posts",
             actor_id=self.profile_posts_actor_id,
+            slug=username,
             run_input=run_input,
             limit=max_posts
         )
@@ -60,13 +135,12 @@ class LinkedInService:
 
         return results
 
-    def get_profile_reactions(
+    async def get_profile_reactions(
         self,
         profile_url: str,
         max_reactions: int = 15
     ) -> Optional[List[Dict[str, Any]]]:
-        username_match = re.search(r'/(?:in|company)/([^/?]+?)(?:/|$|\?|#)', profile_url)
-        username = username_match.group(1) if username_match else profile_url.split("/")[-1].rstrip('/')
+        username = self._extract_slug(profile_url, PROFILE_SLUG_PATTERN)
 
         run_input = {
             "profileUrl": profile_url,
@@ -74,8 +148,10 @@ class LinkedInService:
             "limit": max_reactions
         }
 
-        results = apify_service.run_actor_and_get_results(
+        results = await self._run_cached(
+            data_type="profile_reactions",
             actor_id=self.profile_reactions_actor_id,
+            slug=username,
             run_input=run_input,
             limit=max_reactions
         )
@@ -85,13 +161,12 @@ class LinkedInService:
 
         return results
 
-    def get_company_posts(
+    async def get_company_posts(
         self,
         company_url: str,
         max_posts: int = 6
     ) -> Optional[List[Dict[str, Any]]]:
-        company_name_match = re.search(r'/company/([^/?]+?)(?:/|$|\?|#)', company_url)
-        company_name = company_name_match.group(1) if company_name_match else company_url.split("/")[-1].rstrip('/')
+        company_name = self._extract_slug(company_url, COMPANY_SLUG_PATTERN)
 
         run_input = {
             "companyUrl": company_url,
@@ -99,8 +174,10 @@ class LinkedInService:
             "limit": max_posts
         }
 
-        results = apify_service.run_actor_and_get_results(
+        results = await self._run_cached(
+            data_type="company_posts",
             actor_id=self.company_posts_actor_id,
+            slug=company_name,
             run_input=run_input,
             limit=max_posts
         )
@@ -110,20 +187,21 @@ class LinkedInService:
 
         return results
 
-    def get_company_details(
+    async def get_company_details(
         self,
         company_url: str
     ) -> Optional[Dict[str, Any]]:
-        company_name_match = re.search(r'/company/([^/?]+?)(?:/|$|\?|#)', company_url)
-        company_name = company_name_match.group(1) if company_name_match else company_url.split("/")[-1].rstrip('/')
+        company_name = self._extract_slug(company_url, COMPANY_SLUG_PATTERN)
 
         run_input = {
             "companyUrl": company_url,
             "companyName": company_name
         }
 
-        results = apify_service.run_actor_and_get_results(
+        results = await self._run_cached(
+            data_type="company_details",
             actor_id=self.company_detail_actor_id,
+            slug=company_name,
             run_input=run_input,
             limit=1
         )
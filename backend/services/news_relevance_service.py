@@ -0,0 +1,163 @@
+import json
+import re
+from typing import Any, Dict, List, Set
+from urllib.parse import urlparse
+
+from config import config
+from constants.response_formats import NEWS_VALIDATION_RESPONSE_FORMAT
+from services.logger_service import logger_service
+from services.openai_service import service as openai_service
+
+
+ACCEPT = "accept"
+REJECT = "reject"
+AMBIGUOUS = "ambiguous"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+DOMAIN_PATTERN = re.compile(r"\b((?:[a-z0-9-]+\.)+[a-z]{2,})\b")
+
+STOPWORDS = {
+    "a", "an", "and", "at", "by", "co", "company", "corp", "corporation", "for", "from", "in",
+    "inc", "llc", "ltd", "of", "on", "or", "the", "to", "with", "www", "com", "io", "ai"
+}
+
+# Names made of everyday words (and common first and last names) collide with unrelated pages far more often.
+COMMON_NAME_WORDS = {
+    "apple", "amazon", "target", "delta", "oracle", "square", "block", "shell", "mercury", "ramp",
+    "notion", "linear", "stripe", "plaid", "scale", "loom", "front", "ground", "bolt", "wave",
+    "signal", "spring", "summit", "pilot", "atlas", "nova", "apex",
+    "john", "james", "michael", "david", "chris", "mike", "mark", "paul", "sam", "alex", "smith",
+    "brown", "lee", "wang", "li", "zhang", "kim", "park", "nguyen", "patel", "singh", "johnson"
+}
+
+VALIDATION_PROMPT = """You are validating search results for {kind} news.
+
+Target {label}: {name}
+{label} Context: {context}
+
+Search Results:
+{results}
+
+Task: Filter out any results that are clearly about a DIFFERENT {kind} with the same name. Return only the result indices (0-indexed) that are relevant to the target {kind}.
+
+Return the relevant indices in relevant_indices, like: [0, 1, 4]
+If no results are relevant, return an empty list.
+If you're unsure about a result, include it (better to be inclusive)."""
+
+
+class NewsRelevanceService:
+    def __init__(self):
+        self.local_enabled = config.NEWS_LOCAL_VALIDATION
+        self.min_context_overlap = 2
+
+    def _tokens(self, text: str) -> List[str]:
+        return TOKEN_PATTERN.findall(text.lower())
+
+    def _context_terms(self, name: str, context: str) -> Set[str]:
+        name_tokens = set(self._tokens(name))
+        return {
+            token for token in self._tokens(context)
+            if token not in STOPWORDS and token not in name_tokens and len(token) > 2
+        }
+
+    def _context_domains(self, context: str) -> List[str]:
+        return [domain[4:] if domain.startswith("www.") else domain for domain in DOMAIN_PATTERN.findall(context.lower())]
+
+    def _is_ambiguous_name(self, name: str) -> bool:
+        tokens = [token for token in self._tokens(name) if token not in STOPWORDS]
+        return len(tokens) <= 1 or all(token in COMMON_NAME_WORDS for token in tokens)
+
+    def _matches_name(self, name: str, text_tokens: List[str]) -> bool:
+        name_tokens = [token for token in self._tokens(name) if token not in STOPWORDS] or self._tokens(name)
+        if not name_tokens:
+            return False
+
+        size = len(name_tokens)
+        return any(text_tokens[i:i + size] == name_tokens for i in range(len(text_tokens) - size + 1))
+
+    def _matches_domain(self, domains: List[str], result: Dict[str, Any]) -> bool:
+        if not domains:
+            return False
+
+        host = (urlparse(result.get("link") or "").hostname or result.get("displayLink") or "").lower()
+        text = f"{result.get('title') or ''} {result.get('snippet') or ''}".lower()
+
+        return any(host == domain or host.endswith(f".{domain}") or domain in text for domain in domains)
+
+    def classify(self, name: str, context: str, results: List[Dict[str, Any]]) -> List[str]:
+        context_terms = self._context_terms(name, context)
+        domains = self._context_domains(context)
+        ambiguous_name = self._is_ambiguous_name(name)
+        required_overlap = min(self.min_context_overlap, len(context_terms)) or 1
+
+        name_tokens = set(self._tokens(name)) - STOPWORDS
+        verdicts = []
+        for result in results:
+            text_tokens = self._tokens(f"{result.get('title') or ''} {result.get('snippet') or ''}")
+            overlap = len(context_terms & set(text_tokens))
+            name_match = self._matches_name(name, text_tokens)
+
+            if self._matches_domain(domains, result) and (name_match or overlap):
+                verdicts.append(ACCEPT)
+            elif not name_match:
+                partial_match = bool(name_tokens & set(text_tokens))
+                verdicts.append(AMBIGUOUS if overlap or partial_match else REJECT)
+            elif overlap >= required_overlap + (1 if ambiguous_name else 0):
+                verdicts.append(ACCEPT)
+            else:
+                verdicts.append(AMBIGUOUS)
+
+        return verdicts
+
+    async def _validate_with_llm(self, kind: str, name: str, context: str, results: List[Dict[str, Any]]) -> List[int]:
+        prompt = VALIDATION_PROMPT.format(
+            kind=kind,
+            label=kind.capitalize(),
+            name=name,
+            context=context,
+            results=results
+        )
+
+        response = await openai_service.create_chat_completion_async(
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0,
+            route=openai_service.route("validation"),
+            response_format=NEWS_VALIDATION_RESPONSE_FORMAT
+        )
+        indices = json.loads(response)["relevant_indices"]
+        return [i for i in indices if isinstance(i, int) and 0 <= i < len(results)]
+
+    async def filter_results(self, kind: str, name: str, context: str, results: Dict[str, Any]) -> Dict[str, Any]:
+        items = results.get("results", [])
+        verdicts = self.classify(name, context, items) if self.local_enabled else [AMBIGUOUS] * len(items)
+        ambiguous = [i for i, verdict in enumerate(verdicts) if verdict == AMBIGUOUS]
+
+        validation = {
+            "local_accepted": verdicts.count(ACCEPT),
+            "local_rejected": verdicts.count(REJECT),
+            "llm_checked": len(ambiguous),
+            "llm_accepted": 0,
+            "llm_call_avoided": not ambiguous
+        }
+
+        keep = {i for i, verdict in enumerate(verdicts) if verdict == ACCEPT}
+        if ambiguous:
+            try:
+                relevant = await self._validate_with_llm(kind, name, context, [items[i] for i in ambiguous])
+                validation["llm_accepted"] = len(relevant)
+                keep.update(ambiguous[i] for i in relevant)
+            except Exception as e:
+                results["validation_error"] = f"Could not validate results: {str(e)}"
+                keep.update(ambiguous)
+
+        logger_service.debug(f"News validation for {name}: {validation}")
+
+        results["results"] = [item for i, item in enumerate(items) if i in keep]
+        results["original_count"] = len(items)
+        results["filtered_count"] = len(results["results"])
+        results["validation"] = validation
+
+        return results
+
+
+service = NewsRelevanceService()
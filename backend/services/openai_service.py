@@ -1,35 +1,211 @@
-from typing import List, Dict, Any, Optional
-
-from openai import OpenAI, AsyncOpenAI
+import asyncio
+import hashlib
+import json
+import time
+from typing import List, Dict, Any, Optional, Tuple
 
 from config import config
+from constants.model_routes import MODEL_ROUTES
+from services.cassette_service import active_cassette
+from services.deadline_service import service as deadline_service
+from services.logger_service import logger_service
+from services.resilience_service import is_transient, service as resilience_service
+from services.telemetry_service import service as telemetry_service
+
+
+LATENCY_SMOOTHING = 0.3
+DOWNGRADE_MIN_SAMPLES = 3
+
+
+def cached_tokens(usage: Any) -> int:
+    return getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+
+
+def _is_transient(error: BaseException) -> bool:
+    from openai import APIConnectionError
+    return isinstance(error, APIConnectionError) or is_transient(error)
 
 
 class OpenAIService:
     def __init__(self):
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
-        self.async_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+        self._async_client = None
+        self.prompt_cache_key_enabled = config.PROMPT_CACHE_KEY_ENABLED
+        self._canonical_memo: Dict[int, Tuple[Any, Any, str]] = {}
+        self.routes = {
+            stage: {**policy, **config.MODEL_ROUTES_OVERRIDE.get(stage, {})} for stage, policy in MODEL_ROUTES.items()
+        }
+        self.downgrade_cooldown_secs = config.MODEL_DOWNGRADE_COOLDOWN_SECS
+        self._stage_latency: Dict[str, Tuple[float, int]] = {}
+        self._downgraded_until: Dict[str, float] = {}
 
-    def create_chat_completion(
-        self,
-        messages: List[Dict[str, str]],
-        model: str = "gpt-4o-mini",
-        temperature: float = 0.7,
-        stream: bool = False,
-        **kwargs
-    ) -> Any:
-        response = self.client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            stream=stream,
-            **kwargs
-        )
+    # The SDK takes about a second to import, so the client is built on first use (or during warm-up).
+    @property
+    def async_client(self) -> Any:
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL)
+        return self._async_client
 
-        if stream:
-            return response
+    async def warm_up(self) -> None:
+        client = await asyncio.to_thread(lambda: self.async_client)
+        try:
+            await client.models.list()
+        except Exception as e:
+            logger_service.debug(f"OpenAI warm-up request failed: {e}")
 
-        return response.choices[0].message.content
+    def _canonical(self, value: Any) -> Tuple[Any, str]:
+        # Tuples are treated as frozen, like the registry's precompiled tool list, and encoded only once.
+        memo = self._canonical_memo.get(id(value))
+        if memo is not None and memo[0] is value:
+            return memo[1], memo[2]
+
+        encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        canonical = json.loads(encoded)
+        if isinstance(value, tuple):
+            self._canonical_memo[id(value)] = (value, canonical, encoded)
+
+        return canonical, encoded
+
+    def _stable_layout(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Lays a request out so the parts shared across calls form a byte-identical prefix for provider caching.
+
+        Tools and response formats are serialized canonically and, with the leading system messages, hashed into a
+        prompt_cache_key so similar requests are routed to the same cache. Message order is left as the caller built it.
+        """
+        prefix_parts = [kwargs.get("model", "")]
+
+        for name in ("tools", "response_format"):
+            if kwargs.get(name) is not None:
+                kwargs[name], encoded = self._canonical(kwargs[name])
+                prefix_parts.append(encoded)
+
+        for message in kwargs.get("messages") or []:
+            if message.get("role") != "system":
+                break
+            prefix_parts.append(str(message.get("content")))
+
+        if self.prompt_cache_key_enabled and "prompt_cache_key" not in kwargs:
+            kwargs["prompt_cache_key"] = hashlib.sha1("\0".join(prefix_parts).encode()).hexdigest()[:16]
+
+        return kwargs
+
+    def route(self, stage: str) -> Dict[str, Any]:
+        """Model, reasoning effort and timeout for a call site, using its fallback while it is over its latency budget."""
+        policy = self.routes[stage]
+        downgraded = bool(policy.get("fallback")) and time.monotonic() < self._downgraded_until.get(stage, 0)
+        settings = {**policy, **policy["fallback"]} if downgraded else policy
+
+        return {
+            "stage": stage,
+            "tier": "fallback" if downgraded else "primary",
+            "model": settings["model"],
+            "reasoning_effort": settings.get("reasoning_effort"),
+            "timeout_secs": settings.get("timeout_secs")
+        }
+
+    def observe_route(self, route: Dict[str, Any], secs: float) -> None:
+        policy = self.routes[route["stage"]]
+        budget = policy.get("latency_budget_secs")
+        if route["tier"] != "primary" or not budget or not policy.get("fallback"):
+            return
+
+        stage = route["stage"]
+        previous, samples = self._stage_latency.get(stage, (secs, 0))
+        latency = LATENCY_SMOOTHING * secs + (1 - LATENCY_SMOOTHING) * previous
+        samples += 1
+
+        if samples >= DOWNGRADE_MIN_SAMPLES and latency > budget:
+            # The primary route gets a fresh set of samples once the cool-down is over.
+            self._stage_latency.pop(stage, None)
+            self._downgraded_until[stage] = time.monotonic() + self.downgrade_cooldown_secs
+            telemetry_service.record_downgrade(stage)
+            logger_service.warning(
+                f"LLM stage {stage} averaged {latency:.1f}s against a {budget}s budget, "
+                f"using its fallback route for {self.downgrade_cooldown_secs:.0f}s"
+            )
+        else:
+            self._stage_latency[stage] = (latency, samples)
+
+    def get_routing_state(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            stage: {
+                **self.route(stage),
+                "smoothed_secs": round(self._stage_latency[stage][0], 3) if stage in self._stage_latency else None,
+                "downgraded_for_secs": round(max(0.0, self._downgraded_until.get(stage, 0) - now), 1)
+            }
+            for stage in self.routes
+        }
+
+    def _apply_route(self, kwargs: Dict[str, Any], route: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if route is None:
+            return kwargs
+
+        kwargs["model"] = route["model"]
+        if route["reasoning_effort"]:
+            # Reasoning models reject sampling parameters.
+            kwargs["reasoning_effort"] = route["reasoning_effort"]
+            kwargs.pop("temperature", None)
+        else:
+            kwargs.pop("reasoning_effort", None)
+        if route["timeout_secs"]:
+            kwargs.setdefault("timeout", route["timeout_secs"])
+
+        return kwargs
+
+    def _apply_deadline(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        # LLM calls may use the reserve: finishing and scoring run in it, and tools are bounded separately.
+        timeout = deadline_service.timeout(kwargs.get("timeout"), keep_reserve=False)
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return kwargs
+
+    def _route_attributes(self, route: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"stage": route["stage"], "route": route["tier"]} if route else {}
+
+    async def _create_async(self, route: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        kwargs = self._stable_layout(self._apply_deadline(self._apply_route(kwargs, route)))
+        cassette = active_cassette.get()
+        if cassette is not None:
+            request = {**kwargs, "stage": route["stage"]} if route else kwargs
+            return await cassette.chat_completion(request, lambda: self._send_async(route, **kwargs))
+
+        return await self._send_async(route, **kwargs)
+
+    async def _send_async(self, route: Optional[Dict[str, Any]], **kwargs) -> Any:
+        operation = route["stage"] if route else kwargs.get("model", "")
+        # Streamed responses are timed by the caller, which sees the final usage chunk; once a stream has started
+        # it cannot be retried or hedged, so it only goes through the circuit breaker.
+        if kwargs.get("stream"):
+            return await resilience_service.call(
+                "openai",
+                lambda: self.async_client.chat.completions.create(**kwargs),
+                operation=operation,
+                idempotent=False,
+                transient=_is_transient
+            )
+
+        started_at = time.perf_counter()
+        cancelled = False
+        try:
+            return await resilience_service.call(
+                "openai", lambda: self._request(route, **kwargs), operation=operation, transient=_is_transient
+            )
+        except asyncio.CancelledError:
+            # Abandoned calls (disconnects, losing hedged attempts) say nothing about the route's latency.
+            cancelled = True
+            raise
+        finally:
+            if route is not None and not cancelled:
+                self.observe_route(route, time.perf_counter() - started_at)
+
+    async def _request(self, route: Optional[Dict[str, Any]], **kwargs) -> Any:
+        with telemetry_service.provider_span(
+            "openai", "chat.completions", model=kwargs.get("model"), **self._route_attributes(route)
+        ) as span:
+            response = await self.async_client.chat.completions.create(**kwargs)
+            span.record_usage(response.usage)
+            return response
 
     async def create_chat_completion_async(
         self,
@@ -37,9 +213,11 @@ class OpenAIService:
         model: str = "gpt-4o-mini",
         temperature: float = 0.7,
         stream: bool = False,
+        route: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> Any:
-        response = await self.async_client.chat.completions.create(
+        response = await self._create_async(
+            route,
             model=model,
             messages=messages,
             temperature=temperature,
@@ -58,14 +236,18 @@ class OpenAIService:
         tools: List[Dict[str, Any]],
         model: str = "gpt-4o",
         temperature: float = 0.7,
-        stream: bool = False
+        stream: bool = False,
+        route: Optional[Dict[str, Any]] = None,
+        **kwargs
     ) -> Any:
-        response = await self.async_client.chat.completions.create(
+        response = await self._create_async(
+            route,
             model=model,
             messages=messages,
             tools=tools,
             temperature=temperature,
-            stream=stream
+            stream=stream,
+            **kwargs
         )
 
         if stream:
@@ -73,10 +255,11 @@ class OpenAIService:
 
         return response
 
-    def analyze_with_reasoning(
+    async def analyze_with_reasoning_async(
         self,
         prompt: str,
-        context: str
+        context: str,
+        stage: str = "analysis"
     ) -> str:
         messages = [
             {
@@ -85,39 +268,44 @@ class OpenAIService:
             }
         ]
 
-        response = self.client.chat.completions.create(
-            model="o3-mini",
-            messages=messages,
-            reasoning_effort="medium"
+        response = await self._create_async(
+            self.route(stage),
+            messages=messages
         )
 
         return response.choices[0].message.content
 
-    def score_prospect(
+    def _build_scoring_messages(
         self,
         research_summary: str,
         user_goal: str,
         message_context: List[Dict[str, str]]
-    ) -> str:
+    ) -> List[Dict[str, str]]:
         from constants.prompts import SCORING_SYSTEM_PROMPT
 
-        messages = [
+        # The research transcript shares its opening with every other run; the per-run findings go last.
+        return [
             {"role": "system", "content": SCORING_SYSTEM_PROMPT},
+            *message_context,
             {
                 "role": "user",
                 "content": f"User's Product/Goal: {user_goal}\n\nResearch Findings:\n{research_summary}"
             }
         ]
 
-        messages.extend(message_context)
+    async def score_prospect_async(
+        self,
+        research_summary: str,
+        user_goal: str,
+        message_context: List[Dict[str, str]]
+    ) -> Any:
+        from constants.response_formats import SCORING_RESPONSE_FORMAT
 
-        response = self.client.chat.completions.create(
-            model="o3-mini",
-            messages=messages,
-            reasoning_effort="medium"
+        return await self._create_async(
+            self.route("scoring"),
+            messages=self._build_scoring_messages(research_summary, user_goal, message_context),
+            response_format=SCORING_RESPONSE_FORMAT
         )
 
-        return response.choices[0].message.content
-
 
 service = OpenAIService()
@@ -0,0 +1,116 @@
+import asyncio
+import inspect
+import json
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.linkedin_service import service as linkedin_service
+from services.logger_service import logger_service
+
+
+COMPANY_URL_PATTERN = re.compile(r"https?://(?:[a-z]{2,3}\.)?linkedin\.com/company/[^/?#\"\s]+")
+EXPERIENCE_KEYS = ("experience", "experiences", "positions", "current_company", "company")
+
+
+def find_current_company_url(profile: Dict[str, Any]) -> Optional[str]:
+    for key in EXPERIENCE_KEYS:
+        section = profile.get(key)
+        if section:
+            match = COMPANY_URL_PATTERN.search(json.dumps(section))
+            if match:
+                return match.group(0)
+
+    match = COMPANY_URL_PATTERN.search(json.dumps(profile))
+    return match.group(0) if match else None
+
+
+class RunPrefetcher:
+    def __init__(self, profile_url: str, tool_map: Dict[str, Callable[..., Any]]):
+        self.profile_url = profile_url
+        self._tool_map = tool_map
+        self._entries: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        self._company_task: Optional[asyncio.Task] = None
+        self.stats = {"started": 0, "hits": 0, "wasted": 0}
+
+    def _default_arg(self, tool_name: str, arg_name: str) -> Any:
+        return inspect.signature(self._tool_map[tool_name]).parameters[arg_name].default
+
+    def _key(self, tool_name: str, tool_args: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        if tool_name == "get_linkedin_profile_data":
+            return (tool_name, linkedin_service.canonical_profile_slug(tool_args["profile_url"]))
+
+        if tool_name == "get_linkedin_profile_posts":
+            max_posts = tool_args.get("max_posts", self._default_arg(tool_name, "max_posts"))
+            return (tool_name, linkedin_service.canonical_profile_slug(tool_args["profile_url"]), max_posts)
+
+        if tool_name == "get_linkedin_company_details":
+            return (tool_name, linkedin_service.canonical_company_slug(tool_args["company_url"]))
+
+        return None
+
+    def _register(self, tool_name: str, tool_args: Dict[str, Any]) -> Optional[asyncio.Task]:
+        key = self._key(tool_name, tool_args)
+        if key in self._entries:
+            return None
+
+        task = asyncio.create_task(self._tool_map[tool_name](**tool_args))
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._entries[key] = {"task": task, "consumed": False}
+        self.stats["started"] += 1
+
+        return task
+
+    def start(self) -> None:
+        profile_task = self._register("get_linkedin_profile_data", {"profile_url": self.profile_url})
+        self._register("get_linkedin_profile_posts", {
+            "profile_url": self.profile_url,
+            "max_posts": self._default_arg("get_linkedin_profile_posts", "max_posts")
+        })
+
+        if profile_task is not None:
+            self._company_task = asyncio.create_task(self._prefetch_company(profile_task))
+
+    async def _prefetch_company(self, profile_task: asyncio.Task) -> None:
+        try:
+            profile = await asyncio.shield(profile_task)
+        except Exception:
+            return
+
+        if not isinstance(profile, dict) or "error" in profile:
+            return
+
+        company_url = find_current_company_url(profile)
+        if company_url:
+            logger_service.debug(f"Prefetching company details for {company_url}")
+            self._register("get_linkedin_company_details", {"company_url": company_url})
+
+    async def take(self, tool_name: str, tool_args: Dict[str, Any]) -> Tuple[bool, Any]:
+        try:
+            key = self._key(tool_name, tool_args)
+        except KeyError:
+            return False, None
+
+        entry = self._entries.get(key) if key else None
+        if entry is None or entry["consumed"]:
+            return False, None
+
+        entry["consumed"] = True
+        try:
+            result = await asyncio.shield(entry["task"])
+        except Exception as e:
+            logger_service.warning(f"Prefetched {tool_name} failed, running it again: {e}")
+            return False, None
+
+        self.stats["hits"] += 1
+        return True, result
+
+    def finish(self) -> Dict[str, int]:
+        if self._company_task is not None and not self._company_task.done():
+            self._company_task.cancel()
+
+        for entry in self._entries.values():
+            if not entry["task"].done():
+                entry["task"].cancel()
+
+        self.stats["wasted"] = sum(1 for entry in self._entries.values() if not entry["consumed"])
+        return dict(self.stats)
@@ -0,0 +1,360 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+import httpx
+
+from config import config
+from constants.resilience_policies import DEFAULT_RESILIENCE_POLICY, RESILIENCE_POLICIES
+from services.deadline_service import DeadlineExceededError, service as deadline_service
+from services.logger_service import logger_service
+from services.telemetry_service import service as telemetry_service
+
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = (408, 425, 429)
+MAX_KEYED_BREAKERS = 256
+QUANTILES = (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    status_code = getattr(error, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_transient(error: BaseException) -> bool:
+    """Network failures, timeouts, throttling and 5xx responses; anything else is not worth retrying."""
+    status_code = _status_code(error)
+    if status_code is not None:
+        return status_code >= 500 or status_code in RETRYABLE_STATUS_CODES
+
+    return isinstance(error, httpx.TransportError)
+
+
+def is_client_error(error: BaseException) -> bool:
+    """A 4xx answer: the provider is healthy and rejected the request itself."""
+    status_code = _status_code(error)
+    return status_code is not None and 400 <= status_code < 500 and status_code not in RETRYABLE_STATUS_CODES
+
+
+class LatencyWindow:
+    def __init__(self, size: int):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, secs: float) -> None:
+        self._samples.append(secs)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        return {
+            name: round(value, 4) if value is not None else None
+            for name, value in ((name, self.quantile(q)) for name, q in QUANTILES)
+        }
+
+
+class CircuitBreaker:
+    """Opens after consecutive provider failures, then lets a single probe through once the reset period is over."""
+
+    def __init__(self, failure_threshold: int, reset_secs: float):
+        self.failure_threshold = failure_threshold
+        self.reset_secs = reset_secs
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_secs:
+                return False
+            self.state = "half_open"
+
+        if self.state == "half_open":
+            if self._probing:
+                return False
+            self._probing = True
+
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> bool:
+        """Returns True when this failure opened the breaker."""
+        self._probing = False
+        self.failures += 1
+        if self.state == "open" or (self.state == "closed" and self.failures < self.failure_threshold):
+            return False
+
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        return True
+
+    def release(self) -> None:
+        # Cancelled and deadline-cut attempts say nothing about the provider's health.
+        self._probing = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "open_for_secs": round(max(0.0, self.opened_at + self.reset_secs - time.monotonic()), 1)
+            if self.state == "open" else 0.0
+        }
+
+
+class ProviderState:
+    def __init__(self, policy: Dict[str, Any]):
+        self.policy = policy
+        self.counters = {
+            "calls": 0,
+            "failures": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "short_circuits": 0,
+            "breaker_opens": 0
+        }
+        self.breakers: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
+        self.attempt_secs: Dict[str, LatencyWindow] = {}
+        self.call_secs: Dict[str, LatencyWindow] = {}
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers[key] = CircuitBreaker(self.policy["failure_threshold"], self.policy["reset_secs"])
+            # Keyed breakers (one per web host or actor) are bounded; the longest-idle closed ones go first.
+            while len(self.breakers) > MAX_KEYED_BREAKERS:
+                idle = next((name for name, item in self.breakers.items() if item.state == "closed"), None)
+                if idle is None:
+                    break
+                del self.breakers[idle]
+        self.breakers.move_to_end(key)
+        return breaker
+
+    def windows(self, operation: str) -> List[LatencyWindow]:
+        size = self.policy["latency_window"]
+        return [
+            self.attempt_secs.setdefault(operation, LatencyWindow(size)),
+            self.call_secs.setdefault(operation, LatencyWindow(size))
+        ]
+
+    def open_circuits(self) -> int:
+        return sum(breaker.state != "closed" for breaker in self.breakers.values())
+
+
+class ResilienceService:
+    """Jittered retries, p95-delayed hedged attempts and circuit breakers shared by the external provider clients."""
+
+    def __init__(self):
+        self.enabled = config.RESILIENCE_ENABLED
+        self.providers = {
+            provider: ProviderState({
+                **DEFAULT_RESILIENCE_POLICY,
+                **policy,
+                **config.RESILIENCE_POLICIES_OVERRIDE.get(provider, {})
+            })
+            for provider, policy in RESILIENCE_POLICIES.items()
+        }
+
+    def _event(self, provider: str, counter: str, event: str) -> None:
+        self.providers[provider].counters[counter] += 1
+        telemetry_service.record_resilience_event(provider, event)
+
+    def hedge_delay(self, provider: str, operation: str) -> Optional[float]:
+        state = self.providers[provider]
+        window = state.attempt_secs.get(operation)
+        if not state.policy["hedge"] or window is None or len(window) < state.policy["hedge_min_samples"]:
+            return None
+
+        return max(state.policy["hedge_min_delay_secs"], window.quantile(state.policy["hedge_quantile"]))
+
+    def _backoff(self, policy: Dict[str, Any], attempt: int) -> float:
+        # Full jitter keeps callers that failed together from retrying together.
+        return random.uniform(0, min(policy["backoff_max_secs"], policy["backoff_base_secs"] * 2 ** (attempt - 1)))
+
+    async def call(
+        self,
+        provider: str,
+        func: Callable[[], Awaitable[T]],
+        operation: str = "default",
+        breaker_key: Optional[str] = None,
+        idempotent: bool = True,
+        transient: Callable[[BaseException], bool] = is_transient,
+        client_error: Callable[[BaseException], bool] = is_client_error
+    ) -> T:
+        """Runs func under the provider's policy; only idempotent calls are retried or hedged, and client errors
+        (the request's own fault) do not count against the circuit breaker."""
+        if not self.enabled:
+            return await func()
+
+        state = self.providers[provider]
+        policy = state.policy
+        breaker = state.breaker(breaker_key or provider)
+        attempt_window, call_window = state.windows(operation)
+        max_attempts = policy["max_attempts"] if idempotent else 1
+        started_at = time.perf_counter()
+        state.counters["calls"] += 1
+
+        for attempt in range(1, max_attempts + 1):
+            if not breaker.allow():
+                self._event(provider, "short_circuits", "short_circuit")
+                target = f"{provider} ({breaker_key})" if breaker_key else provider
+                raise CircuitOpenError(f"{target} is unavailable, failing fast while its circuit breaker is open")
+
+            try:
+                if idempotent and breaker.state == "closed":
+                    result = await self._hedged(
+                        provider, operation, func, breaker, attempt_window, transient, client_error
+                    )
+                else:
+                    result = await self._attempt(provider, func, breaker, attempt_window, transient, client_error)
+            except Exception as e:
+                delay = self._backoff(policy, attempt)
+                remaining = deadline_service.remaining()
+                if (
+                    attempt == max_attempts
+                    or not transient(e)
+                    or (remaining is not None and remaining <= delay)
+                ):
+                    state.counters["failures"] += 1
+                    raise
+
+                self._event(provider, "retries", "retry")
+                logger_service.info(f"Retrying {provider} {operation} in {delay:.2f}s after {type(e).__name__}: {e}")
+                await asyncio.sleep(delay)
+                continue
+
+            call_window.add(time.perf_counter() - started_at)
+            return result
+
+    async def _attempt(
+        self,
+        provider: str,
+        func: Callable[[], Awaitable[T]],
+        breaker: CircuitBreaker,
+        window: LatencyWindow,
+        transient: Callable[[BaseException], bool],
+        client_error: Callable[[BaseException], bool]
+    ) -> T:
+        started_at = time.perf_counter()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            # Losing hedged attempts count at the time they were cut off, a lower bound that keeps the
+            # latency quantile from drifting down as the slowest attempts stop finishing.
+            window.add(time.perf_counter() - started_at)
+            breaker.release()
+            raise
+        except DeadlineExceededError:
+            breaker.release()
+            raise
+        except Exception as e:
+            # A client error means the provider answered and the request itself was at fault; any other failure
+            # counts against the provider, including ones not worth retrying such as an actor that keeps timing out.
+            if client_error(e) and not transient(e):
+                breaker.record_success()
+            elif breaker.record_failure():
+                self._event(provider, "breaker_opens", "breaker_open")
+                logger_service.warning(f"Circuit breaker for {provider} opened after {breaker.failures} failures: {e}")
+            telemetry_service.set_open_circuits(provider, self.providers[provider].open_circuits())
+            raise
+
+        window.add(time.perf_counter() - started_at)
+        if breaker.failures or breaker.state != "closed":
+            breaker.record_success()
+            telemetry_service.set_open_circuits(provider, self.providers[provider].open_circuits())
+        return result
+
+    async def _hedged(
+        self,
+        provider: str,
+        operation: str,
+        func: Callable[[], Awaitable[T]],
+        breaker: CircuitBreaker,
+        window: LatencyWindow,
+        transient: Callable[[BaseException], bool],
+        client_error: Callable[[BaseException], bool]
+    ) -> T:
+        delay = self.hedge_delay(provider, operation)
+        if delay is None:
+            return await self._attempt(provider, func, breaker, window, transient, client_error)
+
+        primary = asyncio.ensure_future(self._attempt(provider, func, breaker, window, transient, client_error))
+        attempts = [primary]
+        try:
+            done, pending = await asyncio.wait(attempts, timeout=delay)
+            if not done and breaker.state == "closed":
+                self._event(provider, "hedges", "hedge")
+                attempts.append(
+                    asyncio.ensure_future(self._attempt(provider, func, breaker, window, transient, client_error))
+                )
+                pending = set(attempts)
+
+            error: Optional[BaseException] = None
+            while True:
+                for task in attempts:
+                    if task in done and task.exception() is None:
+                        if task is not primary:
+                            self._event(provider, "hedge_wins", "hedge_win")
+                        return task.result()
+                    if task in done:
+                        error = error or task.exception()
+
+                if not pending:
+                    raise error
+                finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                done = done | finished
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+    def get_state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = {"enabled": self.enabled}
+
+        for provider, provider_state in self.providers.items():
+            state[provider] = {
+                **provider_state.counters,
+                "breakers": {
+                    key: breaker.to_dict()
+                    for key, breaker in provider_state.breakers.items()
+                    if key == provider or breaker.state != "closed" or breaker.failures
+                },
+                "operations": {
+                    operation: {
+                        "samples": len(window),
+                        "attempt_secs": window.summary(),
+                        "call_secs": provider_state.call_secs[operation].summary(),
+                        "hedge_delay_secs": round(delay, 4) if (delay := self.hedge_delay(provider, operation)) else None
+                    }
+                    for operation, window in provider_state.attempt_secs.items()
+                }
+            }
+
+        return state
+
+
+service = ResilienceService()
@@ -0,0 +1,298 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+import orjson
+
+from config import config
+from services.artifact_service import service as artifact_service
+from services.event_stream_service import StreamEvent, service as event_stream_service
+from services.logger_service import logger_service
+from services.run_store_service import RunStoreError, service as run_store_service
+from services.tool_calling_service import service as tool_calling_service
+
+RESUMABLE_STATUSES = ("running", "suspended")
+TAIL_POLL_SECS = 0.5
+
+
+class LiveRun:
+    def __init__(self, run_id: str, last_seq: int):
+        self.run_id = run_id
+        self.seq = last_seq
+        self.log: List[Tuple[int, StreamEvent]] = []
+        self.unflushed: List[Tuple[int, str]] = []
+        self.pending_artifacts: Dict[str, str] = {}
+        self.wake = asyncio.Event()
+        self.subscribers = 0
+        self.detached_since: Optional[float] = time.monotonic()
+        self.done = False
+        self.task: Optional[asyncio.Task] = None
+        self.lease_lost = False
+
+
+class RunManagerService:
+    """Runs agents in the background, checkpointing each step so clients can reconnect or resume."""
+
+    def __init__(self):
+        self.detached_grace_secs = config.RUN_DETACHED_GRACE_SECS
+        self.lease_secs = config.RUN_LEASE_SECS
+        # Runs are leased to one worker; other workers and replicas sharing the store only tail their events.
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._live: Dict[str, LiveRun] = {}
+
+    async def start(
+        self,
+        user_goal: str,
+        linkedin_profile_url: str,
+        dry_run: bool = False,
+        deadline_secs: Optional[float] = None
+    ) -> str:
+        run_id = uuid.uuid4().hex[:12]
+        await asyncio.to_thread(
+            run_store_service.create_run, run_id, user_goal, linkedin_profile_url, dry_run, self.worker_id
+        )
+        self._launch(run_id, user_goal, linkedin_profile_url, dry_run, deadline_secs=deadline_secs)
+        return run_id
+
+    async def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(run_store_service.get_run, run_id)
+
+    def _launch(
+        self,
+        run_id: str,
+        user_goal: str,
+        linkedin_profile_url: str,
+        dry_run: bool,
+        checkpoint: Optional[Dict[str, Any]] = None,
+        last_seq: int = 0,
+        deadline_secs: Optional[float] = None
+    ) -> LiveRun:
+        live = LiveRun(run_id, last_seq)
+        self._live[run_id] = live
+        live.task = asyncio.create_task(
+            self._drive(live, user_goal, linkedin_profile_url, dry_run, checkpoint, deadline_secs)
+        )
+        return live
+
+    def _publish(self, live: LiveRun, event: Dict[str, Any]) -> None:
+        live.seq += 1
+        payload = event_stream_service.dumps(event)
+        live.log.append((live.seq, StreamEvent(event, f"{live.run_id}:{live.seq}", payload)))
+        live.unflushed.append((live.seq, payload.decode()))
+        live.wake.set()
+        live.wake = asyncio.Event()
+
+    async def _flush(self, live: LiveRun, checkpoint: Optional[str] = None, status: Optional[str] = None) -> bool:
+        events, live.unflushed = live.unflushed, []
+        artifacts = list(live.pending_artifacts.items())
+        try:
+            saved = await asyncio.to_thread(
+                run_store_service.save_progress, live.run_id, self.worker_id, events, checkpoint, status, artifacts
+            )
+        except RunStoreError:
+            # Nothing was written; the next flush retries these events and artifacts along with the newer ones.
+            live.unflushed = events + live.unflushed
+            return True
+
+        for artifact_id, _ in artifacts:
+            live.pending_artifacts.pop(artifact_id, None)
+
+        if not saved:
+            self._lose_lease(live)
+        return saved
+
+    def _lose_lease(self, live: LiveRun) -> None:
+        logger_service.warning(f"Run {live.run_id} lost its lease, stopping it here")
+        live.lease_lost = True
+
+    async def _heartbeat(self, live: LiveRun) -> None:
+        # Checkpoints can be minutes apart, so the lease is also renewed on a timer.
+        renewed_at = time.monotonic()
+        while True:
+            await asyncio.sleep(self.lease_secs / 3)
+            try:
+                held = await asyncio.to_thread(run_store_service.renew_lease, live.run_id, self.worker_id)
+                renewed_at = time.monotonic()
+            except RunStoreError:
+                # Once a full lease period has passed without a renewal, another worker may have claimed the run.
+                held = time.monotonic() - renewed_at < self.lease_secs
+
+            if not held:
+                self._lose_lease(live)
+                live.task.cancel()
+                return
+
+    def _abandoned(self, live: LiveRun) -> bool:
+        return (
+            live.subscribers == 0
+            and live.detached_since is not None
+            and time.monotonic() - live.detached_since > self.detached_grace_secs
+        )
+
+    async def _drive(
+        self,
+        live: LiveRun,
+        user_goal: str,
+        linkedin_profile_url: str,
+        dry_run: bool,
+        checkpoint: Optional[Dict[str, Any]],
+        deadline_secs: Optional[float] = None
+    ) -> None:
+        status = "finished"
+        # A resumed run keeps the deadline stored in its checkpoint.
+        events = tool_calling_service.execute_events(
+            user_goal, linkedin_profile_url, dry_run, checkpoint=checkpoint, emit_checkpoints=True,
+            deadline_secs=deadline_secs
+        )
+
+        heartbeat = asyncio.create_task(self._heartbeat(live))
+
+        try:
+            async with aclosing(events):
+                async for event in events:
+                    if event["type"] == "checkpoint":
+                        # Serialize now: the state keeps mutating once the generator resumes.
+                        if not await self._flush(live, orjson.dumps(event["state"], default=str).decode(), "running"):
+                            break
+                        if self._abandoned(live):
+                            logger_service.info(f"Suspending run {live.run_id}: no client for {self.detached_grace_secs}s")
+                            status = "suspended"
+                            break
+                        continue
+
+                    if event["type"] in ("started", "resumed"):
+                        event = {**event, 'run_id': live.run_id}
+                    elif event["type"] == "tool_completed":
+                        event, artifact = artifact_service.slim_tool_event(event)
+                        if artifact is not None:
+                            live.pending_artifacts[artifact[0]] = artifact[1].decode()
+                    elif event["type"] == "final_result":
+                        status = "completed"
+                    elif event["type"] == "error":
+                        status = "failed"
+                    self._publish(live, event)
+
+        except asyncio.CancelledError:
+            status = "suspended"
+            raise
+
+        except Exception as e:
+            logger_service.error(f"Run {live.run_id} crashed: {e}")
+            self._publish(live, {'type': 'error', 'message': str(e)})
+            status = "failed"
+
+        finally:
+            heartbeat.cancel()
+            live.done = True
+            live.wake.set()
+            try:
+                # A run taken over by another worker leaves the store to its new owner.
+                if not live.lease_lost:
+                    await asyncio.shield(self._flush(live, status=status))
+            finally:
+                self._live.pop(live.run_id, None)
+
+    async def _resume(self, run: Dict[str, Any]) -> Optional[LiveRun]:
+        if run["status"] not in RESUMABLE_STATUSES or run["dry_run"] or run["checkpoint"] is None:
+            return None
+
+        run_id = run["run_id"]
+        if not await asyncio.to_thread(run_store_service.claim_run, run_id, self.worker_id, self.lease_secs):
+            return None
+        if run_id in self._live:
+            return self._live[run_id]
+
+        # The previous owner may have checkpointed between the read and the claim.
+        run = await self.get_run(run_id)
+        logger_service.info(f"Resuming run {run_id} from iteration {run['checkpoint']['iteration'] + 1}")
+        return self._launch(
+            run_id, run["user_goal"], run["profile_url"], run["dry_run"],
+            checkpoint=run["checkpoint"], last_seq=run["last_seq"]
+        )
+
+    def _leased(self, run: Dict[str, Any]) -> bool:
+        return (
+            run["status"] in RESUMABLE_STATUSES
+            and run["owner"] is not None
+            and time.time() - run["updated_at"] < self.lease_secs
+        )
+
+    async def stream(self, run_id: str, last_seq: int = 0) -> AsyncGenerator[StreamEvent, None]:
+        live = self._live.get(run_id)
+
+        while live is None:
+            run = await self.get_run(run_id)
+            if run is None:
+                return
+            live = await self._resume(run)
+            if live is not None:
+                # Events past the checkpoint died with the previous worker and are produced again.
+                last_seq = min(last_seq, run["last_seq"])
+                break
+
+            for seq, payload in await asyncio.to_thread(run_store_service.get_events, run_id, last_seq):
+                yield StreamEvent(id=f"{run_id}:{seq}", payload=payload.encode())
+                last_seq = seq
+
+            if not self._leased(run):
+                return
+            # Another worker owns the run: follow its checkpointed events until it ends or its lease lapses.
+            await asyncio.sleep(TAIL_POLL_SECS)
+
+        for seq, payload in await asyncio.to_thread(run_store_service.get_events, run_id, last_seq):
+            yield StreamEvent(id=f"{run_id}:{seq}", payload=payload.encode())
+            last_seq = seq
+
+        live.subscribers += 1
+        live.detached_since = None
+        position = 0
+        try:
+            while True:
+                wake = live.wake
+                for seq, event in live.log[position:]:
+                    position += 1
+                    if seq > last_seq:
+                        yield event
+                        last_seq = seq
+                if live.done:
+                    break
+                await wake.wait()
+        finally:
+            live.subscribers -= 1
+            if live.subscribers == 0:
+                live.detached_since = time.monotonic()
+
+    async def stream_stored(self, stored: Dict[str, Any]) -> AsyncGenerator[StreamEvent, None]:
+        for event in (
+            {'type': 'started', 'message': 'Serving stored assessment', 'served_from_store': True},
+            {
+                'type': 'final_result',
+                'assessment': stored["assessment"],
+                'evidence': stored["evidence"],
+                'served_from_store': True,
+                'stored_at': stored["created_at"],
+                'age_secs': round(stored["age_secs"], 1)
+            }
+        ):
+            yield StreamEvent(event)
+
+    async def get_artifact(self, run_id: str, artifact_id: str) -> Optional[str]:
+        live = self._live.get(run_id)
+        if live is not None and artifact_id in live.pending_artifacts:
+            return live.pending_artifacts[artifact_id]
+
+        return await asyncio.to_thread(run_store_service.get_artifact, run_id, artifact_id)
+
+    def parse_event_id(self, event_id: Optional[str]) -> Tuple[Optional[str], int]:
+        run_id, _, seq = (event_id or "").partition(":")
+        try:
+            return run_id or None, int(seq or 0)
+        except ValueError:
+            return run_id or None, 0
+
+
+service = RunManagerService()
@@ -0,0 +1,222 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+from services.logger_service import logger_service
+
+
+class RunStoreError(Exception):
+    pass
+
+
+class RunStoreService:
+    def __init__(self, db_path: str = config.RUN_STORE_DB_PATH):
+        self.db_path = db_path
+        self.retention_secs = config.RUN_RETENTION_SECS
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS agent_runs (
+                    run_id TEXT PRIMARY KEY,
+                    user_goal TEXT NOT NULL,
+                    profile_url TEXT NOT NULL,
+                    dry_run INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    checkpoint TEXT,
+                    last_seq INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            try:
+                # Stores created before runs carried a worker lease.
+                connection.execute("ALTER TABLE agent_runs ADD COLUMN owner TEXT")
+            except sqlite3.OperationalError:
+                pass
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS agent_run_events (
+                    run_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    event TEXT NOT NULL,
+                    PRIMARY KEY (run_id, seq)
+                )"""
+            )
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS agent_run_artifacts (
+                    run_id TEXT NOT NULL,
+                    artifact_id TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL,
+                    PRIMARY KEY (run_id, artifact_id)
+                )"""
+            )
+            try:
+                connection.execute("ALTER TABLE agent_run_artifacts ADD COLUMN created_at REAL")
+            except sqlite3.OperationalError:
+                pass
+            connection.commit()
+            self._local.connection = connection
+
+        return connection
+
+    def create_run(self, run_id: str, user_goal: str, profile_url: str, dry_run: bool, owner: str) -> None:
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT INTO agent_runs (run_id, user_goal, profile_url, dry_run, status, owner, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, 'running', ?, ?, ?)",
+            (run_id, user_goal, profile_url, int(dry_run), owner, now, now)
+        )
+        connection.commit()
+
+    def claim_run(self, run_id: str, owner: str, lease_secs: float) -> bool:
+        """Takes over a resumable run whose lease is free or has not been renewed within lease_secs."""
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "UPDATE agent_runs SET owner = ?, updated_at = ? WHERE run_id = ? "
+                "AND status IN ('running', 'suspended') AND (owner IS NULL OR owner = ? OR updated_at < ?)",
+                (owner, now, run_id, owner, now - lease_secs)
+            )
+
+        return cursor.rowcount == 1
+
+    def renew_lease(self, run_id: str, owner: str) -> bool:
+        try:
+            connection = self._connection()
+            with connection:
+                cursor = connection.execute(
+                    "UPDATE agent_runs SET updated_at = ? WHERE run_id = ? AND owner = ?",
+                    (time.time(), run_id, owner)
+                )
+            return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            logger_service.warning(f"Failed to renew lease on run {run_id}: {e}")
+            raise RunStoreError(str(e)) from e
+
+    def save_progress(
+        self,
+        run_id: str,
+        owner: str,
+        events: List[Tuple[int, str]],
+        checkpoint: Optional[str] = None,
+        status: Optional[str] = None,
+        artifacts: Optional[List[Tuple[str, str]]] = None
+    ) -> bool:
+        """Returns False when another worker has taken the run over and raises RunStoreError when the write failed;
+        nothing is written in either case."""
+        try:
+            connection = self._connection()
+            with connection:
+                # Any status other than running ends this worker's lease.
+                cursor = connection.execute(
+                    "UPDATE agent_runs SET checkpoint = COALESCE(?, checkpoint), status = COALESCE(?, status), "
+                    "last_seq = MAX(last_seq, ?), owner = CASE WHEN COALESCE(?, 'running') = 'running' THEN owner END, "
+                    "updated_at = ? WHERE run_id = ? AND owner = ?",
+                    (checkpoint, status, events[-1][0] if events else 0, status, time.time(), run_id, owner)
+                )
+                if cursor.rowcount != 1:
+                    return False
+
+                connection.executemany(
+                    "INSERT OR REPLACE INTO agent_run_events (run_id, seq, event) VALUES (?, ?, ?)",
+                    [(run_id, seq, event) for seq, event in events]
+                )
+                self._insert_artifacts(connection, run_id, artifacts or [])
+        except sqlite3.Error as e:
+            logger_service.error(f"Failed to checkpoint run {run_id}: {e}")
+            raise RunStoreError(str(e)) from e
+
+        return True
+
+    def _insert_artifacts(self, connection: sqlite3.Connection, run_id: str, artifacts: List[Tuple[str, str]]) -> None:
+        now = time.time()
+        connection.executemany(
+            "INSERT OR REPLACE INTO agent_run_artifacts (run_id, artifact_id, payload, created_at) VALUES (?, ?, ?, ?)",
+            [(run_id, artifact_id, payload, now) for artifact_id, payload in artifacts]
+        )
+
+    def save_artifacts(self, run_id: str, artifacts: List[Tuple[str, str]]) -> None:
+        """Stores artifacts of runs that are not tracked here, such as batch items; they expire by age alone."""
+        try:
+            connection = self._connection()
+            with connection:
+                self._insert_artifacts(connection, run_id, artifacts)
+        except sqlite3.Error as e:
+            logger_service.error(f"Failed to store artifacts of run {run_id}: {e}")
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT user_goal, profile_url, dry_run, status, checkpoint, last_seq, owner, created_at, updated_at "
+            "FROM agent_runs WHERE run_id = ?",
+            (run_id,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        user_goal, profile_url, dry_run, status, checkpoint, last_seq, owner, created_at, updated_at = row
+        return {
+            "run_id": run_id,
+            "user_goal": user_goal,
+            "profile_url": profile_url,
+            "dry_run": bool(dry_run),
+            "status": status,
+            "checkpoint": json.loads(checkpoint) if checkpoint else None,
+            "last_seq": last_seq,
+            "owner": owner,
+            "created_at": created_at,
+            "updated_at": updated_at
+        }
+
+    def get_events(self, run_id: str, after_seq: int = 0) -> List[Tuple[int, str]]:
+        return self._connection().execute(
+            "SELECT seq, event FROM agent_run_events WHERE run_id = ? AND seq > ? ORDER BY seq",
+            (run_id, after_seq)
+        ).fetchall()
+
+    def get_artifact(self, run_id: str, artifact_id: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT payload FROM agent_run_artifacts WHERE run_id = ? AND artifact_id = ?",
+            (run_id, artifact_id)
+        ).fetchone()
+
+        return row[0] if row else None
+
+    def purge_expired(self) -> None:
+        self.purge_older_than(self.retention_secs)
+
+    def purge_older_than(self, age_secs: float) -> None:
+        try:
+            connection = self._connection()
+            with connection:
+                cutoff = time.time() - age_secs
+                for table in ("agent_run_events", "agent_run_artifacts"):
+                    connection.execute(
+                        f"DELETE FROM {table} WHERE run_id IN (SELECT run_id FROM agent_runs WHERE updated_at < ?)",
+                        (cutoff,)
+                    )
+                connection.execute(
+                    "DELETE FROM agent_run_artifacts WHERE created_at < ? "
+                    "AND run_id NOT IN (SELECT run_id FROM agent_runs)",
+                    (cutoff,)
+                )
+                connection.execute("DELETE FROM agent_runs WHERE updated_at < ?", (cutoff,))
+        except sqlite3.Error as e:
+            logger_service.warning(f"Run store purge failed: {e}")
+
+
+service = RunStoreService()
@@ -0,0 +1,61 @@
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, TypeVar
+
+from services.cache_service import cache_events
+from services.deadline_service import service as deadline_service
+from services.logger_service import logger_service
+from services.telemetry_service import RunTrace, run_trace, service as telemetry_service
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one shared call.
+
+    The shared call runs in an empty context, so it inherits no caller's deadline, trace, cache events or cassette;
+    the cache hits and spans it records are handed to every caller once it is done.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, Tuple[asyncio.Future, List[Dict[str, Any]], RunTrace]] = {}
+
+    async def _shared(self, func: Callable[[], Awaitable[T]], hits: List[Dict[str, Any]], trace: RunTrace) -> T:
+        cache_events.set(hits)
+        run_trace.set(trace)
+        return await func()
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        flight = self._in_flight.get(key)
+
+        if flight is None:
+            hits: List[Dict[str, Any]] = []
+            trace = RunTrace(f"{self.name}:{key}")
+            future = asyncio.get_running_loop().create_task(
+                self._shared(func, hits, trace), context=contextvars.Context()
+            )
+            flight = self._in_flight[key] = (future, hits, trace)
+            future.add_done_callback(lambda done: self._on_done(key, done))
+        else:
+            logger_service.debug(f"Joining in-flight {self.name} request for {key}")
+
+        future, hits, trace = flight
+        try:
+            # Each caller is bounded by its own deadline; the shared call runs on for the others.
+            return await deadline_service.run_within(asyncio.shield(future))
+        finally:
+            if future.done():
+                events = cache_events.get()
+                if events is not None:
+                    events.extend(hits)
+                telemetry_service.record_spans(trace.spans)
+
+    def _on_done(self, key: str, future: asyncio.Future) -> None:
+        flight = self._in_flight.get(key)
+        if flight is not None and flight[0] is future:
+            del self._in_flight[key]
+
+        if not future.cancelled():
+            future.exception()
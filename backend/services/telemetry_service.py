@@ -0,0 +1,294 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from services.logger_service import logger_service
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+PROVIDER_LATENCY = Histogram(
+    "s_esther_provider_request_seconds",
+    "Latency of outbound provider calls",
+    ["provider", "operation", "status"],
+    buckets=LATENCY_BUCKETS
+)
+PROVIDER_TOKENS = Counter(
+    "s_esther_provider_tokens_total",
+    "Tokens reported by LLM providers",
+    ["provider", "model", "kind"]
+)
+PROVIDER_BYTES = Counter(
+    "s_esther_provider_payload_bytes_total",
+    "Response payload bytes received from providers",
+    ["provider", "operation"]
+)
+PROVIDER_ERRORS = Counter(
+    "s_esther_provider_errors_total",
+    "Failed provider calls",
+    ["provider", "operation", "error"]
+)
+TOOL_LATENCY = Histogram(
+    "s_esther_tool_seconds",
+    "Latency of agent tool executions",
+    ["tool", "status"],
+    buckets=LATENCY_BUCKETS
+)
+STAGE_LATENCY = Histogram(
+    "s_esther_agent_stage_seconds",
+    "Latency of agent stages such as iterations and final scoring",
+    ["stage", "status"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_STAGE_LATENCY = Histogram(
+    "s_esther_llm_stage_seconds",
+    "Latency of LLM calls by routed call site",
+    ["stage", "model", "status"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_STAGE_TOKENS = Counter(
+    "s_esther_llm_stage_tokens_total",
+    "Tokens used by LLM calls by routed call site",
+    ["stage", "model", "kind"]
+)
+LLM_STAGE_DOWNGRADES = Counter(
+    "s_esther_llm_stage_downgrades_total",
+    "Times a call site was switched to its fallback route for exceeding its latency budget",
+    ["stage"]
+)
+RESILIENCE_EVENTS = Counter(
+    "s_esther_resilience_events_total",
+    "Retries, hedged attempts, hedge wins, short-circuited calls and breaker openings per provider",
+    ["provider", "event"]
+)
+OPEN_CIRCUITS = Gauge(
+    "s_esther_open_circuits",
+    "Circuit breakers currently open or half-open per provider",
+    ["provider"]
+)
+
+TOKEN_KINDS = ("prompt_tokens", "completion_tokens", "reasoning_tokens", "cached_tokens")
+
+
+class Span:
+    def __init__(self, category: str, name: str, operation: Optional[str], attributes: Dict[str, Any]):
+        self.category = category
+        self.name = name
+        self.operation = operation
+        self.attributes = attributes
+        self.started_at = time.perf_counter()
+        self.duration_secs: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def fail(self, error: str) -> None:
+        self.status = "error"
+        self.error = error
+
+    def record_usage(self, usage: Any) -> None:
+        if usage is None:
+            return
+
+        completion_details = getattr(usage, "completion_tokens_details", None)
+        prompt_details = getattr(usage, "prompt_tokens_details", None)
+
+        self.set(
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            reasoning_tokens=getattr(completion_details, "reasoning_tokens", None),
+            cached_tokens=getattr(prompt_details, "cached_tokens", None)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "category": self.category,
+            "name": self.name,
+            "operation": self.operation,
+            "duration_secs": round(self.duration_secs or 0.0, 4),
+            "status": self.status,
+            **({"error": self.error} if self.error else {}),
+            **{key: value for key, value in self.attributes.items() if value is not None}
+        }
+
+
+class RunTrace:
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.started_at = time.perf_counter()
+        self.spans: List[Span] = []
+
+    def summary(self, slowest: int = 5) -> Dict[str, Any]:
+        providers: Dict[str, Dict[str, Any]] = {}
+        tools: Dict[str, Dict[str, Any]] = {}
+        stages: List[Dict[str, Any]] = []
+
+        for span in self.spans:
+            if span.category == "stage":
+                stages.append(span.to_dict())
+                continue
+
+            bucket = providers if span.category == "provider" else tools
+            totals = bucket.setdefault(span.name, {"calls": 0, "errors": 0, "total_secs": 0.0})
+            totals["calls"] += 1
+            totals["errors"] += span.status == "error"
+            totals["total_secs"] = round(totals["total_secs"] + span.duration_secs, 4)
+
+            for kind in TOKEN_KINDS + ("bytes",):
+                if span.attributes.get(kind):
+                    totals[kind] = totals.get(kind, 0) + span.attributes[kind]
+
+        return {
+            "run_id": self.run_id,
+            "total_secs": round(time.perf_counter() - self.started_at, 4),
+            "stages": stages,
+            "providers": providers,
+            "tools": tools,
+            "prompt_cache": self.prompt_cache_summary(),
+            "llm_stages": self.llm_stage_summary(),
+            "slowest_spans": [
+                span.to_dict()
+                for span in sorted(
+                    (span for span in self.spans if span.category != "stage"),
+                    key=lambda span: span.duration_secs,
+                    reverse=True
+                )[:slowest]
+            ]
+        }
+
+    def llm_stage_summary(self) -> Dict[str, Any]:
+        """Latency and token usage per routed LLM call site, with the models each one ended up on."""
+        stages: Dict[str, Dict[str, Any]] = {}
+
+        for span in self.spans:
+            if span.category != "provider" or not span.attributes.get("stage"):
+                continue
+
+            totals = stages.setdefault(span.attributes["stage"], {"calls": 0, "errors": 0, "fallback_calls": 0, "total_secs": 0.0, "models": {}})
+            totals["calls"] += 1
+            totals["errors"] += span.status == "error"
+            totals["fallback_calls"] += span.attributes.get("route") == "fallback"
+            totals["total_secs"] = round(totals["total_secs"] + span.duration_secs, 4)
+            totals["max_secs"] = round(max(totals.get("max_secs", 0.0), span.duration_secs), 4)
+            model = span.attributes.get("model") or "unknown"
+            totals["models"][model] = totals["models"].get(model, 0) + 1
+
+            for kind in TOKEN_KINDS:
+                if span.attributes.get(kind):
+                    totals[kind] = totals.get(kind, 0) + span.attributes[kind]
+
+        return stages
+
+    def prompt_cache_summary(self) -> Dict[str, Any]:
+        """Share of prompt tokens the provider served from its prompt cache, overall and per model."""
+        totals = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0}
+        models: Dict[str, Dict[str, Any]] = {}
+
+        for span in self.spans:
+            if span.category != "provider" or not span.attributes.get("prompt_tokens"):
+                continue
+
+            model = models.setdefault(span.attributes.get("model") or "unknown", {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+            for bucket in (totals, model):
+                bucket["calls"] += 1
+                bucket["prompt_tokens"] += span.attributes["prompt_tokens"]
+                bucket["cached_tokens"] += span.attributes.get("cached_tokens") or 0
+
+        for bucket in (totals, *models.values()):
+            bucket["hit_ratio"] = round(bucket["cached_tokens"] / bucket["prompt_tokens"], 4) if bucket["prompt_tokens"] else None
+
+        return {**totals, "models": models}
+
+
+run_trace: ContextVar[Optional[RunTrace]] = ContextVar("run_trace", default=None)
+
+
+class TelemetryService:
+    def start_run(self, run_id: str) -> RunTrace:
+        trace = RunTrace(run_id)
+        run_trace.set(trace)
+        return trace
+
+    def end_run(self) -> None:
+        run_trace.set(None)
+
+    def record_spans(self, spans: List[Span]) -> None:
+        """Adds spans recorded outside the run, such as a fetch shared with other runs, to its trace."""
+        trace = run_trace.get()
+        if trace is not None:
+            trace.spans.extend(spans)
+
+    @contextmanager
+    def _span(self, category: str, name: str, operation: Optional[str] = None, **attributes: Any) -> Iterator[Span]:
+        span = Span(category, name, operation, attributes)
+        try:
+            yield span
+        except BaseException as e:
+            span.fail(type(e).__name__)
+            if isinstance(e, (asyncio.CancelledError, GeneratorExit)):
+                span.status = "cancelled"
+            raise
+        finally:
+            span.duration_secs = time.perf_counter() - span.started_at
+            self._observe(span)
+
+            trace = run_trace.get()
+            if trace is not None:
+                trace.spans.append(span)
+
+    def provider_span(self, provider: str, operation: str, **attributes: Any):
+        return self._span("provider", provider, operation, **attributes)
+
+    def tool_span(self, tool_name: str, **attributes: Any):
+        return self._span("tool", tool_name, **attributes)
+
+    def stage_span(self, stage: str, **attributes: Any):
+        return self._span("stage", stage, **attributes)
+
+    def _observe(self, span: Span) -> None:
+        try:
+            if span.category == "provider":
+                PROVIDER_LATENCY.labels(span.name, span.operation, span.status).observe(span.duration_secs)
+                if span.error:
+                    PROVIDER_ERRORS.labels(span.name, span.operation, span.error).inc()
+                if span.attributes.get("bytes"):
+                    PROVIDER_BYTES.labels(span.name, span.operation).inc(span.attributes["bytes"])
+                for kind in TOKEN_KINDS:
+                    if span.attributes.get(kind):
+                        PROVIDER_TOKENS.labels(span.name, span.attributes.get("model", ""), kind).inc(span.attributes[kind])
+                if span.attributes.get("stage"):
+                    self._observe_llm_stage(span)
+            elif span.category == "tool":
+                TOOL_LATENCY.labels(span.name, span.status).observe(span.duration_secs)
+            else:
+                STAGE_LATENCY.labels(span.name, span.status).observe(span.duration_secs)
+        except Exception as e:
+            logger_service.warning(f"Failed to record metrics for {span.name}: {e}")
+
+    def _observe_llm_stage(self, span: Span) -> None:
+        stage, model = span.attributes["stage"], span.attributes.get("model") or ""
+        LLM_STAGE_LATENCY.labels(stage, model, span.status).observe(span.duration_secs)
+        for kind in TOKEN_KINDS:
+            if span.attributes.get(kind):
+                LLM_STAGE_TOKENS.labels(stage, model, kind).inc(span.attributes[kind])
+
+    def record_downgrade(self, stage: str) -> None:
+        LLM_STAGE_DOWNGRADES.labels(stage).inc()
+
+    def record_resilience_event(self, provider: str, event: str) -> None:
+        RESILIENCE_EVENTS.labels(provider, event).inc()
+
+    def set_open_circuits(self, provider: str, count: int) -> None:
+        OPEN_CIRCUITS.labels(provider).set(count)
+
+    def render_metrics(self) -> Tuple[bytes, str]:
+        return generate_latest(), CONTENT_TYPE_LATEST
+
+
+service = TelemetryService()
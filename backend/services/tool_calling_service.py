@@ -1,156 +1,523 @@
 import asyncio
 import json
-from typing import AsyncGenerator, Dict, Any, List
+import time
+import uuid
+from typing import AsyncGenerator, Dict, Any, List, Optional, Tuple
 
+from config import config
 from constants.prompts import AGENT_SYSTEM_PROMPT
 from constants.tool_metadata import TOOL_METADATA
+from services.assessment_store_service import service as assessment_store_service
+from services.cache_service import cache_events
+from services.cassette_service import Cassette, active_cassette, service as cassette_service
+from services.context_compaction_service import service as context_compaction_service
+from services.deadline_service import DeadlineExceededError, service as deadline_service
+from services.event_stream_service import StreamEvent, service as event_stream_service
 from services.logger_service import logger_service
-from services.openai_service import service as openai_service
+from services.openai_service import cached_tokens, service as openai_service
+from services.prefetch_service import RunPrefetcher
 from services.prompt_generator_service import service as prompt_service
+from services.telemetry_service import service as telemetry_service
 from services.tool_registry_service import service as tool_registry_service
-from tools.finish import finish_execution
-from tools.get_linkedin_profile_data import get_linkedin_profile_data
-from tools.get_linkedin_profile_posts import get_linkedin_profile_posts
-from tools.get_linkedin_profile_reactions import get_linkedin_profile_reactions
-from tools.get_linkedin_company_details import get_linkedin_company_details
-from tools.get_linkedin_company_posts import get_linkedin_company_posts
-from tools.browse_web import browse_web
-from tools.analyze_with_llm import analyze_with_llm
-from tools.search_web import search_web
-from tools.search_company_news import search_company_news
-from tools.search_person_news import search_person_news
+
+FINISH_TOOL_CHOICE = {"type": "function", "function": {"name": "finish"}}
+DEADLINE_SUMMARY = (
+    "Research was cut short by the run deadline. Base the assessment on the tool results gathered so far "
+    "and treat anything not covered by them as unknown."
+)
+NEWS_TOOL_NAMES = ("search_company_news", "search_person_news")
+
 
 class ToolCallingService:
     def __init__(self):
         self.max_iterations = 10
-        self._tool_map = {
-            "finish": finish_execution,
-            "get_linkedin_profile_data": get_linkedin_profile_data,
-            "get_linkedin_profile_posts": get_linkedin_profile_posts,
-            "get_linkedin_profile_reactions": get_linkedin_profile_reactions,
-            "get_linkedin_company_details": get_linkedin_company_details,
-            "get_linkedin_company_posts": get_linkedin_company_posts,
-            "browse_web": browse_web,
-            "analyze_with_llm": analyze_with_llm,
-            "search_web": search_web,
-            "search_company_news": search_company_news,
-            "search_person_news": search_person_news
-        }
+        self._tool_map = tool_registry_service.get_tool_functions()
         self._prospect_name = None
+        self.parallel_tool_calls = config.PARALLEL_TOOL_CALLS
+        self.max_tool_concurrency = max(1, config.TOOL_MAX_CONCURRENCY)
+        self.prefetch_enabled = config.PREFETCH_ENABLED
+        self.scoring_max_attempts = max(1, config.SCORING_MAX_ATTEMPTS)
+        self.scoring_hedge_enabled = config.SCORING_HEDGE_ENABLED
+        self.scoring_hedge_delay = config.SCORING_HEDGE_DELAY_SECS
 
     async def execute_with_streaming(
         self,
         user_goal: str,
         linkedin_profile_url: str,
-        dry_run: bool = False
-    ) -> AsyncGenerator[str, None]:
+        dry_run: bool = False,
+        record_to: Optional[str] = None,
+        replay_from: Optional[str] = None,
+        replay_speed: float = 1.0
+    ) -> AsyncGenerator[bytes, None]:
+        seq = 0
+        async for event in self.execute_events(
+            user_goal, linkedin_profile_url, dry_run, record_to, replay_from, replay_speed
+        ):
+            seq += 1
+            yield event_stream_service.encode(StreamEvent(event, str(seq)))
+
+    async def execute_events(
+        self,
+        user_goal: str,
+        linkedin_profile_url: str,
+        dry_run: bool = False,
+        record_to: Optional[str] = None,
+        replay_from: Optional[str] = None,
+        replay_speed: float = 1.0,
+        checkpoint: Optional[Dict[str, Any]] = None,
+        emit_checkpoints: bool = False,
+        deadline_secs: Optional[float] = None
+    ) -> AsyncGenerator[Dict[str, Any], None]:
         if dry_run:
             async for event in self._execute_dry_run(user_goal, linkedin_profile_url):
                 yield event
             return
 
-        messages = [
-            {"role": "system", "content": AGENT_SYSTEM_PROMPT},
-            {"role": "user", "content": prompt_service.build_agent_context(user_goal, linkedin_profile_url)}
-        ]
+        # Everything needed to pick the run back up after the last completed step.
+        state = checkpoint or {
+            "iteration": 0,
+            "messages": [
+                {"role": "system", "content": AGENT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt_service.build_agent_context(user_goal, linkedin_profile_url)}
+            ],
+            "prospect_name": None,
+            "news_validation": {
+                "searches": 0, "llm_calls": 0, "llm_calls_avoided": 0,
+                "local_accepted": 0, "local_rejected": 0, "llm_checked": 0, "llm_accepted": 0
+            },
+            "pending_turn": None,
+            "tool_memo": {},
+            "research_summary": None,
+            "deadline_truncated": False,
+            # Replays follow the recording rather than a fresh time budget.
+            "deadline_at": None if replay_from else deadline_service.deadline_at(deadline_secs)
+        }
+        messages = state["messages"]
+        news_validation = state["news_validation"]
 
         tools = tool_registry_service.get_tools_as_openai_format()
 
-        yield f"data: {json.dumps({'type': 'started', 'message': 'Agent execution started'})}\n\n"
+        trace = telemetry_service.start_run(uuid.uuid4().hex[:12])
+        cassette_path = None
+        cassette_saved = False
+        prefetcher = None
 
+        # Everything set up from here on is torn down in the finally block, which also runs when the client
+        # disconnects (GeneratorExit) or the run's task is cancelled.
         try:
-            for iteration in range(self.max_iterations):
-                yield f"data: {json.dumps({'type': 'iteration', 'iteration': iteration + 1})}\n\n"
+            if replay_from:
+                try:
+                    cassette = await asyncio.to_thread(Cassette.load, replay_from, replay_speed)
+                except (OSError, ValueError) as e:
+                    yield {'type': 'error', 'message': f"Could not load cassette: {e}"}
+                    return
+            else:
+                cassette_path = record_to or cassette_service.cassette_path(trace.run_id)
+                cassette = Cassette.record(user_goal, linkedin_profile_url) if cassette_path else None
+            active_cassette.set(cassette)
+            deadline = deadline_service.start(state.get("deadline_at"))
+
+            if self.prefetch_enabled and not replay_from and checkpoint is None:
+                prefetcher = RunPrefetcher(linkedin_profile_url, self._tool_map)
+                prefetcher.start()
+
+            if checkpoint is None:
+                yield {
+                    'type': 'started',
+                    'message': 'Agent execution started',
+                    'deadline_secs': round(deadline.remaining(keep_reserve=False), 1) if deadline else None
+                }
+            else:
+                yield {'type': 'resumed', 'message': 'Agent execution resumed', 'iteration': state["iteration"] + 1}
 
-                response = await openai_service.create_chat_completion_with_tools_async(
-                    messages=messages,
-                    tools=tools,
-                    temperature=0.7
-                )
+            for iteration in range(state["iteration"], self.max_iterations):
+                if state["research_summary"] is not None:
+                    break
 
-                assistant_message = response.choices[0].message
+                yield {'type': 'iteration', 'iteration': iteration + 1}
+
+                # Out of research time: ask for the finish call now and score what has been gathered.
+                finish_now = deadline is not None and deadline.research_exhausted()
+                if finish_now:
+                    state["deadline_truncated"] = True
+                    yield {
+                        'type': 'deadline_reached',
+                        'message': 'Time budget nearly used up, finishing with the evidence gathered so far',
+                        'remaining_secs': round(deadline.remaining(keep_reserve=False), 1)
+                    }
+
+                with telemetry_service.stage_span("iteration", iteration=iteration + 1, finish_now=finish_now):
+                    context_stats = await context_compaction_service.compact(messages)
+
+                    turn: Dict[str, Any] = {}
+                    tool_results: Dict[str, Any] = {}
+
+                    async for event in self._stream_turn(
+                        messages, tools, turn, tool_results, prefetcher, state["pending_turn"], state["tool_memo"],
+                        finish_only=finish_now
+                    ):
+                        if event["type"] == "turn_streamed":
+                            state["pending_turn"] = event["turn"]
+                        else:
+                            yield event
+
+                        if emit_checkpoints and event["type"] in ("turn_streamed", "tool_completed"):
+                            yield {'type': 'checkpoint', 'state': state}
+
+                if turn["usage"]:
+                    context_stats["prompt_tokens"] = turn["usage"].prompt_tokens
+                    context_stats["completion_tokens"] = turn["usage"].completion_tokens
+                    context_stats["cached_tokens"] = cached_tokens(turn["usage"])
+
+                yield {'type': 'context_usage', 'iteration': iteration + 1, **context_stats}
+
+                if not turn["tool_calls"] and finish_now:
+                    state["research_summary"] = DEADLINE_SUMMARY
+                    break
 
-                if not assistant_message.tool_calls:
-                    yield f"data: {json.dumps({'type': 'no_tool_call', 'message': assistant_message.content or 'Agent finished without calling tools'})}\n\n"
+                if not turn["tool_calls"]:
+                    yield {'type': 'no_tool_call', 'message': turn["content"] or 'Agent finished without calling tools'}
                     break
 
                 messages.append({
                     "role": "assistant",
-                    "content": assistant_message.content,
+                    "content": turn["content"],
                     "tool_calls": [
                         {
-                            "id": tc.id,
-                            "type": tc.type,
+                            "id": tc["id"],
+                            "type": tc["type"],
                             "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
+                                "name": tc["name"],
+                                "arguments": tc["arguments"]
                             }
-                        } for tc in assistant_message.tool_calls
+                        } for tc in turn["tool_calls"]
                     ]
                 })
 
                 should_finish = False
 
-                for tool_call in assistant_message.tool_calls:
-                    tool_name = tool_call.function.name
-                    tool_args = json.loads(tool_call.function.arguments)
-
-                    tool_metadata = TOOL_METADATA.get(tool_name, {
-                        "title": tool_name.replace("_", " ").title(),
-                        "description": f"Executing {tool_name}"
-                    })
-
-                    yield f"data: {json.dumps({'type': 'tool_started', 'tool_name': tool_name, 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': tool_args})}\n\n"
-
-                    if tool_name not in self._tool_map:
-                        error_result = {"error": f"Unknown tool: {tool_name}"}
-                        yield f"data: {json.dumps({'type': 'tool_error', 'error': error_result})}\n\n"
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": json.dumps(error_result)
-                        })
-                        continue
-
-                    tool_func = self._tool_map[tool_name]
-                    result = await asyncio.to_thread(tool_func, **tool_args)
-
-                    yield f"data: {json.dumps({'type': 'tool_completed', 'tool_name': tool_name, 'result': result})}\n\n"
+                for tool_call in turn["tool_calls"]:
+                    result = tool_results[tool_call["id"]]
 
                     messages.append({
                         "role": "tool",
-                        "tool_call_id": tool_call.id,
+                        "tool_call_id": tool_call["id"],
                         "content": json.dumps(result)
                     })
 
-                    if tool_name == "finish":
+                    if tool_call["name"] == "get_linkedin_profile_data" and not state["prospect_name"]:
+                        state["prospect_name"] = self._extract_profile_name(result)
+
+                    if tool_call["name"] in NEWS_TOOL_NAMES and isinstance(result, dict) and "validation" in result:
+                        self._record_news_validation(news_validation, result["validation"])
+
+                    if tool_call["name"] == "finish":
                         should_finish = True
-                        research_summary = result.get("summary", "")
+                        state["research_summary"] = result.get("summary", "")
+
+                if finish_now and state["research_summary"] is None:
+                    should_finish = True
+                    state["research_summary"] = DEADLINE_SUMMARY
+
+                state.update(iteration=iteration + 1, pending_turn=None, tool_memo={})
+                if emit_checkpoints:
+                    yield {'type': 'checkpoint', 'state': state}
 
                 if should_finish:
-                    final_assessment = await self._generate_final_assessment(research_summary, user_goal, messages)
-                    final_assessment["prospect_name"] = await self._get_prospect_name(messages)
-                    yield f"data: {json.dumps({'type': 'final_result', 'assessment': final_assessment})}\n\n"
                     break
 
             else:
-                yield f"data: {json.dumps({'type': 'max_iterations', 'message': 'Reached maximum iterations'})}\n\n"
+                if state["research_summary"] is None:
+                    yield {'type': 'max_iterations', 'message': 'Reached maximum iterations'}
+
+            if state["research_summary"] is not None:
+                with telemetry_service.stage_span("final_stage"):
+                    final_assessment, scoring_stats = await self._run_final_stage(
+                        state["research_summary"], user_goal, messages, state["prospect_name"]
+                    )
+                # An assessment built from research cut short by the deadline is not stored for reuse.
+                truncated = state.get("deadline_truncated", False)
+                if scoring_stats["winner_attempt"] is not None and not replay_from and not truncated:
+                    await asyncio.to_thread(
+                        assessment_store_service.put, linkedin_profile_url, user_goal,
+                        final_assessment, self._collect_evidence(state)
+                    )
+                yield {'type': 'scoring_stats', **scoring_stats}
+                yield {'type': 'final_result', 'assessment': final_assessment, 'served_from_store': False}
 
         except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield {'type': 'error', 'message': str(e)}
+
+        finally:
+            if prefetcher is not None:
+                prefetch_stats = prefetcher.finish()
+                logger_service.info(f"Prefetch stats for {linkedin_profile_url}: {prefetch_stats}")
+
+            active_cassette.set(None)
+            deadline_service.end()
+            if cassette_path:
+                try:
+                    await asyncio.to_thread(cassette_service.save, cassette, cassette_path)
+                    cassette_saved = True
+                except OSError as e:
+                    logger_service.warning(f"Could not save cassette to {cassette_path}: {e}")
+
+            telemetry_service.end_run()
+            summary = trace.summary()
+            prompt_cache = summary["prompt_cache"]
+            if prompt_cache["calls"]:
+                logger_service.info(
+                    f"Prompt cache for {linkedin_profile_url}: {prompt_cache['cached_tokens']}/{prompt_cache['prompt_tokens']} "
+                    f"prompt tokens cached over {prompt_cache['calls']} calls"
+                )
+
+        if prefetcher is not None:
+            yield {'type': 'prefetch_stats', **prefetch_stats}
 
-    async def _execute_dry_run(self, user_goal: str, linkedin_profile_url: str) -> AsyncGenerator[str, None]:
-        yield f"data: {json.dumps({'type': 'started', 'message': 'Agent execution started (DRY RUN MODE)'})}\n\n"
+        if news_validation["searches"]:
+            yield {'type': 'news_validation_stats', **news_validation}
+
+        if cassette_saved:
+            yield {'type': 'cassette_recorded', 'path': cassette_path}
+
+        yield {'type': 'run_timing', **summary}
+
+    async def _stream_turn(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: List[Dict[str, Any]],
+        turn: Dict[str, Any],
+        tool_results: Dict[str, Any],
+        prefetcher: Optional[RunPrefetcher] = None,
+        planned_turn: Optional[Dict[str, Any]] = None,
+        tool_memo: Optional[Dict[str, Any]] = None,
+        finish_only: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        concurrency = self.max_tool_concurrency if self.parallel_tool_calls else 1
+        semaphore = asyncio.Semaphore(concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+        tasks: List[asyncio.Task] = []
+        assembled: Dict[int, Dict[str, Any]] = {}
+        content_parts: List[str] = []
+        turn["usage"] = None
+
+        async def run_tool(tool_call: Dict[str, Any], tool_args: Dict[str, Any]) -> None:
+            tool_name = tool_call["name"]
+            async with semaphore:
+                await queue.put(("started", tool_call, tool_args))
+                hits: List[Dict[str, Any]] = []
+                cache_events.set(hits)
+                # Only the tool's result goes on the cassette; its own provider calls run live.
+                cassette = active_cassette.get()
+                active_cassette.set(None)
+                prefetched = False
+
+                memo_key = f"{tool_name}:{json.dumps(tool_args, sort_keys=True)}"
+                if tool_memo is not None and memo_key in tool_memo:
+                    await queue.put(("restored", tool_call, None))
+                    await queue.put(("completed", tool_call, tool_memo[memo_key]))
+                    return
+
+                async def execute() -> Any:
+                    nonlocal prefetched
+                    prefetched, result = await prefetcher.take(tool_name, tool_args) if prefetcher else (False, None)
+                    return result if prefetched else await self._invoke_tool(tool_name, tool_args)
+
+                with telemetry_service.tool_span(tool_name) as span:
+                    try:
+                        # Research tools keep the finishing reserve free; the finish call itself may use it.
+                        result = await deadline_service.run_within(
+                            cassette.tool_call(tool_name, tool_args, execute) if cassette is not None else execute(),
+                            keep_reserve=not finish_only
+                        )
+                    except DeadlineExceededError as e:
+                        span.fail("deadline_exceeded")
+                        result = {"error": str(e), "deadline_exceeded": True}
+                    except Exception as e:
+                        span.fail(type(e).__name__)
+                        await queue.put(("failed", tool_call, e))
+                        return
+                    span.set(prefetched=prefetched, cache_hits=len(hits))
+                    if isinstance(result, dict) and "error" in result:
+                        span.fail("tool_error")
+                if tool_memo is not None:
+                    tool_memo[memo_key] = result
+                if prefetched:
+                    await queue.put(("prefetch_hit", tool_call, None))
+                for hit in hits:
+                    await queue.put(("cache_hit", tool_call, hit))
+                await queue.put(("completed", tool_call, result))
+
+        async def submit(tool_call: Dict[str, Any]) -> None:
+            tool_args = json.loads(tool_call["arguments"] or "{}")
+
+            if tool_call["name"] not in self._tool_map:
+                await queue.put(("unknown", tool_call, tool_args))
+                return
+
+            if finish_only and tool_call["name"] != "finish":
+                await queue.put(("skipped", tool_call, tool_args))
+                return
+
+            tasks.append(asyncio.create_task(run_tool(tool_call, tool_args)))
+            await queue.put(("submitted", tool_call, None))
+
+        async def read_stream() -> None:
+            if planned_turn is not None:
+                # Resuming a turn whose tool calls were already streamed; re-run those instead of asking again.
+                if planned_turn["content"]:
+                    content_parts.append(planned_turn["content"])
+                for index, tool_call in enumerate(planned_turn["tool_calls"]):
+                    assembled[index] = dict(tool_call)
+                    await queue.put(("planned", assembled[index], None))
+                    await submit(assembled[index])
+                await queue.put(("stream_done", None, None))
+                return
+
+            route = openai_service.route("agent_step")
+            started_at = time.perf_counter()
+            try:
+                with telemetry_service.provider_span(
+                    "openai", "chat.completions.stream", model=route["model"], stage="agent_step", route=route["tier"]
+                ) as span:
+                    stream = await openai_service.create_chat_completion_with_tools_async(
+                        messages=messages,
+                        tools=tools,
+                        temperature=0.7,
+                        stream=True,
+                        route=route,
+                        stream_options={"include_usage": True},
+                        **({"tool_choice": FINISH_TOOL_CHOICE} if finish_only else {})
+                    )
+
+                    current_index = None
+                    async for chunk in stream:
+                        if "time_to_first_chunk_secs" not in span.attributes:
+                            span.set(time_to_first_chunk_secs=round(time.perf_counter() - span.started_at, 4))
+
+                        if chunk.usage:
+                            turn["usage"] = chunk.usage
+                            span.record_usage(chunk.usage)
+
+                        if not chunk.choices:
+                            continue
+
+                        delta = chunk.choices[0].delta
+
+                        if delta.content:
+                            content_parts.append(delta.content)
+                            await queue.put(("assistant_delta", None, delta.content))
+
+                        for tool_call_delta in delta.tool_calls or []:
+                            index = tool_call_delta.index
+                            if index != current_index:
+                                if current_index is not None:
+                                    await submit(assembled[current_index])
+                                current_index = index
+                                assembled[index] = {"id": None, "type": "function", "name": "", "arguments": ""}
+
+                            tool_call = assembled[index]
+                            if tool_call_delta.id:
+                                tool_call["id"] = tool_call_delta.id
+                            if tool_call_delta.function and tool_call_delta.function.name:
+                                if not tool_call["name"]:
+                                    await queue.put(("planned", tool_call, None))
+                                tool_call["name"] += tool_call_delta.function.name
+                            if tool_call_delta.function and tool_call_delta.function.arguments:
+                                tool_call["arguments"] += tool_call_delta.function.arguments
+
+                    if current_index is not None:
+                        await submit(assembled[current_index])
+
+            except Exception as e:
+                openai_service.observe_route(route, time.perf_counter() - started_at)
+                await queue.put(("stream_failed", None, e))
+                return
+
+            openai_service.observe_route(route, time.perf_counter() - started_at)
+            await queue.put(("stream_done", None, None))
+
+        stream_task = asyncio.create_task(read_stream())
+
+        try:
+            stream_done = False
+            pending = 0
+            while not stream_done or pending:
+                status, tool_call, payload = await queue.get()
+
+                if status == "assistant_delta":
+                    yield {'type': 'assistant_delta', 'content': payload}
+                elif status == "planned":
+                    tool_metadata = self._get_tool_metadata(tool_call["name"])
+                    yield {'type': 'tool_planned', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"], 'tool_title': tool_metadata['title']}
+                elif status == "submitted":
+                    pending += 1
+                elif status == "unknown":
+                    tool_metadata = self._get_tool_metadata(tool_call["name"])
+                    yield {'type': 'tool_started', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"], 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': payload}
+                    error_result = {"error": f"Unknown tool: {tool_call['name']}"}
+                    yield {'type': 'tool_error', 'tool_call_id': tool_call["id"], 'error': error_result}
+                    tool_results[tool_call["id"]] = error_result
+                elif status == "skipped":
+                    skipped_result = {"error": "Skipped: run deadline reached", "deadline_exceeded": True}
+                    yield {'type': 'tool_skipped', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"], 'reason': 'deadline'}
+                    tool_results[tool_call["id"]] = skipped_result
+                elif status == "started":
+                    tool_metadata = self._get_tool_metadata(tool_call["name"])
+                    yield {'type': 'tool_started', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"], 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': payload}
+                elif status == "restored":
+                    yield {'type': 'tool_restored', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"]}
+                elif status == "prefetch_hit":
+                    yield {'type': 'prefetch_hit', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"]}
+                elif status == "cache_hit":
+                    yield {'type': 'cache_hit', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"], **payload}
+                elif status == "completed":
+                    pending -= 1
+                    tool_results[tool_call["id"]] = payload
+                    yield {'type': 'tool_completed', 'tool_call_id': tool_call["id"], 'tool_name': tool_call["name"], 'result': payload}
+                elif status in ("failed", "stream_failed"):
+                    raise payload
+                elif status == "stream_done":
+                    stream_done = True
+                    yield {'type': 'turn_streamed', 'turn': {
+                        'content': "".join(content_parts) or None,
+                        'tool_calls': [assembled[index] for index in sorted(assembled)]
+                    }}
+
+        finally:
+            for task in [stream_task, *tasks]:
+                if not task.done():
+                    task.cancel()
+
+        turn["content"] = "".join(content_parts) or None
+        turn["tool_calls"] = [assembled[index] for index in sorted(assembled)]
+
+    async def _invoke_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        tool_func = self._tool_map[tool_name]
+
+        if asyncio.iscoroutinefunction(tool_func):
+            return await tool_func(**tool_args)
+
+        return await asyncio.to_thread(tool_func, **tool_args)
+
+    def _get_tool_metadata(self, tool_name: str) -> Dict[str, str]:
+        return TOOL_METADATA.get(tool_name, {
+            "title": tool_name.replace("_", " ").title(),
+            "description": f"Executing {tool_name}"
+        })
+
+    async def _execute_dry_run(self, user_goal: str, linkedin_profile_url: str) -> AsyncGenerator[Dict[str, Any], None]:
+        yield {'type': 'started', 'message': 'Agent execution started (DRY RUN MODE)'}
 
         await asyncio.sleep(0.5)
 
-        yield f"data: {json.dumps({'type': 'iteration', 'iteration': 1})}\n\n"
+        yield {'type': 'iteration', 'iteration': 1}
 
         tool_metadata = TOOL_METADATA.get('get_linkedin_profile_data', {
             "title": "Get LinkedIn Profile Data",
             "description": "Retrieving LinkedIn profile information"
         })
-        yield f"data: {json.dumps({'type': 'tool_started', 'tool_name': 'get_linkedin_profile_data', 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': {'profile_url': linkedin_profile_url}})}\n\n"
+        yield {'type': 'tool_started', 'tool_name': 'get_linkedin_profile_data', 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': {'profile_url': linkedin_profile_url}}
         await asyncio.sleep(1)
 
         mock_profile_data = {
@@ -163,15 +530,15 @@ class ToolCallingService:
                 {"title": "Software Engineer", "company": "Startup Inc", "duration": "2018 - 2020"}
             ]
         }
-        yield f"data: {json.dumps({'type': 'tool_completed', 'tool_name': 'get_linkedin_profile_data', 'result': mock_profile_data})}\n\n"
+        yield {'type': 'tool_completed', 'tool_name': 'get_linkedin_profile_data', 'result': mock_profile_data}
 
-        yield f"data: {json.dumps({'type': 'iteration', 'iteration': 2})}\n\n"
+        yield {'type': 'iteration', 'iteration': 2}
 
         tool_metadata = TOOL_METADATA.get('search_web', {
             "title": "Search Web",
             "description": "Searching the web for information"
         })
-        yield f"data: {json.dumps({'type': 'tool_started', 'tool_name': 'search_web', 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': {'query': 'Tech Corp recent news'}})}\n\n"
+        yield {'type': 'tool_started', 'tool_name': 'search_web', 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': {'query': 'Tech Corp recent news'}}
         await asyncio.sleep(1)
 
         mock_search_results = {
@@ -180,21 +547,21 @@ class ToolCallingService:
                 {"title": "Tech Corp launches new product", "url": "https://example.com/news2", "snippet": "The company unveiled its latest innovation..."}
             ]
         }
-        yield f"data: {json.dumps({'type': 'tool_completed', 'tool_name': 'search_web', 'result': mock_search_results})}\n\n"
+        yield {'type': 'tool_completed', 'tool_name': 'search_web', 'result': mock_search_results}
 
-        yield f"data: {json.dumps({'type': 'iteration', 'iteration': 3})}\n\n"
+        yield {'type': 'iteration', 'iteration': 3}
 
         tool_metadata = TOOL_METADATA.get('finish', {
             "title": "Finish",
             "description": "Completing research"
         })
-        yield f"data: {json.dumps({'type': 'tool_started', 'tool_name': 'finish', 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': {'summary': 'Completed research on prospect'}})}\n\n"
+        yield {'type': 'tool_started', 'tool_name': 'finish', 'tool_title': tool_metadata['title'], 'tool_description': tool_metadata['description'], 'arguments': {'summary': 'Completed research on prospect'}}
         await asyncio.sleep(0.5)
 
         mock_finish_result = {
             "summary": "John Doe is a Senior Software Engineer at Tech Corp with 6+ years of experience. Tech Corp recently raised $50M and launched a new product, indicating strong growth."
         }
-        yield f"data: {json.dumps({'type': 'tool_completed', 'tool_name': 'finish', 'result': mock_finish_result})}\n\n"
+        yield {'type': 'tool_completed', 'tool_name': 'finish', 'result': mock_finish_result}
 
         mock_assessment = {
             "prospect_name": "John Doe",
@@ -210,51 +577,184 @@ class ToolCallingService:
             "reasoning": "Strong technical background at a growing company. Good fit for technical products or services."
         }
 
-        yield f"data: {json.dumps({'type': 'final_result', 'assessment': mock_assessment})}\n\n"
+        yield {'type': 'final_result', 'assessment': mock_assessment}
+
+    async def _run_final_stage(
+        self,
+        research_summary: str,
+        user_goal: str,
+        messages: List[Dict[str, Any]],
+        prospect_name: Optional[str]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        if prospect_name:
+            final_assessment, scoring_stats = await self._generate_final_assessment(research_summary, user_goal, messages)
+        else:
+            (final_assessment, scoring_stats), prospect_name = await asyncio.gather(
+                self._generate_final_assessment(research_summary, user_goal, messages),
+                self._get_prospect_name(messages)
+            )
+
+        final_assessment["prospect_name"] = prospect_name
+        return final_assessment, scoring_stats
+
+    def _record_news_validation(self, totals: Dict[str, int], validation: Dict[str, Any]) -> None:
+        totals["searches"] += 1
+        totals["llm_calls_avoided" if validation["llm_call_avoided"] else "llm_calls"] += 1
+        for key in ("local_accepted", "local_rejected", "llm_checked", "llm_accepted"):
+            totals[key] += validation[key]
+
+    def _collect_evidence(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        tool_calls = [
+            {"name": tool_call["function"]["name"], "arguments": tool_call["function"]["arguments"]}
+            for message in state["messages"] if message["role"] == "assistant"
+            for tool_call in message.get("tool_calls") or []
+        ]
+
+        return {
+            "research_summary": state["research_summary"],
+            "prospect_name": state["prospect_name"],
+            "tool_calls": tool_calls
+        }
+
+    def _extract_profile_name(self, profile: Any) -> Optional[str]:
+        if not isinstance(profile, dict) or "error" in profile:
+            return None
+
+        for section in (profile, profile.get("basic_info"), profile.get("profile")):
+            if not isinstance(section, dict):
+                continue
+
+            for key in ("fullName", "full_name", "fullname", "name"):
+                if isinstance(section.get(key), str) and section[key].strip():
+                    return section[key].strip()
+
+            first_name = section.get("firstName") or section.get("first_name")
+            last_name = section.get("lastName") or section.get("last_name")
+            if first_name or last_name:
+                return " ".join(part for part in (first_name, last_name) if part)
+
+        return None
 
     async def _get_prospect_name(self, messages: List[Dict[str, Any]]) -> str:
         try:
-            response = openai_service.analyze_with_reasoning(
+            response = await openai_service.analyze_with_reasoning_async(
                 prompt="What is the name of the prospect? Only return the name, no other text.",
-                context=self._extract_context_summary(messages)
-                )
+                context=self._extract_context_summary(messages),
+                stage="name_extraction"
+            )
             return response
         except Exception as e:
             logger_service.error(f"Error getting prospect name: {e}")
             return "Unknown"
 
-    async def _generate_final_assessment(self, research_summary: str, user_goal: str, message_context: str) -> Dict[str, Any]:
-        max_retries = 3
+    def _parse_assessment(self, task: asyncio.Task) -> Optional[Dict[str, Any]]:
+        if task.exception() is not None:
+            logger_service.warning(f"Scoring attempt failed: {task.exception()}")
+            return None
 
-        for attempt in range(max_retries):
-            scoring_result = await asyncio.to_thread(
-                openai_service.score_prospect,
-                research_summary,
-                user_goal,
-                message_context
-            )
+        message = task.result().choices[0].message
+        if getattr(message, "refusal", None) or not message.content:
+            logger_service.warning(f"Scoring attempt returned no assessment: {getattr(message, 'refusal', None)}")
+            return None
 
-            try:
-                assessment = json.loads(scoring_result)
+        try:
+            return json.loads(message.content)
+        except json.JSONDecodeError:
+            return None
+
+    async def _generate_final_assessment(
+        self,
+        research_summary: str,
+        user_goal: str,
+        message_context: List[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        attempts: List[asyncio.Task] = []
+        attempt_started: Dict[asyncio.Task, float] = {}
+
+        def launch() -> asyncio.Task:
+            task = asyncio.create_task(openai_service.score_prospect_async(research_summary, user_goal, message_context))
+            attempts.append(task)
+            attempt_started[task] = loop.time()
+            return task
+
+        pending = {launch()}
+        winner: Optional[asyncio.Task] = None
+        assessment: Optional[Dict[str, Any]] = None
 
-                if all(key in assessment for key in ["good_signals", "bad_signals", "score", "reasoning"]):
-                    return assessment
-                else:
-                    if attempt < max_retries - 1:
-                        continue
+        try:
+            while pending:
+                can_hedge = self.scoring_hedge_enabled and len(attempts) < self.scoring_max_attempts
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.scoring_hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
 
-            except json.JSONDecodeError:
-                if attempt < max_retries - 1:
+                if not done:
+                    logger_service.info(f"Scoring attempt exceeded {self.scoring_hedge_delay}s, starting hedged attempt")
+                    pending.add(launch())
                     continue
 
-        return {
-            "good_signals": [],
-            "bad_signals": [],
-            "score": 50,
-            "reasoning": "Error parsing assessment after 3 retries",
-            "raw_response": scoring_result
+                for task in done:
+                    assessment = self._parse_assessment(task)
+                    if assessment is not None:
+                        winner = task
+                        break
+
+                if winner is not None:
+                    break
+
+                if not pending and len(attempts) < self.scoring_max_attempts:
+                    pending.add(launch())
+
+        finally:
+            cancelled = [task for task in attempts if not task.done()]
+            for task in cancelled:
+                task.cancel()
+
+        finished_at = loop.time()
+        stats: Dict[str, Any] = {
+            "attempts": len(attempts),
+            "hedged": self.scoring_hedge_enabled and len(attempts) > 1,
+            "winner_attempt": attempts.index(winner) + 1 if winner is not None else None,
+            "elapsed_secs": round(finished_at - started_at, 3),
+            "cancelled_attempts": len(cancelled)
         }
 
+        if winner is not None and winner.result().usage is not None:
+            usage = winner.result().usage
+            details = getattr(usage, "completion_tokens_details", None)
+            stats["usage"] = {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "reasoning_tokens": getattr(details, "reasoning_tokens", None),
+                "cached_tokens": cached_tokens(usage)
+            }
+
+        if cancelled:
+            # Cancelled requests are still billed for their prompt; completion tokens are unknown.
+            prompt_tokens = stats.get("usage", {}).get("prompt_tokens") or context_compaction_service.count_tokens(
+                openai_service._build_scoring_messages(research_summary, user_goal, message_context)
+            )
+            stats["cancelled_elapsed_secs"] = round(sum(finished_at - attempt_started[task] for task in cancelled), 3)
+            stats["cancelled_prompt_tokens"] = prompt_tokens * len(cancelled)
+
+        if assessment is None:
+            failures = [task.exception() for task in attempts if task.done() and not task.cancelled() and task.exception()]
+            if len(failures) == len(attempts):
+                raise failures[-1]
+
+            assessment = {
+                "good_signals": [],
+                "bad_signals": [],
+                "score": 50,
+                "reasoning": f"No valid assessment after {len(attempts)} attempts"
+            }
+
+        return assessment, stats
+
     def _extract_context_summary(self, messages: List[Dict[str, Any]]) -> str:
         context_parts = []
 
@@ -1,58 +1,50 @@
-from typing import List, Dict, Any
-
-from langchain_core.tools import StructuredTool
-
-from tools.analyze_with_llm import create_analyze_with_llm_tool
-from tools.browse_web import create_browse_web_tool
-from tools.finish import create_finish_tool
-from tools.get_linkedin_company_details import create_linkedin_company_details_tool
-from tools.get_linkedin_company_posts import create_linkedin_company_posts_tool
-from tools.get_linkedin_profile_data import create_linkedin_profile_tool
-from tools.get_linkedin_profile_posts import create_linkedin_profile_posts_tool
-from tools.get_linkedin_profile_reactions import create_linkedin_profile_reactions_tool
-from tools.search_company_news import create_search_company_news_tool
-from tools.search_person_news import create_search_person_news_tool
-from tools.search_web import create_search_web_tool
+import json
+from typing import Any, Callable, Dict, Tuple
+
+from tools.analyze_with_llm import analyze_with_llm_tool
+from tools.browse_web import browse_web_tool
+from tools.finish import finish_tool
+from tools.get_linkedin_company_details import linkedin_company_details_tool
+from tools.get_linkedin_company_posts import linkedin_company_posts_tool
+from tools.get_linkedin_profile_data import linkedin_profile_tool
+from tools.get_linkedin_profile_posts import linkedin_profile_posts_tool
+from tools.get_linkedin_profile_reactions import linkedin_profile_reactions_tool
+from tools.search_company_news import search_company_news_tool
+from tools.search_person_news import search_person_news_tool
+from tools.search_web import search_web_tool
+from tools.tool_spec import ToolSpec
+
+
+TOOL_SPECS: Tuple[ToolSpec, ...] = (
+    finish_tool,
+    linkedin_profile_tool,
+    linkedin_profile_posts_tool,
+    linkedin_profile_reactions_tool,
+    linkedin_company_details_tool,
+    linkedin_company_posts_tool,
+    browse_web_tool,
+    search_web_tool,
+    search_company_news_tool,
+    search_person_news_tool,
+    analyze_with_llm_tool
+)
 
 
 class ToolRegistryService:
     def __init__(self):
-        self._tools = None
-
-    def get_tools(self) -> List[StructuredTool]:
-        if self._tools is None:
-            self._tools = [
-                create_finish_tool(),
-                create_linkedin_profile_tool(),
-                create_linkedin_profile_posts_tool(),
-                create_linkedin_profile_reactions_tool(),
-                create_linkedin_company_details_tool(),
-                create_linkedin_company_posts_tool(),
-                create_browse_web_tool(),
-                create_search_web_tool(),
-                create_search_company_news_tool(),
-                create_search_person_news_tool(),
-                create_analyze_with_llm_tool()
-            ]
-
-        return self._tools
-
-    def get_tools_as_openai_format(self) -> List[Dict[str, Any]]:
-        tools = self.get_tools()
-        openai_tools = []
-
-        for tool in tools:
-            openai_tool = {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": tool.args_schema.model_json_schema()
-                }
-            }
-            openai_tools.append(openai_tool)
-
-        return openai_tools
+        self._specs = {spec.name: spec for spec in TOOL_SPECS}
+
+        # Schemas are compiled once per process; the canonical encoding keeps the request bytes identical across runs.
+        self.openai_tools_json = json.dumps(
+            [spec.openai_format() for spec in TOOL_SPECS], sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+        self._openai_tools: Tuple[Dict[str, Any], ...] = tuple(json.loads(self.openai_tools_json))
+
+    def get_tool_functions(self) -> Dict[str, Callable[..., Any]]:
+        return {name: spec.function for name, spec in self._specs.items()}
+
+    def get_tools_as_openai_format(self) -> Tuple[Dict[str, Any], ...]:
+        return self._openai_tools
 
 
 service = ToolRegistryService()
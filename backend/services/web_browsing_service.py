@@ -1,7 +1,25 @@
-from typing import Optional, Dict, Any
+import asyncio
+import re
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 
-import requests
-from bs4 import BeautifulSoup
+import httpx
+import lxml.html
+
+from config import config
+from services.deadline_service import DeadlineExceededError, service as deadline_service
+from services.resilience_service import CircuitOpenError, service as resilience_service
+from services.telemetry_service import service as telemetry_service
+
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+TEXT_CONTENT_TYPES = ("text/plain",)
+NOISE_XPATH = "//script|//style|//noscript|//template|//svg|//iframe|//form|//nav|//header|//footer|//aside"
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "table", "blockquote", "pre",
+              "h1", "h2", "h3", "h4", "h5", "h6"}
+MIN_MAIN_CONTENT_CHARS = 250
+XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+HTML_NOISE = re.compile(r"<(script|style|noscript|template|svg)\b.*?</\1\s*>|<!--.*?-->", re.S | re.I)
 
 
 class WebBrowsingService:
@@ -10,31 +28,161 @@ class WebBrowsingService:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.timeout = 10
+        self.max_bytes = config.BROWSE_MAX_BYTES
+        self.max_text_chars = config.BROWSE_MAX_TEXT_CHARS
+        self.max_html_chars = config.BROWSE_MAX_HTML_CHARS
+        self._client: Optional[httpx.AsyncClient] = None
 
-    def fetch_url(self, url: str) -> Optional[Dict[str, Any]]:
-        try:
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _read_capped(self, response: httpx.Response) -> Tuple[bytes, bool]:
+        chunks = []
+        size = 0
+
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                return b"".join(chunks)[:self.max_bytes], True
+
+        return b"".join(chunks), False
+
+    def _main_content(self, document: lxml.html.HtmlElement) -> lxml.html.HtmlElement:
+        candidates = document.xpath("//article|//main|//*[@role='main']")
+        if candidates:
+            best = max(candidates, key=lambda el: len(el.text_content()))
+            if len(best.text_content().strip()) >= MIN_MAIN_CONTENT_CHARS:
+                return best
+
+        scores: Dict[lxml.html.HtmlElement, float] = {}
+        for paragraph in document.iter("p", "pre", "blockquote"):
+            text_length = len(paragraph.text_content().strip())
+            if text_length < 25:
+                continue
+
+            parent = paragraph.getparent()
+            if parent is None:
+                continue
+            scores[parent] = scores.get(parent, 0) + text_length
+
+            grandparent = parent.getparent()
+            if grandparent is not None:
+                scores[grandparent] = scores.get(grandparent, 0) + text_length / 2
+
+        if scores:
+            best, score = max(scores.items(), key=lambda item: item[1])
+            if score >= MIN_MAIN_CONTENT_CHARS:
+                return best
+
+        body = document.find("body")
+        return body if body is not None else document
+
+    def _extract(self, html: str) -> Dict[str, Any]:
+        document = lxml.html.document_fromstring(XML_DECLARATION.sub("", html, count=1))
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+        title = document.findtext(".//title")
 
-            for script in soup(["script", "style"]):
-                script.decompose()
+        for element in document.xpath(NOISE_XPATH):
+            element.drop_tree()
 
-            text_content = soup.get_text(separator='\n', strip=True)
+        root = self._main_content(document)
+        for element in root.iter(*BLOCK_TAGS):
+            element.tail = "\n" + (element.tail or "")
 
-            return {
+        lines = (re.sub(r"\s+", " ", line).strip() for line in root.text_content().splitlines())
+        text_content = "\n".join(line for line in lines if line)
+
+        return {
+            "title": title.strip() if title else None,
+            "text": text_content
+        }
+
+    def _truncate(self, text: str) -> Tuple[str, bool]:
+        if len(text) <= self.max_text_chars:
+            return text, False
+
+        return text[:self.max_text_chars].rsplit(" ", 1)[0], True
+
+    def _trim_html(self, html: str) -> Tuple[str, bool]:
+        # Scripts, styles and comments are most of a page's markup and say nothing to the model.
+        html = HTML_NOISE.sub("", html)
+        if len(html) <= self.max_html_chars:
+            return html, False
+
+        return html[:self.max_html_chars].rsplit("<", 1)[0], True
+
+    async def _download(self, url: str) -> Dict[str, Any]:
+        with telemetry_service.provider_span("web", "fetch") as span:
+            async with self._get_client().stream("GET", url, timeout=deadline_service.timeout(self.timeout)) as response:
+                span.set(status_code=response.status_code)
+                response.raise_for_status()
+
+                content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                if content_type and content_type not in HTML_CONTENT_TYPES + TEXT_CONTENT_TYPES:
+                    return {"content_type": content_type, "html": None}
+
+                body, bytes_truncated = await self._read_capped(response)
+                span.set(bytes=len(body))
+                return {
+                    "content_type": content_type,
+                    "html": body.decode(response.charset_encoding or "utf-8", errors="replace"),
+                    "status_code": response.status_code,
+                    "truncated": bytes_truncated
+                }
+
+    async def fetch_url(self, url: str, include_html: bool = False) -> Optional[Dict[str, Any]]:
+        try:
+            # Pages are spread over many hosts, so each host gets its own breaker.
+            page = await resilience_service.call(
+                "web", lambda: self._download(url), operation="fetch", breaker_key=urlsplit(url).hostname
+            )
+            content_type, html = page["content_type"], page["html"]
+            if html is None:
+                return {"error": f"Unsupported content type: {content_type}", "url": url}
+
+            if content_type in TEXT_CONTENT_TYPES:
+                extracted = {"title": None, "text": html.strip()}
+            else:
+                with telemetry_service.provider_span("web", "extract"):
+                    extracted = await asyncio.to_thread(self._extract, html)
+
+            text_content, text_truncated = self._truncate(extracted["text"])
+
+            result = {
                 "url": url,
-                "status_code": response.status_code,
-                "html": response.text,
+                "status_code": page["status_code"],
+                "title": extracted["title"],
                 "text": text_content,
-                "title": soup.title.string if soup.title else None
+                "truncated": page["truncated"] or text_truncated
             }
 
-        except requests.exceptions.Timeout:
+            if include_html:
+                result["html"], result["html_truncated"] = self._trim_html(html)
+
+            return result
+
+        except httpx.TimeoutException:
             return {"error": "Request timed out", "url": url}
-        except requests.exceptions.RequestException as e:
+        except CircuitOpenError as e:
+            return {"error": str(e), "url": url}
+        except httpx.HTTPError as e:
             return {"error": f"Request failed: {str(e)}", "url": url}
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             return {"error": f"Failed to parse content: {str(e)}", "url": url}
 
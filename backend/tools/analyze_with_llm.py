@@ -1,9 +1,7 @@
-from typing import Dict, Any
-
-from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
 from services.openai_service import service as openai_service
+from tools.tool_spec import ToolSpec
 
 
 class AnalyzeWithLLMInput(BaseModel):
@@ -11,15 +9,13 @@ class AnalyzeWithLLMInput(BaseModel):
     context: str = Field(description="The context or data to analyze")
 
 
-def analyze_with_llm(prompt: str, context: str) -> str:
-    result = openai_service.analyze_with_reasoning(prompt, context)
-    return result
+async def analyze_with_llm(prompt: str, context: str) -> str:
+    return await openai_service.analyze_with_reasoning_async(prompt, context)
 
 
-def create_analyze_with_llm_tool() -> StructuredTool:
-    return StructuredTool.from_function(
-        func=analyze_with_llm,
-        name="analyze_with_llm",
-        description="Use a reasoning LLM (o3-mini with medium reasoning) to deeply analyze content. Perfect for extracting BANT signals, sentiment analysis, pattern recognition, or complex insights from scraped data. Provide a clear analysis prompt and the context to analyze.",
-        args_schema=AnalyzeWithLLMInput
-    )
+analyze_with_llm_tool = ToolSpec(
+    name="analyze_with_llm",
+    description="Use a reasoning LLM to deeply analyze content. Perfect for extracting BANT signals, sentiment analysis, pattern recognition, or complex insights from scraped data. Provide a clear analysis prompt and the context to analyze.",
+    args_schema=AnalyzeWithLLMInput,
+    function=analyze_with_llm
+)
@@ -1,17 +1,18 @@
 from typing import Dict, Any, Optional
 
-from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
 from services.web_browsing_service import service as web_browsing_service
+from tools.tool_spec import ToolSpec
 
 
 class BrowseWebInput(BaseModel):
     url: str = Field(description="The URL to fetch and browse")
+    include_html: bool = Field(default=False, description="Also return the page HTML (scripts and styles removed, truncated). Only set this when the cleaned text is not enough.")
 
 
-def browse_web(url: str) -> Optional[Dict[str, Any]]:
-    result = web_browsing_service.fetch_url(url)
+async def browse_web(url: str, include_html: bool = False) -> Optional[Dict[str, Any]]:
+    result = await web_browsing_service.fetch_url(url, include_html)
 
     if not result:
         return {"error": "Failed to fetch URL", "url": url}
@@ -19,10 +20,9 @@ def browse_web(url: str) -> Optional[Dict[str, Any]]:
     return result
 
 
-def create_browse_web_tool() -> StructuredTool:
-    return StructuredTool.from_function(
-        func=browse_web,
-        name="browse_web",
-        description="Fetch and browse any web URL. Returns the HTML content, extracted text, and page title. Useful for accessing URLs returned from other tools or gathering web information.",
-        args_schema=BrowseWebInput
-    )
+browse_web_tool = ToolSpec(
+    name="browse_web",
+    description="Fetch and browse any web URL. Returns the page title and the cleaned main-content text (truncated to a fixed budget); the page HTML, without scripts and styles and truncated to a fixed budget, is only included when include_html is true. Useful for accessing URLs returned from other tools or gathering web information.",
+    args_schema=BrowseWebInput,
+    function=browse_web
+)
@@ -1,8 +1,9 @@
 from typing import Dict, Any
 
-from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+from tools.tool_spec import ToolSpec
+
 
 class FinishInput(BaseModel):
     summary: str = Field(description="Comprehensive summary of all research findings, including key insights from LinkedIn and web sources")
@@ -16,10 +17,9 @@ def finish_execution(summary: str) -> Dict[str, Any]:
     }
 
 
-def create_finish_tool() -> StructuredTool:
-    return StructuredTool.from_function(
-        func=finish_execution,
-        name="finish",
-        description="Complete the research task with a comprehensive summary of findings. Include all relevant information discovered from LinkedIn and web sources.",
-        args_schema=FinishInput
-    )
+finish_tool = ToolSpec(
+    name="finish",
+    description="Complete the research task with a comprehensive summary of findings. Include all relevant information discovered from LinkedIn and web sources.",
+    args_schema=FinishInput,
+    function=finish_execution
+)
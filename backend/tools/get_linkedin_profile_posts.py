@@ -1,9 +1,9 @@
 from typing import Dict, Any, Optional
 
-from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
 from services.linkedin_service import service as linkedin_service
+from tools.tool_spec import ToolSpec
 
 
 class LinkedInProfilePostsInput(BaseModel):
@@ -11,8 +11,8 @@ class LinkedInProfilePostsInput(BaseModel):
     max_posts: int = Field(default=5, description="Maximum number of posts to retrieve (default: 5)")
 
 
-def get_linkedin_profile_posts(profile_url: str, max_posts: int = 5) -> Optional[Dict[str, Any]]:
-    posts_data = linkedin_service.get_profile_posts(profile_url, max_posts)
+async def get_linkedin_profile_posts(profile_url: str, max_posts: int = 5) -> Optional[Dict[str, Any]]:
+    posts_data = await linkedin_service.get_profile_posts(profile_url, max_posts)
 
     if not posts_data:
         return {"error": "Failed to fetch LinkedIn profile posts", "profile_url": profile_url}
@@ -20,10 +20,9 @@ def get_linkedin_profile_posts(profile_url: str, max_posts: int = 5) -> Optional
     return posts_data
 
 
-def create_linkedin_profile_posts_tool() -> StructuredTool:
-    return StructuredTool.from_function(
-        func=get_linkedin_profile_posts,
-        name="get_linkedin_profile_posts",
-        description="Fetch recent posts from a LinkedIn profile URL. Returns post content, engagement metrics, and timestamps. Useful for evaluating prospect intent and activity. Default retrieves 10 posts.",
-        args_schema=LinkedInProfilePostsInput
-    )
+linkedin_profile_posts_tool = ToolSpec(
+    name="get_linkedin_profile_posts",
+    description="Fetch recent posts from a LinkedIn profile URL. Returns post content, engagement metrics, and timestamps. Useful for evaluating prospect intent and activity. Default retrieves 10 posts.",
+    args_schema=LinkedInProfilePostsInput,
+    function=get_linkedin_profile_posts
+)
@@ -0,0 +1,24 @@
+from typing import Any, Callable, Dict, Type
+
+from pydantic import BaseModel
+
+
+class ToolSpec:
+    """Name, description, input model and implementation of an agent tool, without LangChain."""
+
+    def __init__(self, name: str, description: str, args_schema: Type[BaseModel], function: Callable[..., Any]):
+        self.name = name
+        self.description = description
+        self.args_schema = args_schema
+        self.function = function
+
+    def openai_format(self) -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": self.args_schema.model_json_schema()
+            }
+        }
+
@@ -13,6 +13,30 @@ type SSEStep = {
   completed: boolean;
 };
 
+type RunCursor = {
+  runId: string | null;
+  lastEventId: string | null;
+  finished: boolean;
+};
+
+type SavedRun = {
+  runId: string;
+  lastEventId: string | null;
+  linkedinUrl: string;
+  steps: SSEStep[];
+};
+
+const API_BASE = "https://s-esther-production.up.railway.app/core/v1";
+const RUN_STORAGE_KEY = "s-esther:run";
+
+const readSavedRun = (): SavedRun | null => {
+  try {
+    return JSON.parse(sessionStorage.getItem(RUN_STORAGE_KEY) ?? "null");
+  } catch {
+    return null;
+  }
+};
+
 export default function Home() {
   const [currentPage, setCurrentPage] = useState<
     "landing" | "loading" | "result"
@@ -23,31 +47,77 @@ export default function Home() {
   // eslint-disable-next-line @typescript-eslint/no-explicit-any
   const [prospectingResult, setProspectingResult] = useState<any>(null);
   const currentStepRef = React.useRef<{ title: string; description: string } | null>(null);
+  const runningStepsRef = React.useRef<Map<string, { title: string; description: string }>>(new Map());
+  const resumedRef = React.useRef(false);
 
-  const handleLandingButtonClick = async (url: string, intent: string) => {
-    setLinkedinUrl(url);
-    setCurrentPage("loading");
-    setSteps([{
-      title: "Researching",
-      description: "Starting your prospecting journey...",
-      completed: true
-    }]);
-    setCurrentStep(null);
-    currentStepRef.current = null;
-    setProspectingResult(null);
+  const followRun = async (cursor: RunCursor, url: string, startRun?: () => Promise<Response>) => {
+    const persist = () => {
+      if (cursor.finished) {
+        sessionStorage.removeItem(RUN_STORAGE_KEY);
+      } else if (cursor.runId) {
+        const saved = readSavedRun();
+        sessionStorage.setItem(RUN_STORAGE_KEY, JSON.stringify({
+          steps: saved?.runId === cursor.runId ? saved.steps : [],
+          runId: cursor.runId,
+          lastEventId: cursor.lastEventId,
+          linkedinUrl: url
+        }));
+      }
+    };
 
-    try {
-      const response = await fetch("https://s-esther-production.up.railway.app/core/v1/start_prospecting", {
-        method: "POST",
-        headers: {
-          "Content-Type": "application/json",
-        },
-        body: JSON.stringify({
-          profile_url: url,
-          intent: intent,
-        }),
-      });
+    // eslint-disable-next-line @typescript-eslint/no-explicit-any
+    const handleEvent = (jsonData: any) => {
+      if (jsonData.type === "tool_started") {
+        const stepData = {
+          title: jsonData.tool_title,
+          description: jsonData.tool_description
+        };
+        if (jsonData.tool_call_id) {
+          runningStepsRef.current.set(jsonData.tool_call_id, stepData);
+        }
+        currentStepRef.current = stepData;
+        setCurrentStep(stepData);
+      } else if (jsonData.type === "tool_completed") {
+        const running = runningStepsRef.current;
+        const stepData = (jsonData.tool_call_id && running.get(jsonData.tool_call_id)) || currentStepRef.current;
+        if (stepData) {
+          setSteps(prev => [...prev, {
+            title: stepData.title,
+            description: stepData.description,
+            completed: true
+          }]);
+          running.delete(jsonData.tool_call_id);
+          const nextStep = Array.from(running.values()).pop() ?? null;
+          currentStepRef.current = nextStep;
+          setCurrentStep(nextStep);
+        }
+      } else if (jsonData.type === "deadline_reached") {
+        setSteps(prev => [...prev, {
+          title: "Wrapping up",
+          description: jsonData.message,
+          completed: true
+        }]);
+      } else if (jsonData.type === "final_result") {
+        cursor.finished = true;
+        setProspectingResult(jsonData.assessment);
+        setTimeout(() => {
+          setCurrentPage("result");
+        }, 1000);
+      } else if (jsonData.type === "error") {
+        cursor.finished = true;
+        console.error("Error from API:", jsonData.message);
+        setSteps(prev => [...prev, {
+          title: "Error",
+          description: jsonData.message,
+          completed: true
+        }]);
+      } else if (jsonData.type === "run_timing") {
+        // Always the run's last event, including runs that end without a result.
+        cursor.finished = true;
+      }
+    };
 
+    const readStream = async (response: Response) => {
       if (!response.ok) {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
@@ -59,57 +129,56 @@ export default function Home() {
         throw new Error("Response body is null");
       }
 
+      // A clean end of stream is not completion: proxies close idle connections too.
+      let buffer = "";
       while (true) {
         const { done, value } = await reader.read();
-        if (done) break;
+        if (done) {
+          break;
+        }
 
-        const chunk = decoder.decode(value);
-        const lines = chunk.split("\n");
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split("\n");
+        buffer = lines.pop() ?? "";
 
         for (const line of lines) {
-          if (line.startsWith("data: ")) {
+          if (line.startsWith("id: ")) {
+            cursor.lastEventId = line.substring(4);
+            cursor.runId = cursor.lastEventId.split(":")[0];
+          } else if (line.startsWith("data: ")) {
             try {
-              const jsonData = JSON.parse(line.substring(6));
-
-              if (jsonData.type === "tool_started") {
-                const stepData = {
-                  title: jsonData.tool_title,
-                  description: jsonData.tool_description
-                };
-                currentStepRef.current = stepData;
-                setCurrentStep(stepData);
-              } else if (jsonData.type === "tool_completed") {
-                const stepData = currentStepRef.current;
-                if (stepData) {
-                  setSteps(prev => [...prev, {
-                    title: stepData.title,
-                    description: stepData.description,
-                    completed: true
-                  }]);
-                  currentStepRef.current = null;
-                  setCurrentStep(null);
-                }
-              } else if (jsonData.type === "final_result") {
-                setProspectingResult(jsonData.assessment);
-                setTimeout(() => {
-                  setCurrentPage("result");
-                }, 1000);
-              } else if (jsonData.type === "error") {
-                console.error("Error from API:", jsonData.message);
-                setSteps(prev => [...prev, {
-                  title: "Error",
-                  description: jsonData.message,
-                  completed: true
-                }]);
-              }
+              handleEvent(JSON.parse(line.substring(6)));
             } catch (e) {
               console.error("Failed to parse JSON:", e);
             }
           }
         }
+        persist();
       }
-    } catch (error) {
-      console.error("Failed to connect to API:", error);
+    };
+
+    if (startRun) {
+      try {
+        await readStream(await startRun());
+      } catch (error) {
+        console.error("Stream interrupted:", error);
+      }
+    }
+
+    // The run keeps going server-side; pick the stream back up from the last event we saw.
+    for (let attempt = 1; !cursor.finished && cursor.runId && attempt <= 3; attempt++) {
+      const headers: Record<string, string> = cursor.lastEventId ? { "Last-Event-ID": cursor.lastEventId } : {};
+      if (startRun || attempt > 1) {
+        await new Promise(resolve => setTimeout(resolve, 1000 * attempt));
+      }
+      try {
+        await readStream(await fetch(`${API_BASE}/runs/${cursor.runId}/events`, { headers }));
+      } catch (error) {
+        console.error(`Reconnect attempt ${attempt} failed:`, error);
+      }
+    }
+
+    if (!cursor.finished) {
       setSteps(prev => [...prev, {
         title: "Connection Error",
         description: "Failed to connect to backend",
@@ -118,12 +187,63 @@ export default function Home() {
     }
   };
 
+  // Steps are kept with the saved run so a reload can show them again before the stream catches up.
+  useEffect(() => {
+    const saved = readSavedRun();
+    if (saved?.runId) {
+      sessionStorage.setItem(RUN_STORAGE_KEY, JSON.stringify({ ...saved, steps }));
+    }
+  }, [steps]);
+
+  // A reload mid-run picks the saved run back up instead of starting a new one.
+  useEffect(() => {
+    const saved = readSavedRun();
+    if (resumedRef.current || !saved?.runId) {
+      return;
+    }
+    resumedRef.current = true;
+
+    setLinkedinUrl(saved.linkedinUrl);
+    setSteps(saved.steps ?? []);
+    setCurrentPage("loading");
+    followRun({ runId: saved.runId, lastEventId: saved.lastEventId, finished: false }, saved.linkedinUrl);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  const handleLandingButtonClick = async (url: string, intent: string) => {
+    setLinkedinUrl(url);
+    setCurrentPage("loading");
+    setSteps([{
+      title: "Researching",
+      description: "Starting your prospecting journey...",
+      completed: true
+    }]);
+    setCurrentStep(null);
+    currentStepRef.current = null;
+    runningStepsRef.current.clear();
+    setProspectingResult(null);
+    sessionStorage.removeItem(RUN_STORAGE_KEY);
+
+    await followRun({ runId: null, lastEventId: null, finished: false }, url, () => fetch(`${API_BASE}/start_prospecting`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: JSON.stringify({
+        profile_url: url,
+        intent: intent,
+      }),
+    }));
+  };
+
   const handleRestart = () => {
+    sessionStorage.removeItem(RUN_STORAGE_KEY);
     setCurrentPage("landing");
     setLinkedinUrl("");
     setSteps([]);
     setCurrentStep(null);
     currentStepRef.current = null;
+    runningStepsRef.current.clear();
     setProspectingResult(null);
   };
 